@@ -52,6 +52,8 @@ async def lifespan(app: FastAPI):
 
         app.state.genai_session = session
         app.state.frontend_ws = None
+        # frontend websockets by request_id of the requests whose answer is being streamed
+        app.state.response_streams = {}
 
         @session.bind()
         async def message_handler(
@@ -66,6 +68,11 @@ async def lifespan(app: FastAPI):
             agent_description: Optional[str] = "",
             agent_input_schema: Optional[dict] = None,
             agent_jwt: Optional[str] = None,
+            logs: Optional[list[dict]] = None,
+            seq: Optional[int] = None,
+            delta: Optional[str] = None,
+            reset: bool = False,
+            final: bool = False,
         ):
             await message_handler_validator(
                 session=session,
@@ -80,6 +87,11 @@ async def lifespan(app: FastAPI):
                 message_type=message_type,
                 state=app.state,
                 jwt_token=agent_jwt,
+                logs=logs,
+                seq=seq,
+                delta=delta,
+                reset=reset,
+                final=final,
             )
 
         logger.info("GenAI Session started")
@@ -215,6 +215,7 @@ class A2ARepository(CRUDBase[A2ACard, A2AAgentCard, A2AAgentCard]):
         agent_card: A2AAgentCard,
         created_at: Optional[datetime] = None,
         updated_at: Optional[datetime] = None,
+        card_content: Optional[dict] = None,
     ):
         json_schema = self._agent_card_to_json_schema(agent_card=agent_card)
         title = json_schema.title
@@ -227,6 +228,7 @@ class A2ARepository(CRUDBase[A2ACard, A2AAgentCard, A2AAgentCard]):
             created_at=created_at,
             updated_at=updated_at,
             is_active=True,
+            card_content=card_content,
         )
 
     async def set_as_inactive(self, db: AsyncSession, server_url: str):
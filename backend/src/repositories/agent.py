@@ -29,6 +29,8 @@ from src.utils.filters import AgentFilter
 from src.utils.helpers import (
     FlowValidator,
     generate_alias,
+    get_flow_dependencies,
+    get_input_mappings,
     map_agent_model_to_dto,
     map_genai_agent_to_unified_dto,
     mcp_tool_to_json_schema,
@@ -545,6 +547,7 @@ LIMIT :limit OFFSET :offset;
                     name=flow.alias, description=flow.description
                 ).model_dump(mode="json")
 
+            flow_agents = [FlowAgentId(**agent) for agent in flow.flow]
             flow_schema = AgentDTOPayload(
                 id=flow.id,
                 name=flow.alias,
@@ -553,6 +556,8 @@ LIMIT :limit OFFSET :offset;
                 created_at=flow.created_at,
                 updated_at=flow.updated_at,
                 flow=[agent.get("id") for agent in flow.flow],
+                flow_dependencies=get_flow_dependencies(flow_agents=flow_agents),
+                flow_mappings=get_input_mappings(flow_agents=flow_agents),
                 is_active=flow.is_active,
             )
             return flow_schema
@@ -654,6 +659,7 @@ LIMIT :limit OFFSET :offset;
                     created_at=created_at,
                     updated_at=updated_at,
                     is_active=True,
+                    annotations=col["json_data2"] or None,
                 )
 
                 response.append(mcp_tool)
@@ -670,6 +676,7 @@ LIMIT :limit OFFSET :offset;
                 updated_at = col.pop("updated_at")
 
                 card_content: dict = col["json_data1"]
+                stored_card = dict(card_content)
                 card_content.pop("name", None)
                 description = card_content.pop("description", None)
                 url = card_content.pop("url", None)
@@ -686,6 +693,7 @@ LIMIT :limit OFFSET :offset;
                     created_at=created_at,
                     updated_at=updated_at,
                     id_=col["id"],
+                    card_content=stored_card,
                 )
 
                 response.append(agent_card)
@@ -755,6 +763,7 @@ LIMIT :limit OFFSET :offset;
                         agent_schema=tool_schema,
                         created_at=s.created_at,
                         updated_at=s.updated_at,
+                        annotations=tool.annotations or None,
                     ).model_dump(mode="json", exclude_none=True)
                 )
 
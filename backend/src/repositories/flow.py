@@ -183,6 +183,8 @@ class AgentWorkflowRepository(
         user_model: User,
     ) -> Optional[list[str]]:
         flow_validator = FlowValidator()
+        flow_validator.validate_flow_dependencies(flow_agents=obj_in.flow)
+        flow_validator.validate_input_mappings(flow_agents=obj_in.flow)
         valid_agents = await flow_validator.validate_is_active_of_all_agent_types(
             flow_agents=obj_in.flow, user_id=user_model.id
         )
@@ -8,6 +8,7 @@ from src.auth.dependencies import CurrentUserDependency
 from src.db.session import AsyncDBSession
 from src.repositories.a2a import a2a_repo
 from src.schemas.a2a.schemas import A2ACreateAgentSchema
+from src.utils.catalog_version import catalog_version
 
 a2a_router = APIRouter(tags=["a2a"], prefix="/a2a")
 
@@ -19,7 +20,9 @@ async def add_agent_url(
     data_in: A2ACreateAgentSchema,
 ):
     try:
-        return await a2a_repo.add_url(db=db, user_model=user_model, data_in=data_in)
+        created = await a2a_repo.add_url(db=db, user_model=user_model, data_in=data_in)
+        await catalog_version.bump()
+        return created
     except ValidationError as e:
         return JSONResponse(content=json.loads(e.json()), status_code=400)
 
@@ -52,4 +55,5 @@ async def delete_mcp_server(
             status_code=400, detail=f"MCP server with ID {str(agent_id)} was not found"
         )
 
+    await catalog_version.bump()
     return Response(status_code=204)
@@ -17,6 +17,7 @@ from src.repositories.agent import agent_repo
 from src.repositories.flow import agentflow_repo
 from src.schemas.api.agent.dto import AgentDTOWithJWT, MLAgentJWTDTO
 from src.schemas.api.agent.schemas import AgentCRUDUpdate, AgentRegister
+from src.utils.catalog_version import catalog_version
 from src.utils.enums import ActiveAgentTypeFilter
 from src.utils.filters import AgentFilter
 from src.utils.helpers import get_user_id_from_jwt, map_agent_model_to_dto
@@ -140,6 +141,7 @@ async def register_agent(
         agent_with_token = await agent_repo.create_by_user(
             db=db, obj_in=agent_in, user_model=user
         )
+        await catalog_version.bump()
         return agent_with_token
     except IntegrityError:
         logger.debug(traceback.format_exc())
@@ -175,6 +177,7 @@ async def update_agent(
     agent = await agent_repo.update_by_user(
         db=db, id_=agent_id, user=user, obj_in=agent_upd_data
     )
+    await catalog_version.bump()
     return map_agent_model_to_dto(agent=agent).model_dump(
         mode="json", exclude_none=True
     )
@@ -193,4 +196,5 @@ async def delete_agent(
     if not is_ok:
         raise HTTPException(status_code=400, detail=f"Agent {agent_id} was not found")
 
+    await catalog_version.bump()
     return Response(status_code=204)
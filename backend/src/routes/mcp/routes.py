@@ -8,6 +8,7 @@ from src.auth.dependencies import CurrentUserDependency
 from src.db.session import AsyncDBSession
 from src.repositories.mcp import mcp_repo
 from src.schemas.mcp.schemas import MCPCreateServer
+from src.utils.catalog_version import catalog_version
 
 mcp_router = APIRouter(tags=["mcp"], prefix="/mcp")
 
@@ -17,7 +18,9 @@ async def add_server_url(
     db: AsyncDBSession, user_model: CurrentUserDependency, data_in: MCPCreateServer
 ):
     try:
-        return await mcp_repo.add_url(db=db, user_model=user_model, data_in=data_in)
+        created = await mcp_repo.add_url(db=db, user_model=user_model, data_in=data_in)
+        await catalog_version.bump()
+        return created
     except ValidationError as e:
         return JSONResponse(content=json.loads(e.json()), status_code=400)
 
@@ -53,4 +56,5 @@ async def delete_mcp_server(
             status_code=400, detail=f"MCP server with ID {str(server_id)} was not found"
         )
 
+    await catalog_version.bump()
     return Response(status_code=204)
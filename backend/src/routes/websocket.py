@@ -22,6 +22,7 @@ from src.schemas.ws.frontend import (
     LLMPropertiesDecryptCreds,
 )
 from src.schemas.ws.ml import OutgoingMLRequestSchema
+from src.utils.catalog_version import catalog_version
 from src.utils.enums import SenderType
 from src.utils.validate_uuid import is_valid_uuid
 from src.utils.validation_error_handler import validation_exception_handler
@@ -108,6 +109,19 @@ async def handle_frontend_ws(
             ]
         }
         ```
+
+        While the master agent generates its final answer, chunks of it are sent before the response:
+        ```
+        {
+            "type": "agent_stream",
+            "session_id": "f24f3b3a-54b4-4cd3-a398-dc475b6b2ab4",
+            "request_id": "49d7aaaf-a173-4a9f-a84c-29dbb5f8b50e",
+            "seq": 0,
+            "delta": "The current",
+            "reset": false,  # true: discard the text received so far
+            "final": false  # true: last chunk, the response follows
+        }
+        ```
     """
     query_params = websocket.query_params
     token = query_params.get("token")
@@ -241,9 +255,14 @@ async def handle_frontend_ws(
                 timestamp=int(datetime.now().timestamp()),
                 configs=enriched_llm_props.to_json(),
                 files=files,
+                catalog_version=await catalog_version.get(),
+                request_id=request_id,
             )
             req_body = ml_request.model_dump(exclude_none=True)
 
+            # chunks of the answer streamed by the master agent reach this websocket while it is generated
+            response_streams: dict = websocket.app.state.response_streams
+            response_streams[request_id] = websocket
             try:
                 session.request_id = request_id
                 session.session_id = session_id
@@ -297,6 +316,8 @@ async def handle_frontend_ws(
                     {"error": "Unexpected error occured. Try again later"}
                 )
                 await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+            finally:
+                response_streams.pop(request_id, None)
 
     except ValidationError as e:
         logger.debug(traceback.format_exc())
@@ -10,6 +10,13 @@ from src.utils.enums import AgentType
 class FlowAgentId(BaseModel):
     id: str = None
     type: str = None
+    # DAG flows: steps are referenced by `step_id` (defaults to the agent id),
+    # a step runs once all steps listed in its `depends_on` have finished
+    step_id: Optional[str] = None
+    depends_on: Optional[list[str]] = None
+    # input field -> JMESPath expression on the output of the step this step depends on,
+    # arguments are then built without an LLM call
+    input_mapping: Optional[dict[str, str]] = None
 
     @field_validator("id")
     def validate_id_is_uuid(cls, v) -> str:
@@ -32,11 +39,22 @@ class FlowAgentId(BaseModel):
 
         return v
 
+    @property
+    def step_key(self) -> str:
+        return self.step_id or self.id
+
     def to_json(self) -> dict:
-        return {
+        data = {
             "id": self.id,
             "type": self.type
         }
+        if self.step_id is not None:
+            data["step_id"] = self.step_id
+        if self.depends_on is not None:
+            data["depends_on"] = self.depends_on
+        if self.input_mapping is not None:
+            data["input_mapping"] = self.input_mapping
+        return data
 
 
 class AgentFlowBase(BaseModel):
@@ -37,6 +37,13 @@ class AgentDTOPayload(BaseUUIDToStrModel):
     url: Optional[AnyHttpUrl] = None
     agent_schema: dict
     flow: Optional[list] = None
+    # DAG flows: indices of the steps each step waits for
+    flow_dependencies: Optional[list[list[int]]] = None
+    # declared input mapping of each step
+    flow_mappings: Optional[list[Optional[dict[str, str]]]] = None
+    # A2A agent card, spares the Master Agent fetching it
+    card_content: Optional[dict] = None
+    annotations: Optional[dict] = None  # MCP tool annotations, e.g. readOnlyHint
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
     is_active: Optional[bool] = None
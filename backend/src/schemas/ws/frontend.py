@@ -3,6 +3,7 @@ from uuid import UUID
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 from src.auth.encrypt import decrypt_secret
+from src.utils.enums import FrontendMessageType
 
 
 class Flow(BaseModel):
@@ -109,3 +110,13 @@ class AgentResponseDTO(BaseModel):
         self.request_id = str(self.request_id)
         self.session_id = str(self.session_id)
         return self
+
+
+class FrontendStreamChunkDTO(BaseModel):
+    type: str = FrontendMessageType.agent_stream.value
+    session_id: str
+    request_id: str
+    seq: int
+    delta: str
+    reset: bool = False  # the text streamed so far is discarded
+    final: bool = False  # last chunk, the agent_response follows
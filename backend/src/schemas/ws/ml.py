@@ -12,6 +12,9 @@ class OutgoingMLRequestSchema(BaseModel):
     configs: dict
     files: Optional[List[FileDTO]] = []
     timestamp: datetime | float | int  # posix ts
+    catalog_version: Optional[str] = None
+    # chunks of the streamed answer are addressed by it
+    request_id: Optional[str] = None
 
     @model_validator(mode="after")
     def validate_uuids(self) -> Self:
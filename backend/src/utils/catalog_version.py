@@ -0,0 +1,67 @@
+import asyncio
+from logging import getLogger
+from typing import Optional
+from uuid import uuid4
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from src.core.settings import get_settings
+
+logger = getLogger(__name__)
+
+
+class CatalogVersion:
+    """
+    Version of the agent catalog served by `/agents/active`.
+
+    Bumped whenever an agent, flow, A2A card or MCP server is registered, changes its state
+    or is removed, by the API as well as by the Celery lookups of MCP servers and A2A agents.
+    The version is sent to the Master Agent with every ML request, so it can keep its catalog
+    cached until the version changes.
+
+    The version is kept in Redis, so it is shared by every backend process and Celery worker.
+    Its prefix is generated when the key is first created, a flushed Redis never repeats an earlier version.
+    While Redis is unavailable the version is None and the Master Agent fetches the catalog every time.
+    """
+
+    VERSION_KEY = "genai-backend:catalog-version"
+    EPOCH_KEY = "genai-backend:catalog-epoch"
+
+    def __init__(self, url: str):
+        self.url = url
+        self._redis: Optional[aioredis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _client(self) -> aioredis.Redis:
+        # Celery tasks run every lookup in a new event loop, connections can't be shared between loops
+        loop = asyncio.get_running_loop()
+        if self._redis is None or self._loop is not loop:
+            self._redis = aioredis.from_url(self.url, decode_responses=True)
+            self._loop = loop
+        return self._redis
+
+    async def get(self) -> Optional[str]:
+        try:
+            async with self._client().pipeline(transaction=False) as pipe:
+                pipe.set(self.EPOCH_KEY, uuid4().hex[:8], nx=True)
+                pipe.mget(self.EPOCH_KEY, self.VERSION_KEY)
+                _, (epoch, counter) = await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Could not read the catalog version: {e!r}")
+            return None
+        return f"{epoch}:{counter or 0}"
+
+    async def bump(self) -> Optional[str]:
+        try:
+            async with self._client().pipeline(transaction=False) as pipe:
+                pipe.set(self.EPOCH_KEY, uuid4().hex[:8], nx=True)
+                pipe.incr(self.VERSION_KEY)
+                pipe.get(self.EPOCH_KEY)
+                _, counter, epoch = await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Could not bump the catalog version: {e!r}")
+            return None
+        return f"{epoch}:{counter}"
+
+
+catalog_version = CatalogVersion(url=get_settings().REDIS_BACKEND_URI)
@@ -18,6 +18,12 @@ class FileValidationOutputChoice(Enum):
     dto = "dto"
 
 
+class FrontendMessageType(Enum):
+    agent_response = "agent_response"
+    agent_log = "agent_log"
+    agent_stream = "agent_stream"
+
+
 class SenderType(Enum):
     user = "user"
     master_agent = "master_agent"
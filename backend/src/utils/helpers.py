@@ -6,7 +6,9 @@ from typing import Any, Optional
 from urllib.parse import urlparse, urlunparse
 from uuid import UUID
 
+import jmespath
 from fastapi import HTTPException
+from jmespath.exceptions import JMESPathError
 from mcp.types import Tool
 from pydantic import AnyHttpUrl
 from sqlalchemy import and_, select, update
@@ -166,7 +168,133 @@ def strip_endpoints_from_url(url: AnyHttpUrl | str) -> str:
     )
 
 
+def get_flow_dependencies(
+    flow_agents: list[FlowAgentId],
+) -> Optional[list[list[int]]]:
+    """
+    Returns: indices of the steps each step of a DAG flow depends on, None for sequential flows
+    (flows are validated when they are saved, the result is served as is)
+    """
+    if all(agent.depends_on is None for agent in flow_agents):
+        return None
+    step_indices = {agent.step_key: idx for idx, agent in enumerate(flow_agents)}
+    return [
+        sorted({step_indices[d] for d in agent.depends_on or [] if d in step_indices})
+        for agent in flow_agents
+    ]
+
+
+def get_input_mappings(
+    flow_agents: list[FlowAgentId],
+) -> Optional[list[Optional[dict[str, str]]]]:
+    """
+    Returns: declared input mapping of each flow step, None if no step declares one
+    """
+    if all(not agent.input_mapping for agent in flow_agents):
+        return None
+    return [agent.input_mapping or None for agent in flow_agents]
+
+
 class FlowValidator:
+    @staticmethod
+    def validate_flow_dependencies(
+        flow_agents: list[FlowAgentId],
+    ) -> Optional[list[list[int]]]:
+        """
+        Validates the step dependencies of a DAG flow.
+
+        Returns: indices of the steps each step depends on, None for sequential flows (no step declares `depends_on`)
+        Raises: HTTPException (400) on duplicate step ids, unknown dependencies or cycles
+        """
+        if all(agent.depends_on is None for agent in flow_agents):
+            return None
+
+        step_indices: dict[str, int] = {}
+        for idx, agent in enumerate(flow_agents):
+            if agent.step_key in step_indices:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Step '{agent.step_key}' is declared more than once in the flow, "
+                    "set a unique 'step_id' for every step",
+                )
+            step_indices[agent.step_key] = idx
+
+        dependencies = []
+        for agent in flow_agents:
+            if unknown := [d for d in agent.depends_on or [] if d not in step_indices]:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Step '{agent.step_key}' depends on unknown steps: {repr(unknown)}",
+                )
+            dependencies.append(
+                sorted({step_indices[d] for d in agent.depends_on or []})
+            )
+
+        # Kahn's algorithm, steps left unvisited are part of a cycle
+        remaining = [len(deps) for deps in dependencies]
+        ready = [idx for idx, count in enumerate(remaining) if count == 0]
+        visited = 0
+        while ready:
+            idx = ready.pop()
+            visited += 1
+            for dependent, deps in enumerate(dependencies):
+                if idx in deps:
+                    remaining[dependent] -= 1
+                    if remaining[dependent] == 0:
+                        ready.append(dependent)
+
+        if visited < len(flow_agents):
+            cyclic = [
+                flow_agents[i].step_key for i, count in enumerate(remaining) if count
+            ]
+            raise HTTPException(
+                status_code=400,
+                detail=f"Flow steps contain a dependency cycle: {repr(cyclic)}",
+            )
+        return dependencies
+
+    @staticmethod
+    def validate_input_mappings(
+        flow_agents: list[FlowAgentId],
+    ) -> Optional[list[Optional[dict[str, str]]]]:
+        """
+        Validates the declared input mappings of the flow steps.
+
+        Returns: input mapping of each step, None if no step declares one
+        Raises: HTTPException (400) if the first step or a step without dependencies declares a mapping,
+                a mapping has empty fields or expressions, or an expression is not valid JMESPath
+        """
+        if all(not agent.input_mapping for agent in flow_agents):
+            return None
+
+        is_dag = any(agent.depends_on is not None for agent in flow_agents)
+        for idx, agent in enumerate(flow_agents):
+            if not agent.input_mapping:
+                continue
+            if (is_dag and not agent.depends_on) or (not is_dag and idx == 0):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Step '{agent.step_key}' has an input mapping but no step it takes the output of",
+                )
+            if not all(
+                field and expression
+                for field, expression in agent.input_mapping.items()
+            ):
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Input mapping of step '{agent.step_key}' contains empty fields or expressions",
+                )
+            for field, expression in agent.input_mapping.items():
+                try:
+                    jmespath.compile(expression)
+                except JMESPathError as e:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Input mapping of step '{agent.step_key}' has an invalid expression "
+                        f"for '{field}': {e}",
+                    )
+        return get_input_mappings(flow_agents)
+
     async def _validate_genai_ids(self, genai_ids: list[Optional[str]], user_id: UUID):
         async with async_session() as db:
             q = await db.scalars(
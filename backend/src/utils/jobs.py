@@ -1,4 +1,5 @@
 from src.repositories.agent import agent_repo
+from src.utils.catalog_version import catalog_version
 
 from src.db.session import async_session
 from logging import getLogger
@@ -12,6 +13,7 @@ async def run_startup_jobs():
     await preflight_db_availability_check()
     async with async_session() as db:
         await agent_repo.set_all_agents_inactive(db=db)
+    await catalog_version.bump()
 
     logger.debug("Initial startup jobs complete")
     return
@@ -3,6 +3,7 @@ import logging
 
 from src.db.session import async_session
 from src.repositories.a2a import a2a_repo, lookup_agent_well_known
+from src.utils.catalog_version import catalog_version
 from src.utils.enums import AgentType
 from src.utils.helpers import FlowValidator
 
@@ -12,6 +13,10 @@ logger = logging.getLogger(__name__)
 async def lookup_and_update_agent_card(server_url: str, headers: dict = {}):
     async with async_session() as db:
         card_info = await lookup_agent_well_known(url=server_url, headers=headers)
+        card = await a2a_repo.get_card_by_server_url(db=db, server_url=server_url)
+        # the agent appears in or disappears from the agent catalog, bumped once the new state is stored
+        state_changed = card is not None and card.is_active != card_info.is_active
+
         if not card_info.is_active:
             async with async_session() as db:
                 await a2a_repo.set_as_inactive(db=db, server_url=server_url)
@@ -24,6 +29,8 @@ async def lookup_and_update_agent_card(server_url: str, headers: dict = {}):
         card = await a2a_repo.update_card(
             db=db, server_url=server_url, card_in=card_info
         )
+        if state_changed:
+            await catalog_version.bump()
         return card
 
 
@@ -3,6 +3,7 @@ import logging
 
 from src.db.session import async_session
 from src.repositories.mcp import lookup_mcp_server, mcp_repo
+from src.utils.catalog_version import catalog_version
 from src.utils.enums import AgentType
 from src.utils.helpers import FlowValidator
 
@@ -12,11 +13,19 @@ logger = logging.getLogger(__name__)
 async def lookup_and_update_mcp_server(url: str, headers={}, cursor=None):
     data = await lookup_mcp_server(url=url, headers=headers, cursor=cursor)
 
+    async with async_session() as db:
+        server = await mcp_repo.get_mcp_server_by_url(db=db, mcp_server_url=url)
+    # the server appears in or disappears from the agent catalog, bumped once the new state is stored
+    state_changed = server is not None and server.is_active != data.is_active
+
     if data.is_active:
         async with async_session() as db:
-            return await mcp_repo.update_mcp_server_resources(
+            server = await mcp_repo.update_mcp_server_resources(
                 db=db, mcp_server_url=url, obj_in=data
             )
+        if state_changed:
+            await catalog_version.bump()
+        return server
 
     else:
         async with async_session() as db:
@@ -27,6 +36,8 @@ async def lookup_and_update_mcp_server(url: str, headers={}, cursor=None):
         await validator.trigger_flow_validation_on_agent_state_change(
             db=db, agent_type=AgentType.mcp
         )
+    if state_changed:
+        await catalog_version.bump()
 
 
 async def lookup_mcp_servers():
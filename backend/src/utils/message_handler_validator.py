@@ -2,19 +2,23 @@ import traceback
 from logging import getLogger
 from traceback import format_exc
 from typing import Optional
+from uuid import UUID
 
 from fastapi import WebSocket
 from genai_session.session import GenAISession
 from genai_session.utils.naming_enums import ErrorType, WSMessageType
 from pydantic import ValidationError
 from src.db.session import async_session
+from src.models import Log
 from src.repositories.agent import agent_repo
 from src.repositories.flow import agentflow_repo
 from src.repositories.log import log_repo
 from src.repositories.user import user_repo
 from src.schemas.api.agent.schemas import AgentUpdate
+from src.schemas.ws.frontend import FrontendStreamChunkDTO
 from src.schemas.ws.log import FrontendLogEntryDTO, LogCreate, LogEntry
-from src.utils.enums import AgentType
+from src.utils.catalog_version import catalog_version
+from src.utils.enums import AgentType, FrontendMessageType
 from src.utils.helpers import FlowValidator, generate_alias
 from src.utils.validate_uuid import validate_agent_or_send_err
 from src.utils.validation_error_handler import validation_exception_handler
@@ -23,6 +27,26 @@ from starlette.datastructures import State
 logger = getLogger(__name__)
 
 
+def _validate_log_entry(entry: dict) -> Optional[LogCreate]:
+    """
+    Validates one agent log entry of a batch, an invalid entry is skipped instead of failing the whole batch.
+    """
+    try:
+        log_in = LogCreate(
+            session_id=entry["session_id"],
+            request_id=entry["request_id"],
+            message=entry.get("log_message"),
+            log_level=entry["log_level"],
+            agent_id=entry.get("agent_uuid"),
+        )
+        # stored in UUID columns, a malformed id would fail the insert of the batch
+        UUID(str(log_in.session_id)), UUID(str(log_in.request_id))
+    except (ValidationError, ValueError):
+        logger.warning(f"Skipped invalid agent log entry: {entry}")
+        return None
+    return log_in
+
+
 async def message_handler_validator(
     state: State,
     session: GenAISession,
@@ -36,12 +60,38 @@ async def message_handler_validator(
     session_id: str = "",
     request_id: str = "",
     jwt_token: Optional[str] = None,
+    logs: Optional[list[dict]] = None,
+    seq: Optional[int] = None,
+    delta: Optional[str] = None,
+    reset: bool = False,
+    final: bool = False,
 ):
     # NOTE: websocket connection must be initialized by the frontend before it will be accessible here
     # if websocket is not initialized it won't dump logs to the frontend
     websocket: WebSocket = state.frontend_ws
 
     try:
+        if message_type == FrontendMessageType.agent_stream.value:
+            # chunk of the master agent answer being generated, relayed to the websocket which sent the request
+            # the complete answer is persisted once its agent_response arrives
+            stream_ws: Optional[WebSocket] = state.response_streams.get(request_id)
+            if stream_ws:
+                chunk = FrontendStreamChunkDTO(
+                    session_id=session_id,
+                    request_id=request_id,
+                    seq=seq or 0,
+                    delta=delta or "",
+                    reset=reset,
+                    final=final,
+                )
+                try:
+                    await stream_ws.send_text(chunk.model_dump_json())
+                except Exception:
+                    logger.debug(
+                        f"Could not stream chunk of request {request_id}: {format_exc()}"
+                    )
+            return
+
         if message_type == WSMessageType.AGENT_REGISTER.value:
             try:
                 async with async_session() as db:
@@ -88,6 +138,7 @@ async def message_handler_validator(
                     )
                     await db.refresh(updated_agent)
                     logger.debug(f"Agent updated: {str(updated_agent.id)}")
+                    await catalog_version.bump()
 
             except ValidationError as e:
                 logger.error(
@@ -126,6 +177,7 @@ async def message_handler_validator(
                     )
                     if inactive_agent:
                         logger.debug(f"Set agent as inactive: {agent_uuid}")
+                    await catalog_version.bump()
 
             except ValidationError:
                 logger.error(
@@ -140,23 +192,39 @@ async def message_handler_validator(
                 return
 
         if message_type == WSMessageType.AGENT_LOG.value:
-            if session_id and request_id and log_level:
+            # router coalesces agent logs into batches, single logs are still accepted
+            entries = logs or [
+                {
+                    "agent_uuid": agent_uuid,
+                    "session_id": session_id,
+                    "request_id": request_id,
+                    "log_level": log_level,
+                    "log_message": log_message,
+                }
+            ]
+            entries = [
+                e
+                for e in entries
+                if e.get("session_id") and e.get("request_id") and e.get("log_level")
+            ]
+            logs_in = [
+                log_in for entry in entries if (log_in := _validate_log_entry(entry))
+            ]
+            if logs_in:
                 try:
-                    log_in = LogCreate(
-                        session_id=session_id,
-                        request_id=request_id,
-                        message=log_message,
-                        log_level=log_level,
-                        agent_id=agent_uuid,
-                    )
-                    async with async_session() as db:
-                        log_entry = await log_repo.create(db, obj_in=log_in)
-                        logger.debug(f"Inserted log for {session_id=}, {request_id=}")
-                        log_out = LogEntry(**log_entry.__dict__)
-
-                        if websocket:
+                    # stored entries are relayed to the frontend after the commit, they must not expire
+                    async with async_session(expire_on_commit=False) as db:
+                        log_entries = [
+                            Log(**log_in.model_dump(exclude_none=True))
+                            for log_in in logs_in
+                        ]
+                        await log_repo.multi_insert(db=db, db_obj=log_entries)
+                    logger.debug(f"Inserted {len(log_entries)} logs")
+
+                    if websocket:
+                        for log_entry in log_entries:
                             response = FrontendLogEntryDTO(
-                                type=message_type, log=log_out
+                                type=message_type, log=LogEntry(**log_entry.__dict__)
                             )
                             await websocket.send_text(response.model_dump_json())
 
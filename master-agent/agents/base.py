@@ -1,9 +1,11 @@
+import asyncio
 import json
 from abc import ABC, abstractmethod
+from functools import cached_property
 from typing import Any
 
 from langchain.chat_models.base import BaseChatModel
-from langchain_core.messages import ToolMessage
+from langchain_core.messages import BaseMessage, ToolMessage
 from langchain_core.runnables import RunnableConfig
 from langgraph.constants import END, START
 from langgraph.graph.state import CompiledStateGraph, StateGraph
@@ -16,9 +18,10 @@ from utils.common import filter_and_order_by_ids, remove_last_underscore_segment
 
 
 class BaseMasterAgent(ABC):
-    def __init__(self, model: BaseChatModel, agents: list[dict[str, Any]]) -> None:
+    def __init__(self, model: BaseChatModel, agents: list[dict[str, Any]], max_concurrency: int = 4) -> None:
         self.model = model
         self.agents = agents
+        self.max_concurrency = max(max_concurrency, 1)
         self._agents_to_bind_to_llm = [item["agent_schema"] for item in agents]
 
     @abstractmethod
@@ -36,19 +39,43 @@ class BaseMasterAgent(ABC):
 
     async def execute_agent(self, state: MasterAgentState, config: RunnableConfig):
         """
-        Calls remote agent selected by Supervisor using AIConnector library.
+        Calls remote agents selected by Supervisor using AIConnector library.
+        Several tool calls of the supervisor are executed concurrently, at most `max_concurrency` at a time,
+        each of them results in its own ToolMessage; traces are returned in the order of the tool calls.
         """
+        messages = state.messages
+        tool_calls = messages[-1].tool_calls
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def invoke(agent_call: dict[str, Any]) -> tuple[ToolMessage, dict[str, Any]]:
+            async with semaphore:
+                return await self._invoke_agent(agent_call=agent_call, messages=messages, config=config)
+
+        if len(tool_calls) > 1:
+            logger.info(f"Invoking {len(tool_calls)} agents concurrently (max {self.max_concurrency} at a time)")
+
+        results = await asyncio.gather(*(invoke(agent_call) for agent_call in tool_calls))
+        return {
+            "messages": [message for message, _ in results],
+            "trace": [trace for _, trace in results]
+        }
+
+    async def _invoke_agent(
+            self,
+            agent_call: dict[str, Any],
+            messages: list[BaseMessage],
+            config: RunnableConfig
+    ) -> tuple[ToolMessage, dict[str, Any]]:
         from connectors.entities import AgentTypeEnum, GenAIConfig, GenAIFlowConfig, MCPConfig, A2AConfig
         from connectors.factory import ConnectorFactory
+        from connectors.result_cache import is_cacheable
 
-        messages = state.messages
-        agent_call = messages[-1].tool_calls[0]
         agent_name = agent_call["name"]
 
-        agent_to_execute = [agent for agent in self.agents if agent["name"] == agent_name][0]
-        agent_type = agent_to_execute["type"]
-
         try:
+            agent_to_execute = next(agent for agent in self.agents if agent["name"] == agent_name)
+            agent_type = agent_to_execute["type"]
+
             if agent_type == AgentTypeEnum.gen_ai.value:
                 agent_config = GenAIConfig(
                     id=agent_to_execute.get("id"),
@@ -57,16 +84,25 @@ class BaseMasterAgent(ABC):
                     session=config.get("configurable", {}).get("session")
                 )
             elif agent_type == AgentTypeEnum.flow.value:
+                flow_agents = filter_and_order_by_ids(
+                    ids=agent_to_execute.get("flow", []),
+                    items=self.agents
+                )
+                dependencies = agent_to_execute.get("flow_dependencies")
+                mappings = agent_to_execute.get("flow_mappings")
+                if any(len(steps) != len(flow_agents) for steps in (dependencies, mappings) if steps):
+                    raise ValueError(f"Not all steps of flow {agent_name} are available")
+
                 agent_config = GenAIFlowConfig(
                     id=agent_to_execute.get("id"),
                     name=remove_last_underscore_segment(agent_name),
-                    agents=filter_and_order_by_ids(
-                        ids=agent_to_execute.get("flow", []),
-                        items=self.agents
-                    ),
+                    agents=flow_agents,
                     model=self.model,
                     messages=messages[:-1].copy(),  # exclude last AI message
-                    session=config.get("configurable", {}).get("session")
+                    session=config.get("configurable", {}).get("session"),
+                    dependencies=dependencies,
+                    mappings=mappings,
+                    max_concurrency=self.max_concurrency
                 )
             elif agent_type == AgentTypeEnum.mcp.value:
                 agent_config = MCPConfig(
@@ -81,23 +117,24 @@ class BaseMasterAgent(ABC):
                     name=remove_last_underscore_segment(agent_name),
                     endpoint=agent_to_execute.get("url"),
                     task=agent_call["args"]["task"],
-                    text=agent_call["args"]["text"]
+                    text=agent_call["args"]["text"],
+                    card_content=agent_to_execute.get("card_content")
                 )
             else:
                 raise UnknownAgentTypeException(f"Unknown agent type: {agent_type}")
 
-            connector = ConnectorFactory.get_connector(agent_config)
+            connector = ConnectorFactory.get_connector(agent_config, cacheable=is_cacheable(agent_to_execute))
 
             logger.info(f"Invoking {agent_name} ({agent_type}) with parameters: {agent_call["args"]}")
-            response, trace = await connector.invoke()
+            response, trace = await connector.invoke_cached()
             logger.success(f"Agent {agent_name} response: {response}")
 
             agent_call_message = ToolMessage(
                 content=json.dumps(response),
-                name=agent_to_execute.get("name"),
+                name=agent_name,
                 tool_call_id=agent_call["id"],
             )
-            return {"messages": [agent_call_message], "trace": [trace]}
+            return agent_call_message, trace
 
         except Exception as e:
             error_message = f"Unexpected error while invoking {agent_name}: {e}"
@@ -109,18 +146,13 @@ class BaseMasterAgent(ABC):
                 "output": error_message,
                 "is_success": False
             }
-            return {
-                "messages": ToolMessage(
-                    content=error_message,
-                    name=agent_to_execute.get("name")
-                ),
-                "trace": [trace]
-            }
+            # every tool call needs its ToolMessage, otherwise the supervisor rejects the conversation
+            return ToolMessage(content=error_message, name=agent_name, tool_call_id=agent_call["id"]), trace
 
-    @property
+    @cached_property
     def graph(self) -> CompiledStateGraph:
         """
-        Execution graph of Master Agent.
+        Execution graph of Master Agent, compiled once per instance.
         """
         workflow = StateGraph(MasterAgentState)
 
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from loguru import logger
+
+from agents.react_master_agent import ReActMasterAgent
+from llms import LLMFactory
+from llms.llms import llm_config_key
+from utils.tool_index import ToolIndex
+
+
+def master_agent_key(agents: list[dict[str, Any]], configs: dict[str, Any]) -> str:
+    """
+    Hash of the agent catalog and the LLM configuration a Master Agent is built from.
+    """
+    payload = json.dumps([agents, llm_config_key(configs)], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MasterAgentCache:
+    """
+    LRU cache of Master Agents with their compiled graph and tool-bound model.
+
+    A Master Agent only holds the model and the agent catalog, per-request state
+    (messages, session) is passed to its graph on invocation, so instances built from
+    the same catalog and LLM configuration are shared between requests.
+
+    Tool indexes are kept per user outside of the Master Agents: a Master Agent built for a changed catalog
+    updates the index of the previous version incrementally instead of indexing the whole catalog again.
+    """
+
+    def __init__(
+            self,
+            max_size: int = 64,
+            parallel_tool_calls: bool = False,
+            max_concurrency: int = 4,
+            tool_top_k: int = 0
+    ):
+        self.max_size = max_size
+        self.parallel_tool_calls = parallel_tool_calls
+        self.max_concurrency = max_concurrency
+        self.tool_top_k = tool_top_k
+        self._agents: OrderedDict[str, ReActMasterAgent] = OrderedDict()
+        self._tool_indexes: OrderedDict[str, ToolIndex] = OrderedDict()
+
+    def _tool_index(self, user_id: str, agents: list[dict[str, Any]]) -> ToolIndex:
+        index = self._tool_indexes.get(user_id)
+        if index is None:
+            index = self._tool_indexes[user_id] = ToolIndex()
+        self._tool_indexes.move_to_end(user_id)
+        if len(self._tool_indexes) > self.max_size:
+            self._tool_indexes.popitem(last=False)
+        index.update(agents)
+        return index
+
+    def get_or_create(
+            self,
+            agents: list[dict[str, Any]],
+            configs: dict[str, Any],
+            user_id: Optional[str] = None
+    ) -> ReActMasterAgent:
+        key = master_agent_key(agents=agents, configs=configs)
+        preselects = self.tool_top_k and len(agents) > self.tool_top_k
+        tool_index = self._tool_index(user_id, agents) if preselects and user_id else None
+
+        if master_agent := self._agents.get(key):
+            self._agents.move_to_end(key)
+            if tool_index is not None:
+                # the index of the user now holds this catalog, possibly after it indexed another version of it
+                master_agent.tool_index = tool_index
+            logger.info("Reusing cached Master Agent")
+            return master_agent
+
+        master_agent = ReActMasterAgent(
+            model=LLMFactory.get_or_create(configs=configs),
+            agents=agents,
+            parallel_tool_calls=self.parallel_tool_calls,
+            max_concurrency=self.max_concurrency,
+            tool_top_k=self.tool_top_k,
+            tool_index=tool_index
+        )
+        self._agents[key] = master_agent
+        if len(self._agents) > self.max_size:
+            self._agents.popitem(last=False)
+        return master_agent
+
+    def clear(self) -> None:
+        self._agents.clear()
+        self._tool_indexes.clear()
+
+
+class AgentCatalogCache:
+    """
+    Per-user cache of the active agent catalog fetched from the backend.
+
+    The backend bumps its catalog version whenever an agent, flow, A2A card or MCP server
+    changes state and sends it with every ML request. A cached catalog is served until the
+    version differs or `ttl` seconds have passed; requests without a version always refetch.
+    """
+
+    def __init__(self, ttl: float = 300, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._catalogs: OrderedDict[str, tuple[str, float, list[dict[str, Any]]]] = OrderedDict()
+
+    async def get(
+            self,
+            user_id: str,
+            catalog_version: Optional[str],
+            fetch: Callable[[], Awaitable[list[dict[str, Any]]]]
+    ) -> list[dict[str, Any]]:
+        cached = self._catalogs.get(user_id)
+        if cached and catalog_version is not None:
+            version, fetched_at, agents = cached
+            if version == catalog_version and time.monotonic() - fetched_at < self.ttl:
+                self._catalogs.move_to_end(user_id)
+                logger.info(f"Using cached agent catalog, version {version}")
+                return agents
+
+        agents = await fetch()
+        if catalog_version is not None:
+            self._catalogs[user_id] = (catalog_version, time.monotonic(), agents)
+            self._catalogs.move_to_end(user_id)
+            if len(self._catalogs) > self.max_size:
+                self._catalogs.popitem(last=False)
+        return agents
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        if user_id is None:
+            self._catalogs.clear()
+        else:
+            self._catalogs.pop(user_id, None)
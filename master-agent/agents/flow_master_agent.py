@@ -1,12 +1,16 @@
-from typing import Any
+import asyncio
+from typing import Any, Optional
+from uuid import uuid4
 
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
 from loguru import logger
 
 from agents.base import BaseMasterAgent
+from config.settings import Settings
 from models.states import MasterAgentState
 from utils.agents import select_agent_and_resolve_parameters
+from utils.flows import input_schema, map_arguments, match_schema, parse_tool_output
 from utils.tracing import trace_execution_time
 
 
@@ -15,8 +19,109 @@ class FlowMasterAgent(BaseMasterAgent):
             self,
             model: BaseChatModel,
             agents: list[dict[str, Any]], # ordered list of agents to execute
+            dependencies: Optional[list[list[int]]] = None,
+            mappings: Optional[list[Optional[dict[str, str]]]] = None,
+            max_concurrency: int = 4,
+            schema_fast_path: Optional[bool] = None
     ) -> None:
-        super().__init__(model=model, agents=agents)
+        """
+        Executes the steps of a flow. Sequential flows run their agents one by one in the given order.
+        DAG flows declare `dependencies` (indices of the steps each step waits for): every supervisor turn
+        resolves the parameters of all ready steps concurrently and they are executed concurrently,
+        dependent steps see the outputs of the steps they depend on in the conversation.
+
+        Arguments of a dependent step are built without an LLM call when the step declares an input mapping
+        (input field -> JMESPath expression on the output of its dependency, on the list of outputs if it has
+        several) or, with the schema fast path, when the output of its dependency already matches its input schema.
+
+        Args:
+            model (BaseChatModel): Langchain chat model
+            agents (list[dict[str, Any]]): Agents of the flow, one per step
+            dependencies (Optional[list[list[int]]]): Step dependencies of a DAG flow, None for sequential flows
+            mappings (Optional[list[Optional[dict[str, str]]]]): Declared input mapping of each step
+            max_concurrency (int): Maximum number of steps executed at the same time
+            schema_fast_path (Optional[bool]): Whether to pass matching outputs on as arguments, defaults to settings
+        """
+        super().__init__(model=model, agents=agents, max_concurrency=max_concurrency)
+        steps = len(self._agents_to_bind_to_llm)
+        self.dependencies = dependencies or [[idx - 1] if idx else [] for idx in range(steps)]
+        self._validate_dependencies()
+        self._pending = list(range(steps))
+        self._scheduled: set[int] = set()
+        self._step_by_tool_call: dict[str, int] = {}
+        self._outputs: dict[int, Any] = {}
+        self._mapped_tool_calls: set[str] = set()
+        self.mappings = mappings or [None] * steps
+        self.schema_fast_path = Settings().FLOW_SCHEMA_FAST_PATH if schema_fast_path is None else schema_fast_path
+
+    def _validate_dependencies(self) -> None:
+        """
+        Rejects dependencies the steps of the flow can't be scheduled in, they would end the flow without executing them.
+        """
+        steps = len(self.dependencies)
+        if any(dep == idx or not 0 <= dep < steps for idx, deps in enumerate(self.dependencies) for dep in deps):
+            raise ValueError("Flow steps depend on themselves or on unknown steps")
+
+        scheduled: set[int] = set()
+        while ready := [
+            idx for idx in range(steps)
+            if idx not in scheduled and all(dep in scheduled for dep in self.dependencies[idx])
+        ]:
+            scheduled.update(ready)
+        if len(scheduled) < steps:
+            raise ValueError("Flow steps have cyclic dependencies")
+
+    @property
+    def sinks(self) -> set[int]:
+        """
+        Steps no other step depends on, their outputs form the response of the flow.
+        """
+        return set(range(len(self.dependencies))) - {dep for deps in self.dependencies for dep in deps}
+
+    def _ready_steps(self) -> list[int]:
+        return [idx for idx in self._pending if all(dep in self._scheduled for dep in self.dependencies[idx])]
+
+    def _collect_outputs(self, messages: list[BaseMessage]) -> None:
+        for message in messages:
+            if isinstance(message, ToolMessage) and message.tool_call_id in self._step_by_tool_call:
+                self._outputs[self._step_by_tool_call[message.tool_call_id]] = parse_tool_output(message.content)
+
+    def _deterministic_arguments(self, idx: int) -> Optional[dict[str, Any]]:
+        """
+        Arguments of the step built from the outputs of its dependencies, None if the LLM has to resolve them.
+        """
+        dependencies = self.dependencies[idx]
+        if not dependencies or any(dep not in self._outputs for dep in dependencies):
+            return None
+
+        source = [self._outputs[dep] for dep in dependencies]
+        source = source[0] if len(source) == 1 else source
+        schema = input_schema(self._agents_to_bind_to_llm[idx])
+
+        if mapping := self.mappings[idx]:
+            return map_arguments(mapping=mapping, source=source, schema=schema)
+        if self.schema_fast_path:
+            return match_schema(source=source, schema=schema)
+        return None
+
+    async def _resolve_step(self, idx: int, messages: list[BaseMessage]) -> AIMessage:
+        agent_to_execute = self._agents_to_bind_to_llm[idx]
+        if arguments := self._deterministic_arguments(idx):
+            logger.info(f"Arguments for {self.agents[idx]["name"]} in the flow are mapped without LLM call")
+            tool_call_id = f"call_{uuid4().hex}"
+            self._mapped_tool_calls.add(tool_call_id)
+            return AIMessage(
+                content="",
+                tool_calls=[{"name": self.agents[idx]["name"], "args": arguments, "id": tool_call_id, "type": "tool_call"}]
+            )
+
+        logger.info(f"Resolving parameters for {agent_to_execute.get("name")} in the flow")
+        return await select_agent_and_resolve_parameters(
+            model=self.model,
+            messages=messages,
+            agents=[agent_to_execute],
+            agent_choice=True  # force the current agent to be called
+        )
 
     async def select_agent(self, state: MasterAgentState):
         messages = state.messages
@@ -26,26 +131,34 @@ class FlowMasterAgent(BaseMasterAgent):
         }
 
         try:
-            if self._agents_to_bind_to_llm:
-                agent_to_execute = self._agents_to_bind_to_llm.pop(0)  # get agent from the top of the list
-                logger.info(f"Resolving parameters for {agent_to_execute.get("name")} in the flow")
+            self._collect_outputs(messages)
+            if ready := self._ready_steps():
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+
+                async def resolve(idx: int) -> AIMessage:
+                    async with semaphore:
+                        return await self._resolve_step(idx=idx, messages=messages)
 
                 async with trace_execution_time(trace=trace):
-                    response = await select_agent_and_resolve_parameters(
-                        model=self.model,
-                        messages=messages,
-                        agents=[agent_to_execute],
-                        agent_choice=True  # force the current agent to be called
-                    )
-
-                logger.success(
-                    f"Agent {agent_to_execute.get('name')} will be executed with args {response.tool_calls[0]["args"]}"
-                )
+                    responses = await asyncio.gather(*(resolve(idx) for idx in ready))
+
+                # steps of one turn become the tool calls of a single message, executed concurrently
+                tool_calls = []
+                for idx, response in zip(ready, responses):
+                    tool_call = response.tool_calls[0]
+                    self._step_by_tool_call[tool_call["id"]] = idx
+                    tool_calls.append(tool_call)
+                    logger.success(f"Agent {tool_call["name"]} will be executed with args {tool_call["args"]}")
+
+                response = responses[0] if len(responses) == 1 else AIMessage(content="", tool_calls=tool_calls)
+                self._scheduled.update(ready)
+                self._pending = [idx for idx in self._pending if idx not in self._scheduled]
 
                 trace.update(
                     {
                         "output": response.model_dump(),
-                        "is_success": True
+                        "is_success": True,
+                        "llm_calls_skipped": sum(call["id"] in self._mapped_tool_calls for call in tool_calls)
                     }
                 )
                 return {"messages": [response], "trace": [trace]}
@@ -61,3 +174,16 @@ class FlowMasterAgent(BaseMasterAgent):
                 "is_success": False
             }
             return {"messages": [AIMessage(content=error_message)], "trace": [trace]}
+
+    def final_response(self, messages: list[BaseMessage]) -> str:
+        """
+        Response of the flow: the output of its last step, outputs of all final steps joined for DAG flows.
+        """
+        sinks = self.sinks
+        outputs = [
+            message.content for message in messages
+            if isinstance(message, ToolMessage) and self._step_by_tool_call.get(message.tool_call_id) in sinks
+        ]
+        if not isinstance(messages[-1], ToolMessage) or len(outputs) <= 1:
+            return messages[-1].content
+        return "\n\n".join(outputs)
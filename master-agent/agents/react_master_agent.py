@@ -1,20 +1,32 @@
-from typing import Any
+from collections import OrderedDict
+from functools import cached_property
+from typing import Any, Optional
 
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import AIMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import Runnable
 from loguru import logger
 
 from agents.base import BaseMasterAgent
 from models.states import MasterAgentState
 from utils.agents import select_agent_and_resolve_parameters
+from utils.common import bind_tools_safely
+from utils.tool_index import ToolIndex, preselect_agents
 from utils.tracing import trace_execution_time
 
+# models bound to preselected agent subsets kept per Master Agent, conversations on the same topic reuse them
+BOUND_MODEL_CACHE_SIZE = 32
+
 
 class ReActMasterAgent(BaseMasterAgent):
     def __init__(
             self,
             model: BaseChatModel,
-            agents: list[dict[str, Any]]
+            agents: list[dict[str, Any]],
+            parallel_tool_calls: bool = False,
+            max_concurrency: int = 4,
+            tool_top_k: int = 0,
+            tool_index: Optional[ToolIndex] = None
     ) -> None:
         """
         Supervisor agent building on top of ReAct framework to automatically execute available agents and flows.
@@ -23,9 +35,75 @@ class ReActMasterAgent(BaseMasterAgent):
         Args:
             model (BaseChatModel): Langchain chat model (preferably OpenAI or Azure OpenAI)
             agents (list[dict[str, Any]]): List of available agents
+            parallel_tool_calls (bool): Allows the supervisor to select several agents in one turn,
+                they are executed concurrently
+            max_concurrency (int): Maximum number of agents executed at the same time
+            tool_top_k (int): Number of agents preselected per turn for catalogs larger than that, 0 binds all agents
+            tool_index (Optional[ToolIndex]): Index of the agent catalog, shared by the Master Agents built from
+                versions of the same catalog; built from `agents` if not given
         """
-        super().__init__(model, agents)
+        super().__init__(model, agents, max_concurrency=max_concurrency)
+        self.parallel_tool_calls = parallel_tool_calls
+        self.tool_top_k = tool_top_k
         self._agents_to_bind_to_llm = [item["agent_schema"] for item in agents]
+        self._tool_index = tool_index
+        self._bound_models: OrderedDict[frozenset[str], Runnable] = OrderedDict()
+
+    @cached_property
+    def model_with_agents(self) -> Runnable:
+        """
+        Model with the whole agent catalog bound as tools, bound once per instance.
+        """
+        return bind_tools_safely(
+            model=self.model,
+            tools=self._agents_to_bind_to_llm,
+            parallel_tool_calls=self.parallel_tool_calls
+        )
+
+    @property
+    def tool_index(self) -> ToolIndex:
+        if self._tool_index is None:
+            self._tool_index = ToolIndex()
+            self._tool_index.update(self.agents)
+        return self._tool_index
+
+    @tool_index.setter
+    def tool_index(self, index: ToolIndex) -> None:
+        self._tool_index = index
+
+    def _model_with_selected_agents(self, agents: list[dict[str, Any]]) -> Runnable:
+        """
+        Model with a preselected subset of the catalog bound as tools, cached by the names of the agents.
+        """
+        key = frozenset(agent["name"] for agent in agents)
+        if model_with_agents := self._bound_models.get(key):
+            self._bound_models.move_to_end(key)
+            return model_with_agents
+
+        model_with_agents = self._bound_models[key] = bind_tools_safely(
+            model=self.model,
+            tools=[agent["agent_schema"] for agent in agents],
+            parallel_tool_calls=self.parallel_tool_calls
+        )
+        if len(self._bound_models) > BOUND_MODEL_CACHE_SIZE:
+            self._bound_models.popitem(last=False)
+        return model_with_agents
+
+    def _preselect_agents(self, messages: list[BaseMessage]) -> list[dict[str, Any]]:
+        """
+        Agents relevant to the latest user messages, always including flows and agents already called.
+        """
+        if not self.tool_top_k or len(self.agents) <= self.tool_top_k:
+            return self.agents
+
+        human_messages = [message for message in messages if isinstance(message, HumanMessage)][-2:]
+        query = " ".join(str(message.content) for message in human_messages)
+        pinned = {agent["name"] for agent in self.agents if agent.get("type") == "flow"}
+        pinned |= {
+            tool_call["name"] for message in messages if isinstance(message, AIMessage)
+            for tool_call in message.tool_calls
+        }
+        return preselect_agents(index=self.tool_index, agents=self.agents, query=query, k=self.tool_top_k, pinned=pinned)
 
     async def select_agent(self, state: MasterAgentState):
         """
@@ -40,16 +118,26 @@ class ReActMasterAgent(BaseMasterAgent):
         logger.info("Selecting agent to execute")
 
         try:
+            agents = self._preselect_agents(messages)
+            if len(agents) < len(self.agents):
+                logger.info(f"Preselected {len(agents)} of {len(self.agents)} agents")
+                trace["preselected_agents"] = [agent["name"] for agent in agents]
+                agent_schemas = [agent["agent_schema"] for agent in agents]
+                model_with_agents = self._model_with_selected_agents(agents)
+            else:
+                agent_schemas, model_with_agents = self._agents_to_bind_to_llm, self.model_with_agents
+
             async with trace_execution_time(trace=trace):
                 response = await select_agent_and_resolve_parameters(
                     model=self.model,
                     messages=messages,
-                    agents=self._agents_to_bind_to_llm
+                    agents=agent_schemas,
+                    model_with_agents=model_with_agents
                 )
 
-            if response.tool_calls:
-                logger.success(f"Selected {response.tool_calls[0]["name"]} with args {response.tool_calls[0]["args"]}")
-            else:
+            for tool_call in response.tool_calls:
+                logger.success(f"Selected {tool_call["name"]} with args {tool_call["args"]}")
+            if not response.tool_calls:
                 logger.success(f"No agent is selected, generating final response")
 
             trace.update(
@@ -0,0 +1,129 @@
+"""
+Benchmark of the top-k agent preselection for catalogs of 10, 100 and 1000 agents.
+
+Builds synthetic catalogs of GenAI agents and MCP tools, asks one question per agent with a
+paraphrase of its description and reports index build time, incremental refresh time,
+query latency, recall of the target agent and the size of the bound tool schemas.
+
+Usage (from the master-agent directory):
+    python -m benchmarks.tool_selection_bench [--top-k 32] [--queries 200]
+"""
+
+import argparse
+import json
+import random
+import time
+
+from utils.tool_index import ToolIndex, preselect_agents
+
+CATALOG_SIZES = (10, 100, 1000)
+
+DOMAINS = {
+    "lab": ["blood test", "hemoglobin level", "lab report", "cholesterol panel", "glucose reading"],
+    "billing": ["invoice", "payment", "refund", "subscription plan", "tax receipt"],
+    "weather": ["forecast", "temperature", "rainfall", "wind speed", "storm warning"],
+    "travel": ["flight", "hotel booking", "train ticket", "visa requirement", "car rental"],
+    "docs": ["pdf document", "spreadsheet", "contract clause", "meeting notes", "slide deck"],
+    "code": ["pull request", "unit test", "stack trace", "dependency version", "build log"],
+    "crm": ["customer record", "sales lead", "support ticket", "account owner", "churn risk"],
+    "hr": ["vacation request", "payroll", "job candidate", "onboarding checklist", "performance review"],
+}
+ACTIONS = ["extract", "summarize", "validate", "translate", "compare", "search", "create", "delete"]
+SYNONYMS = {
+    "extract": "pull out", "summarize": "give me a summary of", "validate": "check",
+    "translate": "translate", "compare": "compare", "search": "find", "create": "make", "delete": "remove",
+}
+
+
+def make_catalog(size: int, rng: random.Random) -> list[dict]:
+    agents = []
+    for idx in range(size):
+        domain = rng.choice(list(DOMAINS))
+        subject = rng.choice(DOMAINS[domain])
+        action = rng.choice(ACTIONS)
+        name = f"{action}_{subject.replace(' ', '_')}_{idx}"
+        description = f"{action.capitalize()} the {subject} of the {domain} system and return structured data"
+        if idx % 2:
+            schema = {"type": "function", "function": {
+                "name": name, "description": description,
+                "parameters": {"type": "object", "properties": {"text": {"type": "string", "description": f"The {subject}"}},
+                               "required": ["text"]},
+            }}
+            agent_type = "genai"
+        else:
+            schema = {"title": name, "description": description, "type": "object",
+                      "properties": {f"{subject.split()[0]}_id": {"type": "string"}}, "required": []}
+            agent_type = "mcp"
+        agents.append({"id": str(idx), "name": name, "type": agent_type, "agent_schema": schema,
+                       "subject": subject, "action": action})
+    return agents
+
+
+def make_query(agent: dict) -> str:
+    # paraphrase: the action verb is mostly replaced, the subject is kept
+    return f"Could you {SYNONYMS[agent['action']]} the {agent['subject']} I sent yesterday?"
+
+
+def run(size: int, top_k: int, queries: int, rng: random.Random) -> dict:
+    agents = make_catalog(size, rng)
+
+    start = time.perf_counter()
+    index = ToolIndex()
+    index.update(agents)
+    build_ms = (time.perf_counter() - start) * 1e3
+
+    # refresh with 1% of the catalog changed (at least one entry)
+    changed = [dict(agent) for agent in agents]
+    for agent in rng.sample(changed, max(1, size // 100)):
+        agent["agent_schema"] = {**agent["agent_schema"], "description": f"Updated tool for {agent['subject']}"}
+    start = time.perf_counter()
+    index.update(changed)
+    index.update(agents)
+    refresh_ms = (time.perf_counter() - start) * 1e3 / 2
+
+    targets = [rng.choice(agents) for _ in range(queries)]
+    hits = 0
+    selected_sizes = []
+    start = time.perf_counter()
+    for target in targets:
+        selected = preselect_agents(index=index, agents=agents, query=make_query(target), k=top_k)
+        hits += target in selected
+        selected_sizes.append(len(selected))
+    query_us = (time.perf_counter() - start) * 1e6 / queries
+
+    full_schema = len(json.dumps([agent["agent_schema"] for agent in agents]))
+    avg_selected = sum(selected_sizes) / len(selected_sizes)
+    return {
+        "catalog_size": size,
+        "top_k": top_k,
+        "build_ms": round(build_ms, 3),
+        "refresh_ms": round(refresh_ms, 3),
+        "query_us": round(query_us, 1),
+        "recall": round(hits / queries, 3),
+        "avg_bound_agents": round(avg_selected, 1),
+        "schema_chars_full": full_schema,
+        "schema_chars_bound": round(full_schema * avg_selected / size),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top-k", type=int, default=32)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'catalog':>7} | {'build, ms':>9} | {'refresh, ms':>11} | {'query, us':>9} | {'recall':>6} | "
+          f"{'bound':>5} | schema chars (full -> bound)")
+    for size in CATALOG_SIZES:
+        result = run(size=size, top_k=args.top_k, queries=args.queries, rng=rng)
+        print(
+            f"{size:>7} | {result['build_ms']:>9.2f} | {result['refresh_ms']:>11.2f} | {result['query_us']:>9.1f} | "
+            f"{result['recall']:>6.3f} | {result['avg_bound_agents']:>5.1f} | "
+            f"{result['schema_chars_full']} -> {result['schema_chars_bound']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
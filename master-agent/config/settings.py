@@ -24,4 +24,52 @@ class Settings(BaseSettings):
     SECRET_KEY: str = Field(
         default="GenAI-ddc5e9f5-c340-4dcc-9872-d7f098b6b172",
         alias="SECRET_KEY"
-    )
\ No newline at end of file
+    )
+    MASTER_AGENT_CACHE_SIZE: int = Field(
+        default=64, alias="MASTER_AGENT_CACHE_SIZE"
+    )
+    AGENT_CATALOG_TTL_SECONDS: float = Field(
+        default=300, alias="AGENT_CATALOG_TTL_SECONDS"
+    )  # upper bound for serving a cached catalog when no version change reaches the Master Agent
+    PARALLEL_TOOL_CALLS: bool = Field(
+        default=False, alias="PARALLEL_TOOL_CALLS"
+    )  # lets the supervisor select several agents per turn, they are executed concurrently
+    MAX_CONCURRENT_AGENT_CALLS: int = Field(
+        default=4, alias="MAX_CONCURRENT_AGENT_CALLS"
+    )
+    FLOW_SCHEMA_FAST_PATH: bool = Field(
+        default=True, alias="FLOW_SCHEMA_FAST_PATH"
+    )  # passes an output matching the input schema of the next flow step on without an LLM call
+    MCP_POOL_MAX_SESSIONS: int = Field(
+        default=4, alias="MCP_POOL_MAX_SESSIONS"
+    )  # open sessions per MCP endpoint, a session multiplexes concurrent tool calls
+    MCP_POOL_IDLE_SECONDS: float = Field(
+        default=300, alias="MCP_POOL_IDLE_SECONDS"
+    )
+    MCP_POOL_HEALTH_CHECK_SECONDS: float = Field(
+        default=60, alias="MCP_POOL_HEALTH_CHECK_SECONDS"
+    )
+    A2A_CARD_TTL_SECONDS: float = Field(
+        default=300, alias="A2A_CARD_TTL_SECONDS"
+    )  # agent cards older than this are revalidated with their ETag
+    RESULT_CACHE_TTL_SECONDS: float = Field(
+        default=300, alias="RESULT_CACHE_TTL_SECONDS"
+    )
+    RESULT_CACHE_MAX_SIZE: int = Field(
+        default=1024, alias="RESULT_CACHE_MAX_SIZE"
+    )
+    CACHEABLE_AGENT_IDS: list[str] = Field(
+        default=[], alias="CACHEABLE_AGENT_IDS"
+    )  # agents opted in to result caching, read-only/idempotent MCP tools are cached without opting in
+    TOOL_PRESELECTION_TOP_K: int = Field(
+        default=0, alias="TOOL_PRESELECTION_TOP_K"
+    )  # 0 (default) binds the whole catalog, e.g. 32 binds only the 32 agents closest to the request
+    ROUTER_API_URL: str = Field(
+        default="http://genai-router:8080", alias="ROUTER_API_URL"
+    )
+    STREAM_FINAL_RESPONSE: bool = Field(
+        default=False, alias="STREAM_FINAL_RESPONSE"
+    )  # streams the final answer to the frontend through the router while it is generated
+    STREAM_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=0.05, alias="STREAM_FLUSH_INTERVAL_SECONDS"
+    )  # chunks of all requests generated within the interval are sent in one request
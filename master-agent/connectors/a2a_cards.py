@@ -0,0 +1,83 @@
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+import httpx
+from a2a.types import AgentCard
+from loguru import logger
+
+from config.settings import Settings
+
+AGENT_CARD_PATH = "/.well-known/agent.json"
+
+
+class CachedAgentCard:
+    def __init__(self, card: AgentCard, etag: Optional[str] = None):
+        self.card = card
+        self.etag = etag
+        self.fetched_at = time.monotonic()
+
+
+class AgentCardCache:
+    """
+    Cache of A2A agent cards by agent base URL.
+
+    Cards are seeded from the catalog (the backend stores the card of every A2A agent) or fetched from
+    the agent. A card is served for `ttl` seconds, then revalidated with its ETag, so an unchanged card
+    costs a 304 instead of a download.
+    """
+
+    def __init__(self, ttl: float = 300, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._cards: OrderedDict[str, CachedAgentCard] = OrderedDict()
+
+    def _store(self, base_url: str, entry: CachedAgentCard) -> None:
+        self._cards[base_url] = entry
+        self._cards.move_to_end(base_url)
+        if len(self._cards) > self.max_size:
+            self._cards.popitem(last=False)
+
+    def seed(self, base_url: str, card_content: dict[str, Any]) -> Optional[AgentCard]:
+        """
+        Caches a card from the catalog payload, returns None if it is not a valid agent card.
+        """
+        try:
+            card = AgentCard.model_validate(card_content)
+        except ValueError as e:
+            logger.debug(f"Stored agent card of {base_url} can not be used: {e}")
+            return None
+        self._store(base_url, CachedAgentCard(card))
+        return card
+
+    async def get(
+            self,
+            client: httpx.AsyncClient,
+            base_url: str,
+            card_content: Optional[dict[str, Any]] = None
+    ) -> AgentCard:
+        entry = self._cards.get(base_url)
+        if entry and time.monotonic() - entry.fetched_at < self.ttl:
+            self._cards.move_to_end(base_url)
+            return entry.card
+
+        if not entry and card_content and (card := self.seed(base_url, card_content)):
+            return card
+
+        headers = {"If-None-Match": entry.etag} if entry and entry.etag else {}
+        response = await client.get(f"{base_url.rstrip('/')}{AGENT_CARD_PATH}", headers=headers)
+        if response.status_code == httpx.codes.NOT_MODIFIED and entry:
+            entry.fetched_at = time.monotonic()
+            self._cards.move_to_end(base_url)
+            return entry.card
+
+        response.raise_for_status()
+        card = AgentCard.model_validate(response.json())
+        self._store(base_url, CachedAgentCard(card, etag=response.headers.get("ETag")))
+        return card
+
+    def invalidate(self, base_url: str) -> None:
+        self._cards.pop(base_url, None)
+
+
+agent_cards = AgentCardCache(ttl=Settings().A2A_CARD_TTL_SECONDS)
@@ -2,13 +2,14 @@ import uuid
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from typing import Any, Optional
 
 from genai_session.session import GenAISession
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage
 
 from agents.flow_master_agent import FlowMasterAgent
+from connectors.result_cache import ResultCache, result_key
 
 
 class AgentTypeEnum(Enum):
@@ -30,6 +31,7 @@ class A2AConfig(AgentConfig):
     endpoint: str
     task: str
     text: str
+    card_content: Optional[dict] = None
     role: str = "user"
     message_id: str = field(default_factory=lambda: str(uuid.uuid4()))
     action: str = field(init=False)
@@ -63,20 +65,45 @@ class GenAIFlowConfig(AgentConfig):
     model: BaseChatModel
     messages: list[BaseMessage]
     session: GenAISession
+    dependencies: Optional[list[list[int]]] = None
+    mappings: Optional[list[Optional[dict[str, str]]]] = None
+    max_concurrency: int = 4
     flow_master_agent: FlowMasterAgent = field(init=False)
 
     def __post_init__(self):
         self.agent_type = AgentTypeEnum.flow.value
         self.flow_master_agent = FlowMasterAgent(
             model=self.model,
-            agents=self.agents
+            agents=self.agents,
+            dependencies=self.dependencies,
+            mappings=self.mappings,
+            max_concurrency=self.max_concurrency
         )
 
 
 class ConnectorStrategy(ABC):
-    def __init__(self, config: AgentConfig):
+    def __init__(self, config: AgentConfig, result_cache: Optional[ResultCache] = None):
         self.config = config
+        self.result_cache = result_cache
 
     @abstractmethod
     async def invoke(self, *args, **kwargs) -> dict:
         pass
+
+    async def invoke_cached(self, *args, **kwargs) -> tuple[dict[str, Any] | str | None, dict[str, Any]]:
+        """
+        Invokes the agent through the result cache if the connector has one, cache hits are marked in the trace.
+        """
+        arguments = getattr(self.config, "arguments", getattr(self.config, "action", None))
+        if self.result_cache is None or arguments is None:
+            return await self.invoke(*args, **kwargs)
+
+        key = result_key(self.config.id, arguments)
+        if cached := self.result_cache.get(key):
+            response, trace = cached
+            return response, {**trace, "execution_time": 0.0, "cache_hit": True}
+
+        response, trace = await self.invoke(*args, **kwargs)
+        if trace.get("is_success"):
+            self.result_cache.set(key, response, trace)
+        return response, {**trace, "cache_hit": False}
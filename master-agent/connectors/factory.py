@@ -1,6 +1,7 @@
 from connectors.entities import ConnectorStrategy, AgentConfig, AgentTypeEnum
 from connectors.exceptions import InvokeManagerNotFoundException
 from connectors.managers import GenAIFlowConnector, MCPConnector, A2AConnector, GenAIConnector
+from connectors.result_cache import result_cache
 
 
 class ConnectorFactory:
@@ -12,7 +13,7 @@ class ConnectorFactory:
     }
 
     @classmethod
-    def get_connector(cls, config: AgentConfig) -> ConnectorStrategy:
+    def get_connector(cls, config: AgentConfig, cacheable: bool = False) -> ConnectorStrategy:
         if strategy_cls := cls._strategies.get(config.agent_type):
-            return strategy_cls(config)
+            return strategy_cls(config, result_cache=result_cache if cacheable else None)
         raise InvokeManagerNotFoundException(f"Unsupported agent type: {config.agent_type}")
@@ -3,12 +3,12 @@ from typing import Any, cast
 from a2a.client import A2AClient
 from a2a.types import MessageSendParams, SendMessageRequest, SendMessageSuccessResponse
 from genai_session.session import GenAISession
-from httpx import AsyncClient
 from loguru import logger
-from mcp.client.session import ClientSession
-from mcp.client.streamable_http import streamablehttp_client
 
+from connectors.a2a_cards import agent_cards
 from connectors.entities import ConnectorStrategy, A2AConfig, GenAIConfig, MCPConfig, GenAIFlowConfig
+from connectors.mcp_pool import mcp_sessions
+from utils.clients import http_clients
 from utils.tracing import trace_execution_time
 
 
@@ -24,22 +24,18 @@ class MCPConnector(ConnectorStrategy):
             "input": config.arguments,
         }
         try:
-            async with streamablehttp_client(config.endpoint) as (read, write, _):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
+            async with trace_execution_time(trace=trace):
+                response = await mcp_sessions.call_tool(config.endpoint, config.name, config.arguments)
 
-                    async with trace_execution_time(trace=trace):
-                        response = await session.call_tool(config.name, config.arguments)
-
-                    trace.update(
-                        {
-                            "output": response.model_dump(),
-                            "is_success": not response.isError,
-                        }
-                    )
-                    if response.content:
-                        return response.content[0].text, trace
-                    return "Success", trace
+            trace.update(
+                {
+                    "output": response.model_dump(),
+                    "is_success": not response.isError,
+                }
+            )
+            if response.content:
+                return response.content[0].text, trace
+            return "Success", trace
 
         except Exception as e:
             error_message = f"Unexpected error while invoking MCP tool: {e}"
@@ -66,46 +62,46 @@ class A2AConnector(ConnectorStrategy):
             "input": config.action,
         }
         try:
-            async with AsyncClient() as httpx_client:
-                client = await A2AClient.get_client_from_agent_card_url(
-                    httpx_client, config.endpoint
-                )
-
-                send_message_payload: dict[str, Any] = {
-                    "message": {
-                        "role": config.role,
-                        "messageId": config.message_id,
-                        "parts": [
-                            {
-                                "type": "text",
-                                "text": config.action
-                            }
-                        ],
-                    },
-                }
-                request = SendMessageRequest(
-                    params=MessageSendParams(**send_message_payload)
-                )
+            httpx_client = http_clients.get("a2a")
+            agent_card = await agent_cards.get(httpx_client, config.endpoint, card_content=config.card_content)
+            client = A2AClient(httpx_client, agent_card=agent_card)
+
+            send_message_payload: dict[str, Any] = {
+                "message": {
+                    "role": config.role,
+                    "messageId": config.message_id,
+                    "parts": [
+                        {
+                            "type": "text",
+                            "text": config.action
+                        }
+                    ],
+                },
+            }
+            request = SendMessageRequest(
+                params=MessageSendParams(**send_message_payload)
+            )
 
-                async with trace_execution_time(trace=trace):
-                    response = await client.send_message(request, http_kwargs={"timeout": None})
+            async with trace_execution_time(trace=trace):
+                response = await client.send_message(request, http_kwargs={"timeout": None})
 
-                if isinstance(response.root, SendMessageSuccessResponse):
-                    response_text = response.root.result.artifacts[0].parts[0].root.text
-                else:
-                    response_text = response.root.error.message
+            if isinstance(response.root, SendMessageSuccessResponse):
+                response_text = response.root.result.artifacts[0].parts[0].root.text
+            else:
+                response_text = response.root.error.message
 
-                trace.update(
-                    {
-                        "output": response.model_dump(mode="json"),
-                        "is_success": isinstance(response.root, SendMessageSuccessResponse)
-                    }
-                )
+            trace.update(
+                {
+                    "output": response.model_dump(mode="json"),
+                    "is_success": isinstance(response.root, SendMessageSuccessResponse)
+                }
+            )
 
-                return response_text, trace
+            return response_text, trace
 
         except Exception as e:
             error_message = f"Unexpected error while invoking A2A agent: {e}"
+            agent_cards.invalidate(config.endpoint)  # the card may be outdated, fetch it again next time
 
             logger.exception(error_message)
 
@@ -175,6 +171,6 @@ class GenAIFlowConnector(ConnectorStrategy):
                 config={"configurable": {"session": session}}
             )
 
-        response = final_state["messages"][-1].content
+        response = config.flow_master_agent.final_response(final_state["messages"])
         trace["flow"] = final_state["trace"]
         return response, trace
@@ -0,0 +1,178 @@
+import asyncio
+import time
+from typing import Any, Optional
+
+import anyio
+import httpx
+from loguru import logger
+from mcp.client.session import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, CallToolResult
+
+from config.settings import Settings
+
+# the session broke, the call is retried once on a new session
+RECONNECT_ERRORS = (anyio.ClosedResourceError, anyio.BrokenResourceError, httpx.TransportError)
+# errors the client reports itself for a session which is gone: the server dropped it (answering 404)
+# or the transport closed, unlike error responses of the server they are not a result of the call
+SESSION_GONE_ERROR_CODES = (32600, CONNECTION_CLOSED)
+
+
+class PooledMCPSession:
+    """
+    Initialized MCP session kept open in a background task.
+
+    The transport and the session are entered and exited by the same task (anyio cancel scopes require it),
+    requests are sent from any task through `session`, concurrent requests are multiplexed by the session.
+    """
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self.session: Optional[ClientSession] = None
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error: Optional[BaseException] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def start(self, timeout: float) -> None:
+        self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise
+        if self._error:
+            raise self._error
+
+    async def _run(self) -> None:
+        try:
+            async with streamablehttp_client(self.endpoint) as (read, write, _):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except Exception as e:
+            self._error = e
+            logger.warning(f"MCP session to {self.endpoint} closed: {e}")
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def close(self) -> None:
+        self._closing.set()
+        if self._task and not self._task.done():
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                self._task.cancel()
+
+
+class MCPSessionPool:
+    """
+    Pool of initialized MCP sessions per endpoint.
+
+    A tool call reuses an open session, so in the steady state it costs a single round trip instead of
+    a connection setup and an `initialize` handshake. New sessions are opened while all sessions of the endpoint
+    are busy (up to `max_sessions`). Idle sessions are pinged every `health_check_interval` seconds and closed
+    when the ping fails or after `idle_timeout` seconds without use; a call failing because its session broke
+    or was terminated by the server is retried once on a new session.
+    """
+
+    def __init__(
+            self,
+            max_sessions: int = 4,
+            idle_timeout: float = 300,
+            health_check_interval: float = 60,
+            connect_timeout: float = 30
+    ):
+        self.max_sessions = max(max_sessions, 1)
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self.connect_timeout = connect_timeout
+        self._sessions: dict[str, list[PooledMCPSession]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._maintenance: Optional[asyncio.Task] = None
+
+    async def _acquire(self, endpoint: str) -> PooledMCPSession:
+        if self._maintenance is None or self._maintenance.done():
+            self._maintenance = asyncio.create_task(self._maintain())
+
+        async with self._locks.setdefault(endpoint, asyncio.Lock()):
+            sessions = self._sessions[endpoint] = [s for s in self._sessions.get(endpoint, []) if s.alive]
+            if sessions:
+                least_busy = min(sessions, key=lambda s: s.in_use)
+                if least_busy.in_use == 0 or len(sessions) >= self.max_sessions:
+                    return least_busy
+
+            pooled = PooledMCPSession(endpoint)
+            await pooled.start(timeout=self.connect_timeout)
+            sessions.append(pooled)
+            logger.info(f"Opened MCP session to {endpoint} ({len(sessions)} open)")
+            return pooled
+
+    async def _discard(self, pooled: PooledMCPSession) -> None:
+        sessions = self._sessions.get(pooled.endpoint, [])
+        if pooled in sessions:
+            sessions.remove(pooled)
+        await pooled.close()
+
+    async def call_tool(self, endpoint: str, name: str, arguments: dict[str, Any]) -> CallToolResult:
+        for attempt in range(2):
+            pooled = await self._acquire(endpoint)
+            pooled.in_use += 1
+            try:
+                if pooled.session is None:
+                    raise anyio.ClosedResourceError  # the session closed after it was acquired
+                return await pooled.session.call_tool(name, arguments)
+            except (*RECONNECT_ERRORS, McpError) as e:
+                if isinstance(e, McpError) and e.error.code not in SESSION_GONE_ERROR_CODES:
+                    raise  # error response of the server, the session itself is fine
+                await self._discard(pooled)
+                if attempt:
+                    raise
+                logger.warning(f"MCP session to {endpoint} is broken ({e!r}), reconnecting")
+            finally:
+                pooled.in_use -= 1
+                pooled.last_used = time.monotonic()
+
+    async def _check(self, pooled: PooledMCPSession) -> None:
+        if pooled.in_use:
+            return
+        if not pooled.alive or time.monotonic() - pooled.last_used > self.idle_timeout:
+            await self._discard(pooled)
+            return
+        try:
+            await asyncio.wait_for(pooled.session.send_ping(), timeout=self.connect_timeout)
+        except Exception as e:
+            logger.warning(f"Health check of MCP session to {pooled.endpoint} failed: {e!r}")
+            await self._discard(pooled)
+
+    async def _maintain(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            sessions = [s for endpoint_sessions in self._sessions.values() for s in endpoint_sessions]
+            await asyncio.gather(*(self._check(pooled) for pooled in sessions), return_exceptions=True)
+
+    async def aclose(self) -> None:
+        if self._maintenance:
+            self._maintenance.cancel()
+        sessions = [s for endpoint_sessions in self._sessions.values() for s in endpoint_sessions]
+        await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+        self._sessions.clear()
+
+
+app_settings = Settings()
+
+mcp_sessions = MCPSessionPool(
+    max_sessions=app_settings.MCP_POOL_MAX_SESSIONS,
+    idle_timeout=app_settings.MCP_POOL_IDLE_SECONDS,
+    health_check_interval=app_settings.MCP_POOL_HEALTH_CHECK_SECONDS
+)
@@ -0,0 +1,62 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from config.settings import Settings
+
+app_settings = Settings()
+
+
+def result_key(agent_id: str, arguments: Any) -> str:
+    """
+    Cache key of an agent call: the agent ID and a hash of its canonically serialized arguments.
+    """
+    canonical_arguments = json.dumps(arguments, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{agent_id}:{hashlib.sha256(canonical_arguments.encode()).hexdigest()}"
+
+
+def is_cacheable(agent: dict[str, Any]) -> bool:
+    """
+    Results of MCP tools annotated as read-only or idempotent and of agents opted in via settings are cached.
+    """
+    if agent.get("id") in app_settings.CACHEABLE_AGENT_IDS:
+        return True
+    annotations = agent.get("annotations") or {}
+    return agent.get("type") == "mcp" and bool(annotations.get("readOnlyHint") or annotations.get("idempotentHint"))
+
+
+class ResultCache:
+    """
+    Results of successful agent calls with TTL and LRU eviction.
+    """
+
+    def __init__(self, ttl: float = 300, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._results: OrderedDict[str, tuple[float, Any, dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[tuple[Any, dict[str, Any]]]:
+        cached = self._results.get(key)
+        if cached is None or time.monotonic() - cached[0] >= self.ttl:
+            self._results.pop(key, None)
+            self.misses += 1
+            return None
+        self._results.move_to_end(key)
+        self.hits += 1
+        return cached[1], cached[2]
+
+    def set(self, key: str, response: Any, trace: dict[str, Any]) -> None:
+        self._results[key] = (time.monotonic(), response, trace)
+        self._results.move_to_end(key)
+        if len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        self._results.clear()
+
+
+result_cache = ResultCache(ttl=app_settings.RESULT_CACHE_TTL_SECONDS, max_size=app_settings.RESULT_CACHE_MAX_SIZE)
@@ -1,3 +1,6 @@
+import hashlib
+import json
+from collections import OrderedDict
 from typing import Any
 
 from langchain_core.language_models import BaseChatModel
@@ -6,9 +9,23 @@ from langchain_openai import ChatOpenAI, AzureChatOpenAI
 
 from llms.custom import ChatGenAI
 
+# config entries which only end up in the prompt, they neither change the model nor the graph
+PROMPT_CONFIG_KEYS = ("system_prompt", "user_prompt", "max_last_messages")
+
+
+def llm_config_key(configs: dict[str, Any]) -> str:
+    """
+    Hash of the configuration entries a chat model is built from.
+    """
+    llm_configs = {key: value for key, value in configs.items() if key not in PROMPT_CONFIG_KEYS}
+    return hashlib.sha256(json.dumps(llm_configs, sort_keys=True, default=str).encode()).hexdigest()
+
 
 class LLMFactory:
     _registry = {}
+    # chat models keep their HTTP client (and its connection pool), they are shared across requests
+    _models: OrderedDict[str, BaseChatModel] = OrderedDict()
+    max_models = 32
 
     @classmethod
     def register(cls, name: str):
@@ -28,6 +45,22 @@ class LLMFactory:
 
         return constructor(configs)
 
+    @classmethod
+    def get_or_create(cls, configs: dict[str, Any]) -> BaseChatModel:
+        """
+        Returns the shared chat model for the provider configuration, creating it on first use.
+        Per-call state such as headers is passed on invocation, never set on the shared model.
+        """
+        key = llm_config_key(configs)
+        if model := cls._models.get(key):
+            cls._models.move_to_end(key)
+            return model
+
+        model = cls._models[key] = cls.create(configs)
+        if len(cls._models) > cls.max_models:
+            cls._models.popitem(last=False)
+        return model
+
 
 @LLMFactory.register("openai")
 def __create_openai_model(configs: dict[str, Any]) -> ChatOpenAI:
@@ -6,13 +6,15 @@ from genai_session.utils.context import GenAIContext
 from langchain_core.messages import SystemMessage
 from loguru import logger
 
-from agents.react_master_agent import ReActMasterAgent
+from agents.cache import AgentCatalogCache, MasterAgentCache
 from config.settings import Settings
-from llms import LLMFactory
+from connectors.mcp_pool import mcp_sessions
 from prompts import FILE_RELATED_SYSTEM_PROMPT
 from utils.agents import get_agents
 from utils.chat_history import get_chat_history
+from utils.clients import http_clients
 from utils.common import attach_files_to_message
+from utils.streaming import ResponseStreamBatcher
 
 app_settings = Settings()
 
@@ -21,6 +23,22 @@ session = GenAISession(
     ws_url=app_settings.ROUTER_WS_URL
 )
 
+# compiled Master Agents shared by requests with the same agent catalog and LLM configuration
+master_agents = MasterAgentCache(
+    max_size=app_settings.MASTER_AGENT_CACHE_SIZE,
+    parallel_tool_calls=app_settings.PARALLEL_TOOL_CALLS,
+    max_concurrency=app_settings.MAX_CONCURRENT_AGENT_CALLS,
+    tool_top_k=app_settings.TOOL_PRESELECTION_TOP_K
+)
+# active agents per user, refetched when the backend reports a new catalog version
+agent_catalogs = AgentCatalogCache(ttl=app_settings.AGENT_CATALOG_TTL_SECONDS)
+# final answers streamed to the frontend, chunks of all requests are sent to the router together
+response_streams = ResponseStreamBatcher(
+    url=f"{app_settings.ROUTER_API_URL}/stream",
+    api_key=app_settings.MASTER_AGENT_API_KEY,
+    flush_interval=app_settings.STREAM_FLUSH_INTERVAL_SECONDS
+)
+
 
 @session.bind(name="MasterAgent", description="Master agent that orchestrates other agents")
 async def receive_message(
@@ -29,8 +47,11 @@ async def receive_message(
         user_id: str,
         configs: dict[str, Any],
         files: Optional[list[dict[str, Any]]],
-        timestamp: str
+        timestamp: str,
+        catalog_version: Optional[str] = None,
+        request_id: Optional[str] = None
 ):
+    stream = None
     try:
         graph_config = {"configurable": {"session": session}, "recursion_limit": 100}  # recursion_limit can be adjusted
 
@@ -54,22 +75,34 @@ async def receive_message(
             *chat_history
         ]
 
-        agents = await get_agents(
-            url=f"{app_settings.BACKEND_API_URL}/agents/active",
-            agent_type="all",
-            api_key=app_settings.MASTER_BE_API_KEY,
-            user_id=user_id
+        agents = await agent_catalogs.get(
+            user_id=user_id,
+            catalog_version=catalog_version,
+            fetch=lambda: get_agents(
+                url=f"{app_settings.BACKEND_API_URL}/agents/active",
+                agent_type="all",
+                api_key=app_settings.MASTER_BE_API_KEY,
+                user_id=user_id
+            )
         )
 
-        llm = LLMFactory.create(configs=configs)
-        master_agent = ReActMasterAgent(model=llm, agents=agents)
+        master_agent = master_agents.get_or_create(agents=agents, configs=configs, user_id=user_id)
 
         logger.info("Running Master Agent")
 
-        final_state = await master_agent.graph.ainvoke(
-            input={"messages": init_messages},
-            config=graph_config
-        )
+        if app_settings.STREAM_FINAL_RESPONSE and request_id:
+            stream = response_streams.open(session_id=session_id, request_id=request_id)
+
+        final_state = {}
+        async for mode, chunk in master_agent.graph.astream(
+                input={"messages": init_messages},
+                config=graph_config,
+                stream_mode=["messages", "values"]
+        ):
+            if mode == "values":
+                final_state = chunk
+            elif stream:
+                stream.on_message_chunk(*chunk)
 
         response = final_state["messages"][-1].content
 
@@ -88,10 +121,18 @@ async def receive_message(
         }
         return {"agents_trace": [trace], "response": error_message, "is_success": False}
 
+    finally:
+        if stream:
+            await stream.aclose()
+
 
 async def main():
     logger.info("Master Agent started")
-    await session.process_events()
+    try:
+        await session.process_events()
+    finally:
+        await http_clients.aclose()
+        await mcp_sessions.aclose()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# master agent modules are imported the same way the service runs them (from its own directory)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,95 @@
+import httpx
+import pytest
+
+BASE_URL = "http://agent.local"
+
+
+def agent_card(version: str = "1.0") -> dict:
+    return {
+        "name": "Translator",
+        "description": "Translates texts",
+        "url": BASE_URL,
+        "version": version,
+        "capabilities": {},
+        "defaultInputModes": ["text"],
+        "defaultOutputModes": ["text"],
+        "skills": [],
+    }
+
+
+class AgentServer:
+    """
+    Serves the agent card with an ETag, answers 304 to requests revalidating the current one.
+    """
+
+    def __init__(self):
+        self.card = agent_card()
+        self.etag = '"v1"'
+        self.requests: list[httpx.Request] = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304)
+        return httpx.Response(200, json=self.card, headers={"ETag": self.etag})
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self.handler))
+
+
+@pytest.mark.asyncio
+async def test_cards_are_fetched_once_within_ttl():
+    from connectors.a2a_cards import AGENT_CARD_PATH, AgentCardCache
+
+    server = AgentServer()
+    cards = AgentCardCache(ttl=60)
+
+    async with server.client() as client:
+        first = await cards.get(client, BASE_URL)
+        assert await cards.get(client, BASE_URL) is first
+
+    (request,) = server.requests
+    assert request.url == f"{BASE_URL}{AGENT_CARD_PATH}"
+    assert "If-None-Match" not in request.headers
+
+
+@pytest.mark.asyncio
+async def test_expired_cards_are_revalidated_with_their_etag():
+    from connectors.a2a_cards import AgentCardCache
+
+    server = AgentServer()
+    cards = AgentCardCache(ttl=0)
+
+    async with server.client() as client:
+        first = await cards.get(client, BASE_URL)
+        # unchanged card, 304
+        assert await cards.get(client, BASE_URL) is first
+        assert server.requests[-1].headers["If-None-Match"] == '"v1"'
+
+        server.card, server.etag = agent_card(version="2.0"), '"v2"'
+        updated = await cards.get(client, BASE_URL)
+
+    assert updated.version == "2.0"
+    assert len(server.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_cards_from_the_catalog_are_used_without_fetching():
+    from connectors.a2a_cards import AgentCardCache
+
+    server = AgentServer()
+    cards = AgentCardCache(ttl=60)
+
+    async with server.client() as client:
+        card = await cards.get(
+            client, BASE_URL, card_content=agent_card(version="stored")
+        )
+        assert card.version == "stored"
+        assert server.requests == []
+
+        # an invalid stored card is fetched from the agent
+        cards.invalidate(BASE_URL)
+        card = await cards.get(client, BASE_URL, card_content={"name": "Translator"})
+
+    assert card.version == "1.0"
+    assert len(server.requests) == 1
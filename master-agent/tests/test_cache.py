@@ -0,0 +1,99 @@
+import pytest
+
+CATALOG = [
+    {
+        "name": "weather_forecast",
+        "type": "genai",
+        "agent_schema": {
+            "type": "function",
+            "function": {
+                "name": "weather_forecast",
+                "description": "Returns the weather forecast for a city",
+                "parameters": {"properties": {}},
+            },
+        },
+    }
+]
+
+CONFIGS = {"provider": "openai", "api_key": "key", "model": "gpt-4o"}
+
+
+def test_master_agents_are_reused_until_the_catalog_changes(monkeypatch):
+    from agents import cache
+
+    created = []
+
+    def get_or_create(configs):
+        created.append(configs)
+        return object()
+
+    monkeypatch.setattr(cache.LLMFactory, "get_or_create", get_or_create)
+    master_agents = cache.MasterAgentCache()
+
+    first = master_agents.get_or_create(agents=CATALOG, configs=CONFIGS)
+    # prompt configs don't change the graph
+    assert (
+        master_agents.get_or_create(
+            agents=CATALOG, configs={**CONFIGS, "system_prompt": "Be brief"}
+        )
+        is first
+    )
+
+    changed = [{**CATALOG[0], "description": "Returns rainfall"}]
+    assert master_agents.get_or_create(agents=changed, configs=CONFIGS) is not first
+    assert (
+        master_agents.get_or_create(
+            agents=CATALOG, configs={**CONFIGS, "model": "gpt-4o-mini"}
+        )
+        is not first
+    )
+    assert len(created) == 3
+
+
+def test_least_recently_used_master_agents_are_evicted(monkeypatch):
+    from agents import cache
+
+    monkeypatch.setattr(cache.LLMFactory, "get_or_create", lambda configs: object())
+    master_agents = cache.MasterAgentCache(max_size=1)
+
+    first = master_agents.get_or_create(agents=CATALOG, configs=CONFIGS)
+    master_agents.get_or_create(agents=[], configs=CONFIGS)
+
+    assert master_agents.get_or_create(agents=CATALOG, configs=CONFIGS) is not first
+
+
+@pytest.mark.asyncio
+async def test_agent_catalog_is_refetched_when_its_version_changes():
+    from agents.cache import AgentCatalogCache
+
+    fetches = []
+
+    async def fetch():
+        fetches.append(1)
+        return CATALOG
+
+    catalogs = AgentCatalogCache()
+    for version in ["a:1", "a:1", "a:2", None, None]:
+        assert (
+            await catalogs.get(user_id="user", catalog_version=version, fetch=fetch)
+            == CATALOG
+        )
+
+    assert len(fetches) == 4  # only the repeated version is served from the cache
+
+
+@pytest.mark.asyncio
+async def test_cached_agent_catalog_expires_after_ttl():
+    from agents.cache import AgentCatalogCache
+
+    fetches = []
+
+    async def fetch():
+        fetches.append(1)
+        return CATALOG
+
+    catalogs = AgentCatalogCache(ttl=0)
+    await catalogs.get(user_id="user", catalog_version="a:1", fetch=fetch)
+    await catalogs.get(user_id="user", catalog_version="a:1", fetch=fetch)
+
+    assert len(fetches) == 2
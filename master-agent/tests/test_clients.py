@@ -0,0 +1,79 @@
+import httpx
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_per_name_and_recreated_once_closed():
+    from utils.clients import HTTPClientRegistry
+
+    clients = HTTPClientRegistry()
+    backend = clients.get("backend")
+
+    assert clients.get("backend") is backend
+    assert clients.get("a2a") is not backend
+
+    await backend.aclose()
+    assert clients.get("backend") is not backend
+
+    await clients.aclose()
+    assert clients._clients == {}
+
+
+@pytest.mark.asyncio
+async def test_backend_calls_reuse_the_shared_client(monkeypatch):
+    from utils import agents
+    from utils.clients import HTTPClientRegistry
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"active_connections": [{"name": "agent"}]})
+
+    clients = HTTPClientRegistry()
+    clients._clients["backend"] = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+    monkeypatch.setattr(agents, "http_clients", clients)
+
+    for _ in range(2):
+        assert await agents.get_agents(
+            url="http://backend/agents/active",
+            agent_type="all",
+            api_key="key",
+            user_id="user",
+        ) == [{"name": "agent"}]
+
+    assert len(requests) == 2
+    assert requests[0].headers["X-API-KEY"] == "key"
+    assert requests[0].url.params["user_id"] == "user"
+    await clients.aclose()
+
+
+@pytest.mark.asyncio
+async def test_genai_hmac_header_is_passed_per_call_to_the_shared_model():
+    from llms.custom import ChatGenAI
+    from utils.agents import select_agent_and_resolve_parameters
+
+    class BoundModel:
+        def __init__(self):
+            self.calls = []
+
+        async def ainvoke(self, messages, **kwargs):
+            self.calls.append(kwargs)
+            return AIMessage(content="done")
+
+    model = ChatGenAI(api_key="key", model="genai")
+    bound = BoundModel()
+
+    for query in ["first", "second"]:
+        await select_agent_and_resolve_parameters(
+            model=model,
+            messages=[HumanMessage(content=query)],
+            agents=[],
+            model_with_agents=bound,
+        )
+
+    first, second = (call["extra_headers"]["X-HMAC"] for call in bound.calls)
+    assert first != second
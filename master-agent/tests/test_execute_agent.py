@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+
+CATALOG = [
+    {
+        "name": f"agent_{i}",
+        "type": "genai",
+        "agent_schema": {"type": "function", "function": {"name": f"agent_{i}"}},
+    }
+    for i in range(5)
+]
+
+
+def supervisor_state(names: list[str]):
+    from models.states import MasterAgentState
+
+    tool_calls = [
+        {"name": name, "args": {}, "id": f"call_{i}"} for i, name in enumerate(names)
+    ]
+    return MasterAgentState(
+        messages=[AIMessage(content="", tool_calls=tool_calls)], trace=[]
+    )
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_are_executed_concurrently_up_to_max_concurrency():
+    from agents.react_master_agent import ReActMasterAgent
+
+    master_agent = ReActMasterAgent(model=None, agents=CATALOG, max_concurrency=2)
+    running, peak = 0, 0
+
+    async def invoke_agent(agent_call, messages, config):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        # later calls finish first, results must still follow the order of the calls
+        await asyncio.sleep(0.01 * (5 - int(agent_call["id"][-1])))
+        running -= 1
+        message = ToolMessage(
+            content=agent_call["name"],
+            name=agent_call["name"],
+            tool_call_id=agent_call["id"],
+        )
+        return message, {"name": agent_call["name"]}
+
+    master_agent._invoke_agent = invoke_agent
+    result = await master_agent.execute_agent(
+        supervisor_state([agent["name"] for agent in CATALOG]), config={}
+    )
+
+    assert peak == 2
+    assert [message.tool_call_id for message in result["messages"]] == [
+        f"call_{i}" for i in range(5)
+    ]
+    assert [trace["name"] for trace in result["trace"]] == [
+        agent["name"] for agent in CATALOG
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failing_tool_call_still_gets_its_tool_message():
+    from agents.react_master_agent import ReActMasterAgent
+
+    master_agent = ReActMasterAgent(model=None, agents=CATALOG, max_concurrency=2)
+
+    result = await master_agent.execute_agent(
+        supervisor_state(["unknown_agent"]), config={}
+    )
+
+    (message,) = result["messages"]
+    assert message.tool_call_id == "call_0"
+    assert "unknown_agent" in message.content
+    assert result["trace"][0]["is_success"] is False
+
+
+def test_parallel_tool_calls_are_passed_to_the_model():
+    from agents.react_master_agent import ReActMasterAgent
+
+    class FakeChatModel:
+        def bind_tools(self, tools, **kwargs):
+            self.kwargs = kwargs
+            return self
+
+    model = FakeChatModel()
+    master_agent = ReActMasterAgent(
+        model=model, agents=CATALOG, parallel_tool_calls=True
+    )
+    assert master_agent.model_with_agents is model
+
+    assert model.kwargs["parallel_tool_calls"] is True
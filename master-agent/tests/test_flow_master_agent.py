@@ -0,0 +1,134 @@
+from uuid import uuid4
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+
+def flow_step(name: str) -> dict:
+    return {
+        "name": name,
+        "type": "genai",
+        "agent_schema": {
+            "type": "function",
+            "function": {"name": name, "parameters": {"properties": {}}},
+        },
+    }
+
+
+# fetch -> (summarize, translate) -> report
+DIAMOND = [flow_step(name) for name in ("fetch", "summarize", "translate", "report")]
+DIAMOND_DEPENDENCIES = [[], [0], [0], [1, 2]]
+
+
+@pytest.fixture
+def resolved_steps(monkeypatch):
+    """
+    Resolves the parameters of flow steps without an LLM, records the order they were resolved in.
+    """
+    resolved = []
+
+    async def select(model, messages, agents, agent_choice):
+        name = agents[0]["function"]["name"]
+        resolved.append(name)
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": name, "args": {}, "id": f"call_{uuid4().hex}"}],
+        )
+
+    monkeypatch.setattr(
+        "agents.flow_master_agent.select_agent_and_resolve_parameters", select
+    )
+    return resolved
+
+
+async def run_flow(flow_master_agent) -> tuple[list[list[str]], list]:
+    """
+    Executes the supervisor turns of a flow, every tool call returns the name of its step.
+    """
+    from models.states import MasterAgentState
+
+    messages, waves = [HumanMessage(content="Report on today")], []
+    while result := await flow_master_agent.select_agent(
+        MasterAgentState(messages=messages, trace=[])
+    ):
+        (response,) = result["messages"]
+        waves.append([call["name"] for call in response.tool_calls])
+        messages = messages + [response]
+        messages += [
+            ToolMessage(
+                content=f"{call['name']} output",
+                name=call["name"],
+                tool_call_id=call["id"],
+            )
+            for call in response.tool_calls
+        ]
+    return waves, messages
+
+
+@pytest.mark.asyncio
+async def test_dag_steps_are_scheduled_in_waves(resolved_steps):
+    from agents.flow_master_agent import FlowMasterAgent
+
+    flow_master_agent = FlowMasterAgent(
+        model=None,
+        agents=DIAMOND,
+        dependencies=DIAMOND_DEPENDENCIES,
+        schema_fast_path=False,
+    )
+    waves, messages = await run_flow(flow_master_agent)
+
+    assert waves == [["fetch"], ["summarize", "translate"], ["report"]]
+    assert sorted(resolved_steps) == sorted(step["name"] for step in DIAMOND)
+    assert flow_master_agent.final_response(messages) == "report output"
+
+
+@pytest.mark.asyncio
+async def test_outputs_of_all_final_steps_form_the_response(resolved_steps):
+    from agents.flow_master_agent import FlowMasterAgent
+
+    flow_master_agent = FlowMasterAgent(
+        model=None,
+        agents=DIAMOND[:3],
+        dependencies=DIAMOND_DEPENDENCIES[:3],
+        schema_fast_path=False,
+    )
+    waves, messages = await run_flow(flow_master_agent)
+
+    assert waves == [["fetch"], ["summarize", "translate"]]
+    assert (
+        flow_master_agent.final_response(messages)
+        == "summarize output\n\ntranslate output"
+    )
+
+
+@pytest.mark.asyncio
+async def test_sequential_flows_run_one_step_per_turn(resolved_steps):
+    from agents.flow_master_agent import FlowMasterAgent
+
+    flow_master_agent = FlowMasterAgent(
+        model=None, agents=DIAMOND, schema_fast_path=False
+    )
+    waves, _ = await run_flow(flow_master_agent)
+
+    assert waves == [[step["name"]] for step in DIAMOND]
+
+
+@pytest.mark.parametrize(
+    "dependencies",
+    [
+        [[], [2], [1]],
+        [[0], [], []],
+        [[], [3], []],
+    ],
+    ids=["cycle", "self-dependency", "unknown step"],
+)
+def test_unschedulable_dependencies_are_rejected(dependencies):
+    from agents.flow_master_agent import FlowMasterAgent
+
+    with pytest.raises(ValueError):
+        FlowMasterAgent(
+            model=None,
+            agents=DIAMOND[:3],
+            dependencies=dependencies,
+            schema_fast_path=False,
+        )
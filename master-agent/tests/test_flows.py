@@ -0,0 +1,43 @@
+SCHEMA = {
+    "type": "object",
+    "properties": {"city": {"type": "string"}, "days": {"type": "integer"}},
+    "required": ["city"],
+}
+
+
+def test_mapping_builds_arguments_from_dependency_output():
+    from utils.flows import map_arguments
+
+    source = {"location": {"city": "Paris"}, "forecast": {"days": 3}}
+    mapping = {"city": "location.city", "days": "forecast.days"}
+
+    assert map_arguments(mapping=mapping, source=source, schema=SCHEMA) == {
+        "city": "Paris",
+        "days": 3,
+    }
+
+
+def test_unresolved_or_mistyped_fields_fall_back_to_llm():
+    from utils.flows import map_arguments
+
+    assert (
+        map_arguments(
+            mapping={"city": "missing"}, source={"city": "Paris"}, schema=SCHEMA
+        )
+        is None
+    )
+    assert (
+        map_arguments(mapping={"city": "days"}, source={"days": 3}, schema=SCHEMA)
+        is None
+    )
+
+
+def test_invalid_or_failing_expressions_fall_back_to_llm():
+    from utils.flows import map_arguments
+
+    assert (
+        map_arguments(mapping={"city": "location.[city"}, source={}, schema=SCHEMA)
+        is None
+    )
+    # valid expression, but the function is not defined for the type of the output
+    assert map_arguments(mapping={"city": "length(@)"}, source=3, schema=SCHEMA) is None
@@ -0,0 +1,51 @@
+import pytest
+
+OPENAI_CONFIGS = {
+    "provider": "openai",
+    "api_key": "key",
+    "model": "gpt-4o",
+    "temperature": 0,
+}
+
+
+@pytest.fixture
+def llm_factory():
+    from llms import LLMFactory
+
+    LLMFactory._models.clear()
+    yield LLMFactory
+    LLMFactory._models.clear()
+
+
+def test_chat_models_are_shared_across_prompt_configs(llm_factory):
+    first = llm_factory.get_or_create(
+        configs={**OPENAI_CONFIGS, "system_prompt": "Be brief"}
+    )
+    second = llm_factory.get_or_create(
+        configs={**OPENAI_CONFIGS, "user_prompt": "Be verbose"}
+    )
+
+    assert first is second
+    assert len(llm_factory._models) == 1
+
+
+def test_changed_llm_config_creates_a_new_model(llm_factory):
+    first = llm_factory.get_or_create(configs=OPENAI_CONFIGS)
+    second = llm_factory.get_or_create(configs={**OPENAI_CONFIGS, "temperature": 0.7})
+
+    assert first is not second
+    assert second.temperature == 0.7
+
+
+def test_least_recently_used_models_are_evicted(llm_factory, monkeypatch):
+    monkeypatch.setattr(llm_factory, "max_models", 2)
+    configs = [{**OPENAI_CONFIGS, "model": model} for model in ("a", "b", "c")]
+
+    first = llm_factory.get_or_create(configs=configs[0])
+    llm_factory.get_or_create(configs=configs[1])
+    assert (
+        llm_factory.get_or_create(configs=configs[0]) is first
+    )  # a is used again, b is evicted
+    llm_factory.get_or_create(configs=configs[2])
+
+    assert [model.model_name for model in llm_factory._models.values()] == ["a", "c"]
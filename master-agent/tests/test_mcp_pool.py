@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import CallToolResult, ErrorData, TextContent
+
+
+class FakeClientSession:
+    """
+    Stand-in for an initialized MCP ClientSession, `call_tool` raises the queued errors first.
+    """
+
+    def __init__(self, errors: list[Exception]):
+        self.errors = errors
+        self.calls = 0
+
+    async def call_tool(self, name, arguments):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return CallToolResult(content=[TextContent(type="text", text=name)])
+
+
+@pytest.fixture
+def mcp_pool(monkeypatch):
+    """
+    Session pool whose sessions are FakeClientSessions, `errors` are raised by the sessions in the order they open.
+    """
+    from connectors.mcp_pool import MCPSessionPool, PooledMCPSession
+
+    errors: list[list[Exception]] = []
+    opened: list[PooledMCPSession] = []
+
+    async def start(self, timeout):
+        self.session = FakeClientSession(errors.pop(0) if errors else [])
+        self._task = asyncio.create_task(self._closing.wait())
+        opened.append(self)
+
+    monkeypatch.setattr(PooledMCPSession, "start", start)
+    return MCPSessionPool(health_check_interval=60), errors, opened
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [
+        McpError(ErrorData(code=32600, message="Session terminated")),
+        McpError(ErrorData(code=-32000, message="Connection closed")),
+    ],
+)
+async def test_terminated_session_is_evicted_and_call_retried(mcp_pool, error):
+    pool, errors, opened = mcp_pool
+    errors.append([error])
+
+    result = await pool.call_tool("http://mcp", "tool", {})
+
+    assert result.content[0].text == "tool"
+    assert len(opened) == 2
+    assert pool._sessions["http://mcp"] == [opened[1]]
+    assert not opened[0].alive
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error",
+    [
+        McpError(ErrorData(code=-32602, message="Unknown tool")),
+        ValueError("Invalid tool result"),
+        asyncio.TimeoutError(),
+    ],
+)
+async def test_other_errors_keep_the_session(mcp_pool, error):
+    pool, errors, opened = mcp_pool
+    errors.append([error])
+
+    with pytest.raises(type(error)):
+        await pool.call_tool("http://mcp", "tool", {})
+
+    assert len(opened) == 1
+    assert opened[0].alive
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_session_closed_after_acquire_is_replaced(mcp_pool, monkeypatch):
+    pool, errors, opened = mcp_pool
+    acquire = pool._acquire
+
+    async def acquire_closing(endpoint):
+        pooled = await acquire(endpoint)
+        if len(opened) == 1:
+            pooled.session = (
+                None  # the background task closed the session in the meantime
+            )
+        return pooled
+
+    monkeypatch.setattr(pool, "_acquire", acquire_closing)
+
+    result = await pool.call_tool("http://mcp", "tool", {})
+
+    assert result.content[0].text == "tool"
+    assert len(opened) == 2
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_second_failure_is_raised(mcp_pool):
+    pool, errors, opened = mcp_pool
+    terminated = McpError(ErrorData(code=32600, message="Session terminated"))
+    errors.extend([[terminated], [terminated]])
+
+    with pytest.raises(McpError):
+        await pool.call_tool("http://mcp", "tool", {})
+
+    assert len(opened) == 2
+    assert pool._sessions["http://mcp"] == []
+    await pool.aclose()
@@ -0,0 +1,128 @@
+import pytest
+
+
+def mcp_tool(annotations: dict | None = None, agent_id: str = "tool") -> dict:
+    return {"id": agent_id, "type": "mcp", "annotations": annotations}
+
+
+@pytest.fixture
+def connector_cls():
+    from connectors.entities import ConnectorStrategy
+
+    class CountingConnector(ConnectorStrategy):
+        """
+        Returns the number of the invocation, fails when `fail` is set.
+        """
+
+        invocations = 0
+        fail = False
+
+        async def invoke(self, *args, **kwargs):
+            CountingConnector.invocations += 1
+            trace = {"name": self.config.name, "is_success": not self.fail}
+            return CountingConnector.invocations, trace
+
+    return CountingConnector
+
+
+def mcp_config(arguments: dict):
+    from connectors.entities import MCPConfig
+
+    return MCPConfig(id="tool", name="tool", endpoint="http://mcp", arguments=arguments)
+
+
+def test_result_keys_do_not_depend_on_argument_order():
+    from connectors.result_cache import result_key
+
+    assert result_key("tool", {"a": 1, "b": [2]}) == result_key(
+        "tool", {"b": [2], "a": 1}
+    )
+    assert result_key("tool", {"a": 1}) != result_key("other", {"a": 1})
+    assert result_key("tool", {"a": 1}) != result_key("tool", {"a": 2})
+
+
+def test_only_read_only_tools_and_opted_in_agents_are_cacheable(monkeypatch):
+    from connectors import result_cache
+
+    assert result_cache.is_cacheable(mcp_tool({"readOnlyHint": True}))
+    assert result_cache.is_cacheable(mcp_tool({"idempotentHint": True}))
+    assert not result_cache.is_cacheable(mcp_tool({"destructiveHint": True}))
+    assert not result_cache.is_cacheable(mcp_tool())
+    assert not result_cache.is_cacheable(
+        {"id": "agent", "type": "genai", "annotations": {"readOnlyHint": True}}
+    )
+
+    monkeypatch.setattr(result_cache.app_settings, "CACHEABLE_AGENT_IDS", ["agent"])
+    assert result_cache.is_cacheable({"id": "agent", "type": "genai"})
+
+
+def test_results_expire_after_ttl(monkeypatch):
+    from connectors import result_cache
+
+    now = 1000.0
+    monkeypatch.setattr(result_cache.time, "monotonic", lambda: now)
+    cache = result_cache.ResultCache(ttl=10)
+
+    cache.set("key", "result", {"is_success": True})
+    now += 9
+    assert cache.get("key") == ("result", {"is_success": True})
+    now += 1
+    assert cache.get("key") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_least_recently_used_results_are_evicted():
+    from connectors.result_cache import ResultCache
+
+    cache = ResultCache(max_size=2)
+    for key in ("a", "b"):
+        cache.set(key, key, {})
+    cache.get("a")
+    cache.set("c", "c", {})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ("a", {})
+
+
+@pytest.mark.asyncio
+async def test_cacheable_calls_are_memoized_per_arguments(connector_cls):
+    from connectors.result_cache import ResultCache
+
+    cache = ResultCache()
+    connector = connector_cls(mcp_config({"city": "Paris"}), result_cache=cache)
+
+    assert (await connector.invoke_cached())[1]["cache_hit"] is False
+    response, trace = await connector.invoke_cached()
+    assert (response, trace["cache_hit"]) == (1, True)
+
+    other = connector_cls(mcp_config({"city": "Rome"}), result_cache=cache)
+    assert (await other.invoke_cached())[0] == 2
+
+
+@pytest.mark.asyncio
+async def test_failed_and_not_cacheable_calls_are_not_memoized(connector_cls):
+    from connectors.result_cache import ResultCache
+
+    cache = ResultCache()
+    connector_cls.fail = True
+    failing = connector_cls(mcp_config({"city": "Paris"}), result_cache=cache)
+    await failing.invoke_cached()
+    await failing.invoke_cached()
+    assert connector_cls.invocations == 2
+
+    connector_cls.fail = False
+    # not cacheable, the factory passes no result cache
+    uncached = connector_cls(mcp_config({"city": "Paris"}))
+    assert [(await uncached.invoke_cached())[0] for _ in range(2)] == [3, 4]
+    assert "cache_hit" not in (await uncached.invoke_cached())[1]
+
+
+def test_factory_passes_the_result_cache_to_cacheable_connectors_only():
+    from connectors.factory import ConnectorFactory
+    from connectors.result_cache import result_cache
+
+    config = mcp_config({})
+    assert ConnectorFactory.get_connector(config, cacheable=True).result_cache is (
+        result_cache
+    )
+    assert ConnectorFactory.get_connector(config).result_cache is None
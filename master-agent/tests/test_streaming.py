@@ -0,0 +1,131 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from langchain_core.messages import AIMessageChunk
+
+SUPERVISOR = {"langgraph_node": "supervisor", "langgraph_checkpoint_ns": "supervisor:1"}
+
+
+@pytest.fixture
+def router_requests():
+    """
+    Routes the router client of the master agent to an in-memory transport, returns the recorded requests.
+    """
+    from utils.clients import http_clients
+
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"detail": "ok"})
+
+    http_clients._clients["router"] = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    )
+    yield requests
+    http_clients._clients.pop("router")
+
+
+def sent_chunks(requests: list[httpx.Request]) -> list[dict]:
+    return [
+        chunk for request in requests for chunk in json.loads(request.content)["chunks"]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_chunks_are_sent_in_order_and_end_with_final_chunk(router_requests):
+    from utils.streaming import ResponseStreamBatcher
+
+    batcher = ResponseStreamBatcher(
+        url="http://router/stream", api_key="key", flush_interval=0.01
+    )
+    stream = batcher.open(session_id="session", request_id="request")
+
+    for token in ["The ", "answer ", "is ", "42"]:
+        stream.on_message_chunk(AIMessageChunk(content=token, id="answer"), SUPERVISOR)
+        await asyncio.sleep(0.02)
+    await stream.aclose()
+
+    chunks = sent_chunks(router_requests)
+    assert "".join(chunk["delta"] for chunk in chunks) == "The answer is 42"
+    assert [chunk["seq"] for chunk in chunks] == list(range(len(chunks)))
+    assert [chunk["final"] for chunk in chunks] == [False] * (len(chunks) - 1) + [True]
+    assert all(request.headers["api-key"] == "key" for request in router_requests)
+    assert not batcher.streams
+
+
+@pytest.mark.asyncio
+async def test_chunks_of_concurrent_streams_are_batched(router_requests):
+    from utils.streaming import ResponseStreamBatcher
+
+    batcher = ResponseStreamBatcher(
+        url="http://router/stream", api_key="key", flush_interval=0.05
+    )
+    streams = [
+        batcher.open(session_id="session", request_id=f"request-{i}") for i in range(3)
+    ]
+
+    for token in ["a", "b", "c"]:
+        for stream in streams:
+            stream.write(token)
+    await asyncio.gather(*(stream.aclose() for stream in streams))
+
+    assert len(router_requests) <= 2
+    chunks = sent_chunks(router_requests)
+    for stream in streams:
+        own = [chunk for chunk in chunks if chunk["request_id"] == stream.request_id]
+        assert "".join(chunk["delta"] for chunk in own) == "abc"
+        assert own[-1]["final"]
+
+
+@pytest.mark.asyncio
+async def test_tool_calls_reset_streamed_text(router_requests):
+    from utils.streaming import ResponseStreamBatcher
+
+    batcher = ResponseStreamBatcher(
+        url="http://router/stream", api_key="key", flush_interval=0.01
+    )
+    stream = batcher.open(session_id="session", request_id="request")
+
+    stream.on_message_chunk(
+        AIMessageChunk(content="Let me check", id="turn-1"), SUPERVISOR
+    )
+    await asyncio.sleep(0.02)
+    stream.on_message_chunk(
+        AIMessageChunk(
+            content="",
+            id="turn-1",
+            tool_call_chunks=[{"name": "agent", "args": "{}", "index": 0}],
+        ),
+        SUPERVISOR,
+    )
+    stream.on_message_chunk(AIMessageChunk(content="Done", id="turn-2"), SUPERVISOR)
+    await stream.aclose()
+
+    chunks = sent_chunks(router_requests)
+    assert chunks[0]["delta"] == "Let me check"
+    assert chunks[1]["reset"] and chunks[1]["delta"] == "Done"
+    assert chunks[-1]["final"]
+
+
+@pytest.mark.asyncio
+async def test_failed_request_stops_the_stream():
+    from utils.clients import http_clients
+    from utils.streaming import ResponseStreamBatcher
+
+    http_clients._clients["router"] = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(401))
+    )
+    batcher = ResponseStreamBatcher(
+        url="http://router/stream", api_key="wrong", flush_interval=0.01
+    )
+    stream = batcher.open(session_id="session", request_id="request")
+
+    stream.write("text")
+    await asyncio.wait_for(stream.aclose(), timeout=1)
+
+    assert stream.failed
+    assert not batcher.streams
+    http_clients._clients.pop("router")
@@ -0,0 +1,150 @@
+import pytest
+from langchain_core.messages import HumanMessage
+
+
+def catalog_entry(name: str, description: str, agent_type: str = "genai") -> dict:
+    return {
+        "name": name,
+        "type": agent_type,
+        "agent_schema": {
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": description,
+                "parameters": {"properties": {}},
+            },
+        },
+    }
+
+
+CATALOG = [
+    catalog_entry("weather_forecast", "Returns the weather forecast for a city"),
+    catalog_entry(
+        "currency_converter", "Converts amounts between currencies using exchange rates"
+    ),
+    catalog_entry("pdf_report", "Generates PDF reports from tables"),
+    catalog_entry("flight_search", "Searches flights between airports"),
+    catalog_entry("daily_digest", "Summarizes news", agent_type="flow"),
+]
+
+
+class FakeChatModel:
+    """
+    Records the tool sets bound to it instead of binding them to an LLM.
+    """
+
+    def __init__(self):
+        self.bound: list[list[str]] = []
+
+    def bind_tools(self, tools, **kwargs):
+        self.bound.append([tool["function"]["name"] for tool in tools])
+        return object()
+
+
+def test_bm25_ranks_matching_agents_first():
+    from utils.tool_index import ToolIndex
+
+    index = ToolIndex()
+    index.update(CATALOG)
+
+    ranked = index.search("What is the exchange rate of euro currencies?", k=3)
+    assert ranked[0][0] == "currency_converter"
+    assert [name for name, _ in index.search("generate reports", k=3)] == ["pdf_report"]
+    assert index.search("wie wird das Wetter", k=3) == []
+
+
+def test_update_reindexes_only_changed_entries():
+    from utils.tool_index import ToolIndex
+
+    index = ToolIndex()
+    index.update(CATALOG)
+    changed = CATALOG[1:] + [
+        catalog_entry("weather_forecast", "Returns rainfall and temperature")
+    ]
+    index.update(changed)
+
+    assert len(index) == len(CATALOG)
+    assert index.search("city", k=1) == []
+    assert index.search("rainfall", k=1)[0][0] == "weather_forecast"
+
+
+def test_top_k_preselection_keeps_pinned_agents_and_falls_back_to_the_catalog():
+    from utils.tool_index import ToolIndex, preselect_agents
+
+    index = ToolIndex()
+    index.update(CATALOG)
+
+    selected = preselect_agents(
+        index=index,
+        agents=CATALOG,
+        query="convert currencies",
+        k=1,
+        pinned={"daily_digest"},
+    )
+    assert [agent["name"] for agent in selected] == [
+        "currency_converter",
+        "daily_digest",
+    ]
+    # no shared terms with any agent
+    assert (
+        preselect_agents(index=index, agents=CATALOG, query="bonjour", k=1) == CATALOG
+    )
+    # catalog not larger than k
+    assert (
+        preselect_agents(index=index, agents=CATALOG, query="weather", k=len(CATALOG))
+        == CATALOG
+    )
+
+
+def test_tool_index_is_shared_by_master_agents_of_catalog_versions(monkeypatch):
+    from agents import cache
+
+    monkeypatch.setattr(
+        cache.LLMFactory, "get_or_create", lambda configs: FakeChatModel()
+    )
+    master_agents = cache.MasterAgentCache(tool_top_k=2)
+
+    first = master_agents.get_or_create(agents=CATALOG, configs={}, user_id="user")
+    second = master_agents.get_or_create(
+        agents=CATALOG[:-1], configs={}, user_id="user"
+    )
+    assert first is not second
+    assert first.tool_index is second.tool_index
+    assert len(second.tool_index) == len(CATALOG) - 1
+
+    # reusing the Master Agent of the first version brings the index back to its catalog
+    assert (
+        master_agents.get_or_create(agents=CATALOG, configs={}, user_id="user") is first
+    )
+    assert len(first.tool_index) == len(CATALOG)
+
+
+@pytest.mark.asyncio
+async def test_models_bound_to_preselected_agents_are_cached(monkeypatch):
+    from agents.react_master_agent import ReActMasterAgent
+    from models.states import MasterAgentState
+
+    async def select(model, messages, agents, model_with_agents):
+        from langchain_core.messages import AIMessage
+
+        return AIMessage(content="done")
+
+    monkeypatch.setattr(
+        "agents.react_master_agent.select_agent_and_resolve_parameters", select
+    )
+    model = FakeChatModel()
+    master_agent = ReActMasterAgent(model=model, agents=CATALOG, tool_top_k=1)
+
+    for query in [
+        "convert currencies",
+        "convert currencies to dollars",
+        "weather in Paris",
+    ]:
+        await master_agent.select_agent(
+            MasterAgentState(messages=[HumanMessage(content=query)], trace=[])
+        )
+
+    assert model.bound == [
+        ["currency_converter", "daily_digest"],
+        ["weather_forecast", "daily_digest"],
+    ]
@@ -0,0 +1,28 @@
+import httpx
+
+
+class HTTPClientRegistry:
+    """
+    Shared httpx clients of the Master Agent, one connection pool per name.
+
+    Calls to the backend and to A2A agents reuse keep-alive connections of the pool
+    instead of opening a connection (and doing a TLS handshake) per call.
+    Headers and timeouts are passed per request, clients carry no per-call state.
+    """
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def get(self, name: str = "default") -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._clients[name] = httpx.AsyncClient()
+        return client
+
+    async def aclose(self) -> None:
+        for client in self._clients.values():
+            await client.aclose()
+        self._clients.clear()
+
+
+http_clients = HTTPClientRegistry()
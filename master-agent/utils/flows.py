@@ -0,0 +1,94 @@
+import json
+from typing import Any, Optional
+
+import jmespath
+from jmespath.exceptions import JMESPathError
+
+JSON_SCHEMA_TYPES = {
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "array": (list,),
+    "object": (dict,),
+}
+
+
+def parse_tool_output(content: Any) -> Any:
+    """
+    Decodes the output of an agent from the content of its ToolMessage (agents often return JSON as text).
+    """
+    for _ in range(2):
+        if not isinstance(content, str):
+            break
+        try:
+            content = json.loads(content)
+        except ValueError:
+            break
+    return content
+
+
+def input_schema(agent_schema: dict[str, Any]) -> dict[str, Any]:
+    """
+    JSON schema of the input of an agent, for both OpenAI function (GenAI agents) and plain (MCP tools) schemas.
+    """
+    if function := agent_schema.get("function"):
+        return function.get("parameters") or {}
+    return agent_schema
+
+
+def _matches_type(value: Any, property_schema: dict[str, Any]) -> bool:
+    expected = JSON_SCHEMA_TYPES.get(property_schema.get("type"))
+    if expected is None:
+        return True
+    if isinstance(value, bool) and bool not in expected:
+        return False
+    return isinstance(value, expected)
+
+
+def _valid_arguments(arguments: dict[str, Any], schema: dict[str, Any]) -> bool:
+    properties = schema.get("properties") or {}
+    if any(field not in arguments for field in schema.get("required", [])):
+        return False
+    return all(_matches_type(value, properties.get(field, {})) for field, value in arguments.items())
+
+
+def map_arguments(
+        mapping: dict[str, str],
+        source: Any,
+        schema: dict[str, Any]
+) -> Optional[dict[str, Any]]:
+    """
+    Builds the arguments of a flow step from its declared input mapping,
+    `{"input_field": "<JMESPath expression on the output of the dependency>"}`.
+
+    Returns:
+        Optional[dict[str, Any]]: None if an expression is invalid or fails on the output,
+            or a required field could not be resolved or has a wrong type.
+    """
+    arguments = {}
+    for field, expression in mapping.items():
+        try:
+            value = jmespath.search(expression, source)
+        except JMESPathError:
+            return None
+        if value is not None:
+            arguments[field] = value
+    return arguments if _valid_arguments(arguments, schema) else None
+
+
+def match_schema(source: Any, schema: dict[str, Any]) -> Optional[dict[str, Any]]:
+    """
+    Schema-compatibility fast path: takes the arguments of a flow step straight from the output of its dependency
+    when the output is an object which has every required input field with the expected type.
+
+    Returns:
+        Optional[dict[str, Any]]: None if the output does not match the input schema.
+    """
+    properties = schema.get("properties") or {}
+    if not isinstance(source, dict) or not properties:
+        return None
+    arguments = {field: source[field] for field in properties if field in source}
+    if not arguments:
+        return None
+    return arguments if _valid_arguments(arguments, schema) else None
@@ -0,0 +1,158 @@
+import asyncio
+from typing import Any, Optional
+
+from langchain_core.messages import AIMessageChunk
+from loguru import logger
+
+from models.enums import Nodes
+from utils.clients import http_clients
+
+
+class ResponseStream:
+    """
+    Final answer of the supervisor for one request, streamed to the frontend while it is generated:
+    chunks are posted to the router, which relays them to the backend, which pushes them to the chat websocket.
+
+    Text is buffered until the ResponseStreamBatcher of the process sends it, tokens generated in between
+    are coalesced into one chunk. A failing request disables the stream for the rest of the request,
+    the complete answer still arrives with the response.
+    """
+
+    def __init__(self, batcher: "ResponseStreamBatcher", session_id: str, request_id: str):
+        self.batcher = batcher
+        self.session_id = session_id
+        self.request_id = request_id
+        self.closed = False
+        self.failed = False
+        self.done = asyncio.Event()  # the final chunk has been sent or the stream failed
+        self._buffer: list[str] = []
+        self._reset = False
+        self._seq = 0
+        self._streamed_message_id: Optional[str] = None
+
+    def on_message_chunk(self, chunk: Any, metadata: dict[str, Any]) -> None:
+        """
+        Handles an LLM token of the graph ("messages" stream mode), only text of the top-level supervisor is streamed.
+        A generation turning into tool calls was not the final answer, the text streamed for it is reset.
+        """
+        if not isinstance(chunk, AIMessageChunk) or metadata.get("langgraph_node") != Nodes.supervisor.value:
+            return
+        if "|" in metadata.get("langgraph_checkpoint_ns", ""):
+            return  # supervisor of a flow executed as a subgraph
+
+        if chunk.tool_call_chunks:
+            if self._streamed_message_id == chunk.id:
+                self.reset()
+            return
+        if isinstance(chunk.content, str) and chunk.content:
+            if self._streamed_message_id != chunk.id:
+                if self._streamed_message_id is not None:
+                    self.reset()
+                self._streamed_message_id = chunk.id
+            self.write(chunk.content)
+
+    def write(self, text: str) -> None:
+        if self.closed or self.failed:
+            return
+        self._buffer.append(text)
+        self.batcher.wakeup()
+
+    def reset(self) -> None:
+        self._buffer.clear()
+        self._reset = True
+        self._streamed_message_id = None
+        self.batcher.wakeup()
+
+    def take_chunk(self) -> Optional[dict[str, Any]]:
+        """
+        Returns the text buffered since the previous chunk as the next chunk of the stream,
+        the last one is `final`. None if there is nothing to send.
+        """
+        delta = "".join(self._buffer)
+        # nothing to reset on the frontend before the first chunk
+        reset = self._reset and self._seq > 0
+        self._buffer.clear()
+        self._reset = False
+        final = self.closed and self._seq > 0
+        if not (delta or reset or final):
+            return None
+
+        chunk = {
+            "session_id": self.session_id,
+            "request_id": self.request_id,
+            "seq": self._seq,
+            "delta": delta,
+            "reset": reset,
+            "final": self.closed,
+        }
+        self._seq += 1
+        return chunk
+
+    async def aclose(self) -> None:
+        """
+        Sends the remaining text with the final chunk, the stream is complete once the response is returned.
+        """
+        self.closed = True
+        self.batcher.wakeup()
+        await self.done.wait()
+
+
+class ResponseStreamBatcher:
+    """
+    Sends the pending chunks of all response streams of the process to the router in one request,
+    at most one request per `flush_interval`: the number of requests grows neither with the number
+    of tokens nor with the number of concurrently answered requests.
+    """
+
+    def __init__(self, url: str, api_key: str, flush_interval: float = 0.05):
+        self.url = url
+        self.api_key = api_key
+        self.flush_interval = flush_interval
+        self.streams: dict[ResponseStream, None] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def open(self, session_id: str, request_id: str) -> ResponseStream:
+        stream = ResponseStream(self, session_id=session_id, request_id=request_id)
+        self.streams[stream] = None
+        return stream
+
+    def wakeup(self) -> None:
+        self._wakeup.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _send(self, chunks: list[dict[str, Any]]) -> None:
+        response = await http_clients.get("router").post(
+            self.url,
+            json={"chunks": chunks},
+            headers={"api-key": self.api_key},
+        )
+        response.raise_for_status()
+
+    async def _run(self) -> None:
+        while self.streams:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+
+            chunks, sending, finished = [], [], []
+            for stream in list(self.streams):
+                if chunk := stream.take_chunk():
+                    chunks.append(chunk)
+                    sending.append(stream)
+                if stream.closed:
+                    del self.streams[stream]
+                    finished.append(stream)
+
+            if chunks:
+                try:
+                    await self._send(chunks)
+                except Exception as e:
+                    logger.warning(f"Streaming of {len(sending)} responses stopped: {e!r}")
+                    for stream in sending:
+                        stream.failed = True
+                        self.streams.pop(stream, None)
+                        stream.done.set()
+            for stream in finished:
+                stream.done.set()
+            await asyncio.sleep(self.flush_interval)
@@ -0,0 +1,141 @@
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Iterable, Optional
+
+TOKEN_PATTERN = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+STOP_WORDS = frozenset(
+    "a an and are as at be by can do for from has have how i in is it me my of on or please the this "
+    "to was what when which who will with you your".split()
+)
+
+
+def _stem(token: str) -> str:
+    # plural forms only, enough to match "reports" with "report" without a stemmer dependency
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Lowercase word tokens, identifiers are split on underscores and camelCase.
+    """
+    tokens = (t.lower() for t in TOKEN_PATTERN.findall(text))
+    return [_stem(token) for token in tokens if token not in STOP_WORDS]
+
+
+def agent_text(agent: dict[str, Any]) -> str:
+    """
+    Searchable text of a catalog entry: its name, description and input parameters.
+    """
+    schema = agent.get("agent_schema") or {}
+    function = schema.get("function") or schema
+    parameters = function.get("parameters") or function
+    parts = [agent.get("name", ""), function.get("name", ""), function.get("title", ""), function.get("description", "")]
+    for name, prop in (parameters.get("properties") or {}).items():
+        parts.append(name)
+        if isinstance(prop, dict):
+            parts.append(str(prop.get("description", "")))
+    return " ".join(part for part in parts if part)
+
+
+@lru_cache(maxsize=16384)
+def _document_terms(text: str) -> tuple[tuple[str, int], ...]:
+    # shared between indexes, a refreshed catalog only tokenizes new or changed entries
+    return tuple(Counter(tokenize(text)).items())
+
+
+class ToolIndex:
+    """
+    BM25 index over agent names and descriptions used to preselect the agents bound to the LLM.
+
+    Entries are keyed by agent name (the name the LLM calls), `update` applies a new catalog
+    incrementally: only added, removed or changed entries touch the index.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._texts: dict[str, str] = {}
+        self._terms: dict[str, dict[str, int]] = {}
+        self._lengths: dict[str, int] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _add(self, key: str, text: str) -> None:
+        terms = dict(_document_terms(text))
+        self._texts[key] = text
+        self._terms[key] = terms
+        self._lengths[key] = sum(terms.values())
+        self._total_length += self._lengths[key]
+        for term in terms:
+            self._postings.setdefault(term, set()).add(key)
+
+    def _remove(self, key: str) -> None:
+        for term in self._terms.pop(key):
+            postings = self._postings[term]
+            postings.discard(key)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(key)
+        del self._texts[key]
+
+    def update(self, agents: Iterable[dict[str, Any]]) -> None:
+        catalog = {agent["name"]: agent_text(agent) for agent in agents}
+        for key in [key for key, text in self._texts.items() if catalog.get(key) != text]:
+            self._remove(key)
+        for key, text in catalog.items():
+            if key not in self._texts:
+                self._add(key, text)
+
+    def search(self, query: str, k: int) -> list[tuple[str, float]]:
+        """
+        Returns:
+            list[tuple[str, float]]: Up to `k` agent names with a positive score, best first.
+        """
+        if not self._terms:
+            return []
+        avg_length = self._total_length / len(self._terms) or 1.0
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (len(self._terms) - len(postings) + 0.5) / (len(postings) + 0.5))
+            for key in postings:
+                tf = self._terms[key][term]
+                norm = tf + self.k1 * (1 - self.b + self.b * self._lengths[key] / avg_length)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+
+def preselect_agents(
+        index: ToolIndex,
+        agents: list[dict[str, Any]],
+        query: str,
+        k: int,
+        pinned: Optional[set[str]] = None
+) -> list[dict[str, Any]]:
+    """
+    Top-k agents of the catalog for the query, in catalog order.
+
+    Recall safeguards: pinned agents (flows, agents already called in the conversation) are always kept,
+    and the whole catalog is returned when the query shares no terms with any agent (e.g. it is written
+    in another language than the descriptions) or when the catalog is not larger than `k`.
+    """
+    if k <= 0 or len(agents) <= k:
+        return agents
+
+    ranked = index.search(query, k)
+    if not ranked:
+        return agents
+
+    selected = {name for name, _ in ranked} | (pinned or set())
+    return [agent for agent in agents if agent["name"] in selected]
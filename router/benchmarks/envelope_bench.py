@@ -0,0 +1,95 @@
+"""
+Microbenchmark of AGENT_RESPONSE forwarding: plain JSON frames vs routing envelopes.
+
+Measures the CPU time the router spends per frame to turn an incoming agent response
+into the frame delivered to the invoker.
+
+Usage (from the router directory):
+    python -m benchmarks.envelope_bench [--repeat 5]
+"""
+
+import argparse
+import json
+import time
+from typing import Callable
+
+from utils.envelope import build_envelope, split_envelope, splice_fields
+
+PAYLOAD_SIZES = {"1 KB": 1024, "100 KB": 100 * 1024, "5 MB": 5 * 1024 * 1024}
+
+
+def make_payload(size: int) -> dict:
+    # extracted report-like payload: many short text fields
+    line = "Hemoglobin 13.5 g/dL (ref 12.0-15.5), within normal range. "
+    lines = [line] * max(1, size // len(line))
+    return {
+        "response": {"report": lines, "pages": len(lines) // 40},
+        "execution_time": 1.23,
+        "is_success": True,
+    }
+
+
+def forward_plain(frame: str) -> str:
+    # mirrors WSConnectionManager for plain JSON AGENT_RESPONSE frames
+    data = json.loads(frame)
+    message_type = data.pop("message_type", None)
+    data.pop("agent_uuid", None)
+    data.pop("invoked_by", None)
+    data["message_type"] = message_type
+    return json.dumps(data)
+
+
+def forward_envelope(frame: str) -> str:
+    header, body = split_envelope(frame)
+    return splice_fields(body, {"message_type": header["message_type"]})
+
+
+def time_per_frame(func: Callable[[str], str], frame: str, repeat: int) -> float:
+    # adapt the number of iterations so each measurement runs for ~0.2s
+    iterations = 1
+    while True:
+        start = time.process_time()
+        for _ in range(iterations):
+            func(frame)
+        elapsed = time.process_time() - start
+        if elapsed > 0.2:
+            break
+        iterations *= 2
+
+    best = elapsed / iterations
+    for _ in range(repeat - 1):
+        start = time.process_time()
+        for _ in range(iterations):
+            func(frame)
+        best = min(best, (time.process_time() - start) / iterations)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    header = {"message_type": "agent_response", "invoked_by": "invoker-id"}
+    print(
+        f"{'payload':>8} | {'plain, us':>12} | {'envelope, us':>12} | {'saved, us':>12} | speedup"
+    )
+    for label, size in PAYLOAD_SIZES.items():
+        payload = make_payload(size)
+        body = json.dumps(payload)
+        plain_frame = json.dumps({**header, **payload})
+        envelope_frame = build_envelope(header, body)
+
+        assert json.loads(forward_envelope(envelope_frame)) == json.loads(
+            forward_plain(plain_frame)
+        )
+
+        plain = time_per_frame(forward_plain, plain_frame, args.repeat) * 1e6
+        envelope = time_per_frame(forward_envelope, envelope_frame, args.repeat) * 1e6
+        print(
+            f"{label:>8} | {plain:>12.1f} | {envelope:>12.1f} | {plain - envelope:>12.1f} | {plain / envelope:.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
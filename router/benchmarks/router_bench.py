@@ -0,0 +1,280 @@
+"""
+Router throughput and latency benchmark.
+
+Starts the router in-process (uvicorn on a local port), connects N synthetic agents and
+M synthetic invokers speaking the WSMessageType protocol and drives invocations through it.
+Reports p50/p95/p99 invoke -> response latency, frames/sec and memory per connection,
+and saves the results as JSON so runs can be compared across changes.
+
+Usage (from the router directory):
+    python -m benchmarks.router_bench --agents 10 --invokers 50 --requests 200 \\
+        --request-size 1024 --response-size 102400 --pattern fan-out --fan-out 3
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import socket
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+import jwt
+import uvicorn
+import websockets
+
+from settings import get_settings
+from utils.envelope import build_envelope
+from utils.enums import WSMessageType
+
+PATTERNS = ("round-robin", "hotspot", "fan-out")
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def start_router(port: int) -> tuple[uvicorn.Server, asyncio.Task]:
+    from main import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"
+        )
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def synthetic_agent(
+    uri: str, agent_id: str, response_size: int, envelope: bool, ready: asyncio.Event
+):
+    """
+    Answers every AGENT_INVOKE with an AGENT_RESPONSE of `response_size` bytes.
+    """
+    response_body = json.dumps(
+        {
+            "response": {"text": "x" * response_size},
+            "execution_time": 0.0,
+            "is_success": True,
+        }
+    )
+    settings = get_settings()
+    agent_jwt = jwt.encode(
+        {"sub": agent_id, "user_id": "bench-user"},
+        settings.SECRET_KEY,
+        algorithm=settings.HASH_ALGORITHM,
+    )
+    async with websockets.connect(
+        uri, additional_headers={"x-custom-authorization": agent_jwt}, max_size=None
+    ) as websocket:
+        ready.set()
+        async for frame in websocket:
+            invoke = json.loads(frame)
+            if invoke.get("message_type") == WSMessageType.AGENT_CANCEL.value:
+                continue
+            header = {
+                "message_type": WSMessageType.AGENT_RESPONSE.value,
+                "invoked_by": invoke["invoked_by"],
+            }
+            if envelope:
+                await websocket.send(build_envelope(header, response_body))
+            else:
+                await websocket.send(
+                    json.dumps({**header, **json.loads(response_body)})
+                )
+
+
+async def synthetic_invoker(
+    uri: str,
+    invoker_index: int,
+    agent_ids: list[str],
+    args: argparse.Namespace,
+    latencies: list[float],
+    errors: list[str],
+):
+    """
+    Sends `args.requests` rounds of invocations, every round targets `args.fan_out` agents
+    (1 for round-robin and hotspot patterns) and waits for all their responses.
+    """
+    payload = {"text": "x" * args.request_size}
+    async with websockets.connect(
+        uri,
+        additional_headers={
+            "x-custom-invoke-key": f"bench-invoker-{invoker_index}-{uuid4()}"
+        },
+        max_size=None,
+    ) as websocket:
+        for request_index in range(args.requests):
+            if args.pattern == "hotspot":
+                targets = [agent_ids[0]]
+            elif args.pattern == "fan-out":
+                start = (invoker_index + request_index) % len(agent_ids)
+                targets = [
+                    agent_ids[(start + i) % len(agent_ids)]
+                    for i in range(min(args.fan_out, len(agent_ids)))
+                ]
+            else:
+                targets = [agent_ids[(invoker_index + request_index) % len(agent_ids)]]
+
+            started_at = time.perf_counter()
+            for agent_id in targets:
+                await websocket.send(
+                    json.dumps(
+                        {
+                            "message_type": WSMessageType.AGENT_INVOKE.value,
+                            "agent_uuid": agent_id,
+                            "request_payload": payload,
+                        }
+                    )
+                )
+            for _ in targets:
+                response = json.loads(await websocket.recv())
+                if response.get("message_type") == WSMessageType.AGENT_ERROR.value:
+                    errors.append(
+                        response.get("error", {}).get("error_type", "unknown")
+                    )
+                latencies.append(time.perf_counter() - started_at)
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    port = free_port()
+    uri = f"ws://127.0.0.1:{port}/ws"
+    server, server_task = await start_router(port)
+
+    tracemalloc.start()
+    memory_before, _ = tracemalloc.get_traced_memory()
+
+    agent_ids = [str(uuid4()) for _ in range(args.agents)]
+    readiness = [asyncio.Event() for _ in agent_ids]
+    agent_tasks = [
+        asyncio.create_task(
+            synthetic_agent(uri, agent_id, args.response_size, args.envelope, ready)
+        )
+        for agent_id, ready in zip(agent_ids, readiness)
+    ]
+    await asyncio.gather(*(ready.wait() for ready in readiness))
+    memory_after_agents, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies: list[float] = []
+    errors: list[str] = []
+    started_at = time.perf_counter()
+    await asyncio.gather(
+        *(
+            synthetic_invoker(uri, i, agent_ids, args, latencies, errors)
+            for i in range(args.invokers)
+        )
+    )
+    elapsed = time.perf_counter() - started_at
+
+    for task in agent_tasks:
+        task.cancel()
+    await asyncio.gather(*agent_tasks, return_exceptions=True)
+    server.should_exit = True
+    await server_task
+
+    invocations = len(latencies)
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "config": vars(args),
+        "invocations": invocations,
+        "errors": len(errors),
+        "duration_s": elapsed,
+        "invocations_per_s": invocations / elapsed if elapsed else 0.0,
+        # every invocation is two frames through the router: invoke and response
+        "frames_per_s": 2 * invocations / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * 1000,
+            "p95": percentile(latencies, 95) * 1000,
+            "p99": percentile(latencies, 99) * 1000,
+            "max": max(latencies, default=0.0) * 1000,
+        },
+        # both ends of the socket live in this process, so this is an upper bound for the router
+        "memory_per_connection_kb": (memory_after_agents - memory_before)
+        / max(args.agents, 1)
+        / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Router throughput and latency benchmark"
+    )
+    parser.add_argument(
+        "--agents", type=int, default=10, help="Number of synthetic agents"
+    )
+    parser.add_argument(
+        "--invokers", type=int, default=20, help="Number of synthetic invokers"
+    )
+    parser.add_argument("--requests", type=int, default=100, help="Rounds per invoker")
+    parser.add_argument(
+        "--request-size", type=int, default=1024, help="Invoke payload, bytes"
+    )
+    parser.add_argument(
+        "--response-size", type=int, default=1024, help="Response payload, bytes"
+    )
+    parser.add_argument("--pattern", choices=PATTERNS, default="round-robin")
+    parser.add_argument(
+        "--fan-out", type=int, default=3, help="Agents per round for fan-out"
+    )
+    parser.add_argument(
+        "--envelope", action="store_true", help="Agents answer with routing envelopes"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="Path of the JSON results file"
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    output = (
+        args.output or RESULTS_DIR / f"router_bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2, default=str))
+
+    latency = results["latency_ms"]
+    print(
+        f"{results['invocations']} invocations in {results['duration_s']:.2f}s "
+        f"({results['invocations_per_s']:.0f}/s, {results['frames_per_s']:.0f} frames/s), "
+        f"errors: {results['errors']}\n"
+        f"latency p50={latency['p50']:.2f}ms p95={latency['p95']:.2f}ms p99={latency['p99']:.2f}ms, "
+        f"memory per connection: {results['memory_per_connection_kb']:.1f} KB\n"
+        f"results saved to {output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+import time
+from typing import Dict, Optional
+
+from utils.enums import ErrorType
+from utils.pydantic_models import AdmissionConfig, AdmissionLimit
+
+
+class TokenBucket:
+    """
+    Token bucket refilled with `rate` tokens per second up to `burst` tokens.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> float:
+        """
+        Takes a token from the bucket.
+
+        Returns:
+            float: 0 if a token has been taken, otherwise seconds until one is available.
+        """
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def refund(self) -> None:
+        self.tokens = min(self.burst, self.tokens + 1)
+
+    @property
+    def full(self) -> bool:
+        self._refill(time.monotonic())
+        return self.tokens >= self.burst
+
+
+class AdmissionRejection:
+    """
+    Reason an invocation was not admitted, with a hint when it may be retried.
+    """
+
+    def __init__(self, error_type: ErrorType, error_message: str, retry_after: float):
+        self.error_type = error_type
+        self.error_message = error_message
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Rate limits and concurrency caps for AGENT_INVOKE frames, per target agent and per invoking user.
+
+    Rates are enforced with token buckets, concurrency caps against the numbers of in-flight
+    invocations which are passed in by the caller (the in-flight invocation table owns them).
+    Limits can be replaced at runtime, buckets are then rebuilt lazily.
+    """
+
+    MAX_BUCKETS = 10000
+
+    def __init__(self, config: AdmissionConfig):
+        self.config = config
+        self.buckets: Dict[tuple[str, str], TokenBucket] = {}
+
+    def configure(self, config: AdmissionConfig) -> None:
+        self.config = config
+        self.buckets.clear()
+
+    def _limit(self, scope: str, key: str) -> AdmissionLimit:
+        if scope == "agent":
+            return self.config.agent_overrides.get(key, self.config.agent)
+        return self.config.user_overrides.get(key, self.config.user)
+
+    def _bucket(self, scope: str, key: str, limit: AdmissionLimit) -> TokenBucket:
+        bucket = self.buckets.get((scope, key))
+        if not bucket:
+            if len(self.buckets) >= self.MAX_BUCKETS:
+                # idle buckets are full, dropping them does not change admission decisions
+                self.buckets = {k: b for k, b in self.buckets.items() if not b.full}
+            bucket = self.buckets[(scope, key)] = TokenBucket(
+                rate=limit.rate, burst=limit.burst or max(int(limit.rate), 1)
+            )
+        return bucket
+
+    def admit(
+        self,
+        agent_id: str,
+        user_id: str,
+        agent_in_flight: int,
+        user_in_flight: int,
+        concurrency_retry_after: float = 1.0,
+    ) -> Optional[AdmissionRejection]:
+        """
+        Checks the limits of the target agent and the invoking user, taking rate tokens if admitted.
+
+        Args:
+            agent_id (str): The client ID of the invoked agent.
+            user_id (str): The ID of the invoking user (or of the caller if the user is unknown).
+            agent_in_flight (int): In-flight invocations handled by the agent.
+            user_in_flight (int): In-flight invocations of the user.
+            concurrency_retry_after (float): Retry hint for concurrency rejections,
+                e.g. the average latency of the agent.
+
+        Returns:
+            Optional[AdmissionRejection]: None if the invocation is admitted.
+        """
+        checks = (
+            ("agent", agent_id, agent_in_flight),
+            ("user", user_id, user_in_flight),
+        )
+        for scope, key, in_flight in checks:
+            limit = self._limit(scope, key)
+            if limit.max_concurrency and in_flight >= limit.max_concurrency:
+                return AdmissionRejection(
+                    ErrorType.CONCURRENCY_LIMITED,
+                    f"Too many concurrent invocations for {scope} {key} "
+                    f"(limit: {limit.max_concurrency})",
+                    retry_after=round(concurrency_retry_after, 3),
+                )
+
+        taken = []
+        for scope, key, _ in checks:
+            limit = self._limit(scope, key)
+            if not limit.rate:
+                continue
+            bucket = self._bucket(scope, key, limit)
+            if retry_after := bucket.try_acquire():
+                for (
+                    taken_bucket
+                ) in taken:  # the invocation is not sent, give tokens back
+                    taken_bucket.refund()
+                return AdmissionRejection(
+                    ErrorType.RATE_LIMITED,
+                    f"Rate limit of {scope} {key} exceeded ({limit.rate}/s)",
+                    retry_after=round(retry_after, 3),
+                )
+            taken.append(bucket)
+        return None
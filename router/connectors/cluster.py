@@ -0,0 +1,209 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+from redis import asyncio as aioredis
+
+ClusterMessageHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class ClusterBackend(ABC):
+    """
+    Connection-location registry and message bus shared by router nodes.
+
+    The registry maps client IDs to the nodes holding their sockets,
+    the bus carries frames between nodes when sender and target sit on different nodes.
+    """
+
+    @abstractmethod
+    async def start(self, node_id: str, handler: ClusterMessageHandler) -> None:
+        """
+        Subscribes the node to messages published to it and to broadcasts.
+        """
+
+    @abstractmethod
+    async def stop(self, node_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def register(self, client_id: str, node_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def unregister(self, client_id: str, node_id: str) -> None:
+        pass
+
+    @abstractmethod
+    async def locate(self, client_id: str) -> Set[str]:
+        """
+        Returns IDs of the nodes holding at least one connection of the client.
+        """
+
+    @abstractmethod
+    async def publish(self, node_id: str, message: Dict[str, Any]) -> None:
+        pass
+
+    @abstractmethod
+    async def broadcast(self, message: Dict[str, Any]) -> None:
+        """
+        Publishes the message to every node, including the sender.
+        """
+
+
+class InProcessClusterBackend(ClusterBackend):
+    """
+    In-memory stand-in shared by several routers running in one process (tests, benchmarks).
+    """
+
+    def __init__(self):
+        self.registry: Dict[str, Set[str]] = {}
+        self.nodes: Dict[str, ClusterMessageHandler] = {}
+
+    async def start(self, node_id: str, handler: ClusterMessageHandler) -> None:
+        self.nodes[node_id] = handler
+
+    async def stop(self, node_id: str) -> None:
+        self.nodes.pop(node_id, None)
+        for client_id in list(self.registry):
+            await self.unregister(client_id, node_id)
+
+    async def register(self, client_id: str, node_id: str) -> None:
+        self.registry.setdefault(client_id, set()).add(node_id)
+
+    async def unregister(self, client_id: str, node_id: str) -> None:
+        if nodes := self.registry.get(client_id):
+            nodes.discard(node_id)
+            if not nodes:
+                del self.registry[client_id]
+
+    async def locate(self, client_id: str) -> Set[str]:
+        return set(self.registry.get(client_id, ()))
+
+    async def publish(self, node_id: str, message: Dict[str, Any]) -> None:
+        if handler := self.nodes.get(node_id):
+            await handler(message)
+
+    async def broadcast(self, message: Dict[str, Any]) -> None:
+        for handler in list(self.nodes.values()):
+            await handler(message)
+
+
+class RedisClusterBackend(ClusterBackend):
+    """
+    Redis backed registry (one set of node IDs per client) and pub/sub bus (one channel per node).
+
+    Every node refreshes a heartbeat key expiring after `node_ttl` seconds. Registrations of
+    nodes whose heartbeat expired (crashed without unregistering their clients) are ignored
+    and removed on lookup.
+    """
+
+    BROADCAST_CHANNEL = "genai-router:broadcast"
+
+    def __init__(self, url: str, node_ttl: float = 15.0):
+        """
+        Args:
+            url (str): Redis URL.
+            node_ttl (float): Seconds after which a node which stopped sending heartbeats
+                is considered gone, heartbeats are sent every third of it.
+        """
+        self.redis = aioredis.from_url(url, decode_responses=True)
+        self.node_ttl = node_ttl
+        self.local_clients: Set[str] = set()
+        self._pubsub = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _client_key(client_id: str) -> str:
+        return f"genai-router:client:{client_id}"
+
+    @staticmethod
+    def _node_channel(node_id: str) -> str:
+        return f"genai-router:node:{node_id}"
+
+    @staticmethod
+    def _heartbeat_key(node_id: str) -> str:
+        return f"genai-router:heartbeat:{node_id}"
+
+    async def start(self, node_id: str, handler: ClusterMessageHandler) -> None:
+        await self._send_heartbeat(node_id)
+        self._heartbeat_task = asyncio.create_task(self._heartbeat(node_id))
+        self._pubsub = self.redis.pubsub()
+        await self._pubsub.subscribe(
+            self._node_channel(node_id), self.BROADCAST_CHANNEL
+        )
+        self._reader_task = asyncio.create_task(self._reader(handler))
+
+    async def _send_heartbeat(self, node_id: str) -> None:
+        await self.redis.set(
+            self._heartbeat_key(node_id), "1", px=int(self.node_ttl * 1000)
+        )
+
+    async def _heartbeat(self, node_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.node_ttl / 3)
+            try:
+                await self._send_heartbeat(node_id)
+            except Exception:
+                logging.exception("Failed to send the cluster heartbeat")
+
+    async def _reader(self, handler: ClusterMessageHandler) -> None:
+        async for item in self._pubsub.listen():
+            if item.get("type") != "message":
+                continue
+            try:
+                await handler(json.loads(item["data"]))
+            except Exception:
+                logging.exception("Failed to handle cluster message")
+
+    async def stop(self, node_id: str) -> None:
+        for task in (self._heartbeat_task, self._reader_task):
+            if task:
+                task.cancel()
+        if self._pubsub:
+            await self._pubsub.aclose()
+        for client_id in list(self.local_clients):
+            await self.unregister(client_id, node_id)
+        await self.redis.delete(self._heartbeat_key(node_id))
+        await self.redis.aclose()
+
+    async def register(self, client_id: str, node_id: str) -> None:
+        self.local_clients.add(client_id)
+        await self.redis.sadd(self._client_key(client_id), node_id)
+
+    async def unregister(self, client_id: str, node_id: str) -> None:
+        self.local_clients.discard(client_id)
+        await self.redis.srem(self._client_key(client_id), node_id)
+
+    async def locate(self, client_id: str) -> Set[str]:
+        nodes = sorted(await self.redis.smembers(self._client_key(client_id)))
+        if not nodes:
+            return set()
+        heartbeats = await self.redis.mget([self._heartbeat_key(n) for n in nodes])
+        gone = [node for node, alive in zip(nodes, heartbeats) if not alive]
+        if gone:
+            await self.redis.srem(self._client_key(client_id), *gone)
+        return set(nodes) - set(gone)
+
+    async def publish(self, node_id: str, message: Dict[str, Any]) -> None:
+        await self.redis.publish(self._node_channel(node_id), json.dumps(message))
+
+    async def broadcast(self, message: Dict[str, Any]) -> None:
+        await self.redis.publish(self.BROADCAST_CHANNEL, json.dumps(message))
+
+
+def create_cluster_backend(
+    name: str, redis_url: str = "", node_ttl: float = 15.0
+) -> Optional[ClusterBackend]:
+    """
+    Builds the cluster backend configured by CLUSTER_BACKEND, None for single-node mode.
+    """
+    if not name:
+        return None
+    if name == "memory":
+        return InProcessClusterBackend()
+    if name == "redis":
+        return RedisClusterBackend(url=redis_url, node_ttl=node_ttl)
+    raise ValueError(f"Unknown cluster backend: {name}")
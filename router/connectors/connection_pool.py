@@ -0,0 +1,273 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from fastapi import WebSocket
+from utils.enums import Lane, OverflowPolicy
+from utils.exceptions import OutboundQueueFullException
+
+
+class LaneStats:
+    """
+    Queueing latency (enqueue -> written to the socket) of an outbound lane.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def observe(self, latency: float) -> None:
+        self.frames += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def merge(self, other: "LaneStats") -> None:
+        self.frames += other.frames
+        self.total_latency += other.total_latency
+        self.max_latency = max(self.max_latency, other.max_latency)
+
+    def to_json(self) -> Dict[str, float]:
+        return {
+            "frames": self.frames,
+            "avg_latency_ms": (
+                self.total_latency / self.frames * 1000 if self.frames else 0.0
+            ),
+            "max_latency_ms": self.max_latency * 1000,
+        }
+
+
+class AgentConnection:
+    """
+    Single WebSocket connection (replica) of a client together with its routing state.
+
+    Outgoing frames are not written inline: they are put on bounded outbound lanes
+    which are drained by a dedicated writer task, so a slow receiver only stalls its own queue.
+    The writer always empties the PRIORITY lane (invocations, responses) before the LOG lane.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        websocket: WebSocket,
+        agent_jwt: Optional[str] = None,
+        max_queue_size: int = 1000,
+        user_id: Optional[str] = None,
+    ):
+        """
+        Args:
+            client_id (str): The ID of the client (agent) the connection belongs to.
+            websocket (WebSocket): The accepted WebSocket connection.
+            agent_jwt (Optional[str]): JWT the agent used to authenticate, if any.
+            max_queue_size (int): Capacity of every outbound lane.
+            user_id (Optional[str]): The user the connection acts for, taken from the agent JWT.
+        """
+        self.connection_id = str(uuid4())
+        self.client_id = client_id
+        self.websocket = websocket
+        self.agent_jwt = agent_jwt
+        self.user_id = user_id
+        self.in_flight = 0
+
+        self.lanes: Dict[Lane, asyncio.Queue[tuple[float, str]]] = {
+            lane: asyncio.Queue(maxsize=max_queue_size) for lane in Lane
+        }
+        self.lane_stats: Dict[Lane, LaneStats] = {lane: LaneStats() for lane in Lane}
+        self.enqueued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self._pending = asyncio.Event()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._closed = asyncio.Event()
+
+    @property
+    def depth(self) -> int:
+        return sum(queue.qsize() for queue in self.lanes.values())
+
+    def start(self) -> None:
+        """
+        Starts the writer task draining the outbound lanes.
+        """
+        if not self._writer_task:
+            self._writer_task = asyncio.create_task(self._writer())
+
+    async def close(self) -> None:
+        """
+        Stops the writer task, frames still queued are discarded.
+        Senders blocked on a full lane are woken up with OutboundQueueFullException.
+        """
+        self._closed.set()
+        if self._writer_task:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+
+    def _next_frame(self) -> Optional[tuple[Lane, float, str]]:
+        for lane, queue in self.lanes.items():  # lanes are ordered by priority
+            if not queue.empty():
+                enqueued_at, message = queue.get_nowait()
+                return lane, enqueued_at, message
+        return None
+
+    async def _writer(self) -> None:
+        while True:
+            next_frame = self._next_frame()
+            if not next_frame:
+                self._pending.clear()
+                await self._pending.wait()
+                continue
+
+            lane, enqueued_at, message = next_frame
+            try:
+                await self.websocket.send_text(message)
+                self.sent += 1
+                self.lane_stats[lane].observe(time.monotonic() - enqueued_at)
+            except Exception as e:
+                # socket is gone, receive loop will trigger the disconnect
+                logging.warning(f"Failed to write to {self.client_id}: {e}")
+                self._closed.set()
+                return
+
+    async def send_text(
+        self,
+        message: str,
+        policy: OverflowPolicy = OverflowPolicy.BLOCK,
+        lane: Lane = Lane.PRIORITY,
+    ) -> None:
+        """
+        Puts a frame on an outbound lane, applying the overflow policy if the lane is full.
+
+        Args:
+            message (str): Serialized frame.
+            policy (OverflowPolicy): What to do when the lane is full:
+                BLOCK waits for free space, DROP_OLDEST discards the oldest queued frame,
+                ERROR raises OutboundQueueFullException so the sender can be notified.
+            lane (Lane): Outbound lane of the frame.
+
+        Raises:
+            OutboundQueueFullException: The lane is full and the policy is ERROR, or the
+                connection is closed (also while blocked) and the policy is not DROP_OLDEST.
+        """
+        if self._closed.is_set():
+            self._discard_closed(policy)
+            return
+
+        queue = self.lanes[lane]
+        if queue.full():
+            if policy == OverflowPolicy.ERROR:
+                self.rejected += 1
+                raise OutboundQueueFullException(
+                    f"Outbound queue of {self.client_id} is full ({queue.maxsize} frames)"
+                )
+            if policy == OverflowPolicy.DROP_OLDEST:
+                queue.get_nowait()
+                self.dropped += 1
+
+        if not queue.full():
+            queue.put_nowait((time.monotonic(), message))
+        elif not await self._put_or_close(queue, (time.monotonic(), message)):
+            self._discard_closed(policy)
+            return
+        self.enqueued += 1
+        self.max_depth = max(self.max_depth, self.depth)
+        self._pending.set()
+
+    async def _put_or_close(
+        self,
+        queue: asyncio.Queue[tuple[float, str]],
+        frame: tuple[float, str],
+    ) -> bool:
+        """
+        Waits for free space in a full lane, or until the connection is closed.
+
+        Returns:
+            bool: Whether the frame has been queued.
+        """
+        put = asyncio.ensure_future(queue.put(frame))
+        closed = asyncio.ensure_future(self._closed.wait())
+        try:
+            await asyncio.wait({put, closed}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            closed.cancel()
+            if not put.done():
+                put.cancel()
+        return put.done() and not put.cancelled()
+
+    def _discard_closed(self, policy: OverflowPolicy) -> None:
+        """
+        Discards a frame addressed to a closed connection, control frames (DROP_OLDEST)
+        are discarded silently, any other sender is notified.
+        """
+        self.dropped += 1
+        if policy != OverflowPolicy.DROP_OLDEST:
+            raise OutboundQueueFullException(
+                f"Connection of {self.client_id} is closed, frame discarded"
+            )
+
+    def stats(self) -> Dict[str, int | str | dict]:
+        """
+        Returns queue-depth counters of the connection.
+        """
+        return {
+            "connection_id": self.connection_id,
+            "in_flight": self.in_flight,
+            "depth": self.depth,
+            "lanes": {lane.value: queue.qsize() for lane, queue in self.lanes.items()},
+            "max_depth": self.max_depth,
+            "capacity": self.lanes[Lane.PRIORITY].maxsize,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+        }
+
+
+class ConnectionPool:
+    """
+    Pool of replica connections sharing the same client ID.
+
+    Several processes of the same agent authenticate with the same JWT `sub`,
+    every one of them is kept in the pool and invocations are dispatched to
+    the replica with the fewest in-flight requests.
+    """
+
+    def __init__(self, client_id: str):
+        self.client_id = client_id
+        self.connections: List[AgentConnection] = []
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    def __bool__(self) -> bool:
+        return bool(self.connections)
+
+    def add(self, connection: AgentConnection) -> None:
+        self.connections.append(connection)
+
+    def remove(self, connection: AgentConnection) -> None:
+        if connection in self.connections:
+            self.connections.remove(connection)
+
+    @property
+    def primary(self) -> Optional[AgentConnection]:
+        """
+        The oldest live connection of the pool, used for frames that are not load-balanced
+        (responses, errors, registration replies).
+        """
+        return self.connections[0] if self.connections else None
+
+    def least_loaded(self) -> Optional[AgentConnection]:
+        """
+        Returns the replica with the fewest in-flight requests.
+        Ties are resolved in favour of the oldest connection.
+        """
+        if not self.connections:
+            return None
+        return min(self.connections, key=lambda connection: connection.in_flight)
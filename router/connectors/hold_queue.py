@@ -0,0 +1,135 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from connectors.connection_pool import AgentConnection
+
+
+class HeldInvocation:
+    """
+    AGENT_INVOKE addressed to an agent which is briefly disconnected.
+    """
+
+    def __init__(
+        self,
+        caller_id: str,
+        target_id: str,
+        message: dict,
+        timeout: float,
+        user_id: Optional[str] = None,
+        caller_connection: Optional[AgentConnection] = None,
+    ):
+        self.caller_id = caller_id
+        self.target_id = target_id
+        self.message = message
+        self.timeout = timeout
+        self.user_id = user_id
+        self.caller_connection = caller_connection
+        self.held_at = asyncio.get_running_loop().time()
+
+    def remaining_timeout(self) -> float:
+        """
+        Invocation timeout minus the time the invocation spent in the hold queue.
+        """
+        held_for = asyncio.get_running_loop().time() - self.held_at
+        return max(self.timeout - held_for, 0.0)
+
+
+class HoldQueue:
+    """
+    Bounded per-agent hold queues for invocations to agents which disconnected recently.
+
+    Once the last connection of an agent is gone, invocations addressed to it are held for
+    `grace_period` seconds (at most `max_size` per agent) instead of being rejected right away.
+    They are released in order when the agent reconnects; when the grace period ends first,
+    they are passed to `on_expire` so the callers receive the usual AgentNotActive error.
+    """
+
+    def __init__(
+        self,
+        grace_period: float,
+        max_size: int,
+        on_expire: Callable[[str, List[HeldInvocation]], Awaitable[None]],
+    ):
+        """
+        Args:
+            grace_period (float): Seconds after a disconnect during which invocations are held,
+                0 disables holding.
+            max_size (int): Maximum number of held invocations per agent.
+            on_expire (Callable): Coroutine called with the agent ID and its held invocations
+                once the grace period has ended.
+        """
+        self.grace_period = grace_period
+        self.max_size = max_size
+        self.on_expire = on_expire
+        self.held: Dict[str, List[HeldInvocation]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+
+    def __len__(self) -> int:
+        return sum(len(items) for items in self.held.values())
+
+    @property
+    def enabled(self) -> bool:
+        return self.grace_period > 0 and self.max_size > 0
+
+    def mark_gone(self, client_id: str) -> None:
+        """
+        Opens the grace period of an agent which has no connections left.
+        """
+        if not self.enabled or client_id in self._timers:
+            return
+        self.held[client_id] = []
+        self._timers[client_id] = asyncio.get_running_loop().call_later(
+            self.grace_period, self._expire, client_id
+        )
+
+    def hold(
+        self,
+        caller_id: str,
+        target_id: str,
+        message: dict,
+        timeout: float,
+        user_id: Optional[str] = None,
+        caller_connection: Optional[AgentConnection] = None,
+    ) -> bool:
+        """
+        Holds the invocation if the target is within its grace period and its queue is not full.
+
+        Returns:
+            bool: Whether the invocation has been held.
+        """
+        items = self.held.get(target_id)
+        if items is None or len(items) >= self.max_size:
+            return False
+        items.append(
+            HeldInvocation(
+                caller_id, target_id, message, timeout, user_id, caller_connection
+            )
+        )
+        return True
+
+    def release(self, client_id: str) -> List[HeldInvocation]:
+        """
+        Closes the grace period of a reconnected agent and returns its held invocations in order.
+        """
+        if timer := self._timers.pop(client_id, None):
+            timer.cancel()
+        return self.held.pop(client_id, [])
+
+    def cancel(
+        self, caller_id: str, target_id: Optional[str] = None
+    ) -> List[HeldInvocation]:
+        """
+        Removes held invocations of the caller, optionally only those addressed to the target.
+        """
+        cancelled = []
+        for client_id, items in self.held.items():
+            if target_id is not None and client_id != target_id:
+                continue
+            cancelled += [item for item in items if item.caller_id == caller_id]
+            items[:] = [item for item in items if item.caller_id != caller_id]
+        return cancelled
+
+    def _expire(self, client_id: str) -> None:
+        self._timers.pop(client_id, None)
+        if items := self.held.pop(client_id, []):
+            asyncio.create_task(self.on_expire(client_id, items))
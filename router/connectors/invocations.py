@@ -0,0 +1,350 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+from connectors.connection_pool import AgentConnection
+
+
+class InFlightInvocation:
+    """
+    AGENT_INVOKE forwarded to an agent replica and not answered yet.
+    """
+
+    def __init__(
+        self,
+        caller_id: str,
+        target_id: str,
+        connection: AgentConnection,
+        deadline: float,
+        user_id: Optional[str] = None,
+        request_id: Optional[str] = None,
+        caller_connection: Optional[AgentConnection] = None,
+    ):
+        self.request_id = request_id or str(uuid4())
+        self.caller_id = caller_id
+        self.target_id = target_id
+        self.user_id = user_id or caller_id
+        self.connection = connection
+        # replica of the caller which sent the invocation, it receives the response
+        self.caller_connection = caller_connection
+        self.started_at = time.monotonic()
+        self.deadline = deadline
+        self.timer: Optional[asyncio.TimerHandle] = None
+        # expired or cancelled before the agent responded, a late response is dropped
+        self.abandoned = False
+
+
+class InvocationTracker:
+    """
+    In-flight invocation table of the router.
+
+    Every forwarded AGENT_INVOKE is recorded with its caller, target replica and deadline.
+    Entries are completed by the matching AGENT_RESPONSE/AGENT_ERROR, or failed when the
+    deadline passes, the target replica disconnects or the caller cancels them.
+
+    Invocations which expired or were cancelled are remembered per replica (at most
+    `max_abandoned` each, until the replica disconnects), so late responses are recognized.
+    """
+
+    def __init__(
+        self,
+        on_expire: Callable[[InFlightInvocation], Awaitable[None]],
+        max_abandoned: int = 1000,
+    ):
+        """
+        Args:
+            on_expire (Callable): Coroutine called with the invocation once its deadline has passed.
+            max_abandoned (int): Maximum number of expired/cancelled invocations remembered per replica.
+        """
+        self.on_expire = on_expire
+        self.max_abandoned = max_abandoned
+        self.invocations: Dict[str, InFlightInvocation] = {}
+        self._abandoned: Dict[str, OrderedDict[str, InFlightInvocation]] = {}
+        self._by_connection: Dict[str, Dict[str, None]] = {}
+        self._by_caller: Dict[str, Dict[str, None]] = {}
+        self._target_counts: Dict[str, int] = {}
+        self._user_counts: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.invocations)
+
+    def in_flight_for_target(self, target_id: str) -> int:
+        return self._target_counts.get(target_id, 0)
+
+    def in_flight_for_user(self, user_id: str) -> int:
+        return self._user_counts.get(user_id, 0)
+
+    def track(
+        self,
+        caller_id: str,
+        target_id: str,
+        connection: AgentConnection,
+        timeout: float,
+        user_id: Optional[str] = None,
+        request_id: Optional[str] = None,
+        caller_connection: Optional[AgentConnection] = None,
+    ) -> InFlightInvocation:
+        """
+        Args:
+            request_id (Optional[str]): ID the invocation was given by the router node
+                which forwarded it, a new one by default.
+            caller_connection (Optional[AgentConnection]): Replica of the caller which sent the
+                invocation, None if the caller is connected to another router node.
+        """
+        loop = asyncio.get_running_loop()
+        invocation = InFlightInvocation(
+            caller_id=caller_id,
+            target_id=target_id,
+            connection=connection,
+            deadline=loop.time() + timeout,
+            user_id=user_id,
+            request_id=request_id,
+            caller_connection=caller_connection,
+        )
+        invocation.timer = loop.call_at(invocation.deadline, self._expire, invocation)
+
+        request_id = invocation.request_id
+        self.invocations[request_id] = invocation
+        self._by_connection.setdefault(connection.connection_id, {})[request_id] = None
+        self._by_caller.setdefault(caller_id, {})[request_id] = None
+        self._target_counts[target_id] = self._target_counts.get(target_id, 0) + 1
+        self._user_counts[invocation.user_id] = (
+            self._user_counts.get(invocation.user_id, 0) + 1
+        )
+        connection.in_flight += 1
+        return invocation
+
+    def complete(
+        self,
+        connection: AgentConnection,
+        caller_id: str,
+        request_id: Optional[str] = None,
+    ) -> Optional[InFlightInvocation]:
+        """
+        Completes the invocation answered by a response received on the replica.
+
+        A response carrying the request ID the invocation was dispatched with completes exactly
+        that invocation. Responses of agents which do not echo it are matched to the oldest
+        invocation of the caller handled by the replica.
+
+        Returns:
+            Optional[InFlightInvocation]: The answered invocation, `abandoned` if it expired or
+                was cancelled before the response arrived; None if no invocation matches.
+        """
+        abandoned = self._abandoned.get(connection.connection_id, {})
+        if request_id:
+            invocation = self.invocations.get(request_id)
+            if invocation and invocation.connection is connection:
+                return self._remove(request_id)
+            return abandoned.pop(request_id, None)
+
+        oldest = next(
+            (
+                self.invocations[request_id]
+                for request_id in self._by_connection.get(connection.connection_id, {})
+                if self.invocations[request_id].caller_id == caller_id
+            ),
+            None,
+        )
+        oldest_abandoned = next(
+            (
+                invocation
+                for invocation in abandoned.values()
+                if invocation.caller_id == caller_id
+            ),
+            None,
+        )
+        if oldest_abandoned and (
+            not oldest or oldest_abandoned.started_at < oldest.started_at
+        ):
+            return abandoned.pop(oldest_abandoned.request_id)
+        return self._remove(oldest.request_id) if oldest else None
+
+    def cancel(
+        self, caller_id: str, target_id: Optional[str] = None
+    ) -> List[InFlightInvocation]:
+        """
+        Removes in-flight invocations of the caller, optionally only those sent to the target.
+        """
+        return [
+            self._abandon(request_id)
+            for request_id in list(self._by_caller.get(caller_id, {}))
+            if target_id is None or self.invocations[request_id].target_id == target_id
+        ]
+
+    def discard(self, invocation: InFlightInvocation) -> None:
+        if invocation.request_id in self.invocations:
+            self._remove(invocation.request_id)
+
+    def fail_connection(self, connection: AgentConnection) -> List[InFlightInvocation]:
+        """
+        Removes all in-flight invocations handled by the replica.
+        """
+        self._abandoned.pop(connection.connection_id, None)
+        return [
+            self._remove(request_id)
+            for request_id in list(
+                self._by_connection.get(connection.connection_id, {})
+            )
+        ]
+
+    def _expire(self, invocation: InFlightInvocation) -> None:
+        if invocation.request_id in self.invocations:
+            self._abandon(invocation.request_id)
+            asyncio.create_task(self.on_expire(invocation))
+
+    def _abandon(self, request_id: str) -> InFlightInvocation:
+        invocation = self._remove(request_id)
+        invocation.abandoned = True
+        abandoned = self._abandoned.setdefault(
+            invocation.connection.connection_id, OrderedDict()
+        )
+        abandoned[request_id] = invocation
+        if len(abandoned) > self.max_abandoned:
+            abandoned.popitem(last=False)
+        return invocation
+
+    def _remove(self, request_id: str) -> InFlightInvocation:
+        invocation = self.invocations.pop(request_id)
+        if invocation.timer:
+            invocation.timer.cancel()
+
+        connection_id = invocation.connection.connection_id
+        self._by_connection[connection_id].pop(request_id, None)
+        if not self._by_connection[connection_id]:
+            del self._by_connection[connection_id]
+
+        self._by_caller[invocation.caller_id].pop(request_id, None)
+        if not self._by_caller[invocation.caller_id]:
+            del self._by_caller[invocation.caller_id]
+
+        for counts, key in (
+            (self._target_counts, invocation.target_id),
+            (self._user_counts, invocation.user_id),
+        ):
+            counts[key] -= 1
+            if not counts[key]:
+                del counts[key]
+
+        if invocation.connection.in_flight > 0:
+            invocation.connection.in_flight -= 1
+        return invocation
+
+
+class ForwardedInvocation:
+    """
+    AGENT_INVOKE forwarded to the router node of its target agent.
+    """
+
+    def __init__(
+        self,
+        request_id: str,
+        caller_id: str,
+        target_id: str,
+        deadline: float,
+        caller_connection: Optional[AgentConnection] = None,
+    ):
+        self.request_id = request_id
+        self.caller_id = caller_id
+        self.target_id = target_id
+        self.caller_connection = caller_connection
+        self.started_at = time.monotonic()
+        self.deadline = deadline
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.abandoned = False
+
+
+class ForwardedInvocations:
+    """
+    Invocations this node forwarded to agents connected to other router nodes (clustered mode).
+
+    The node of the agent tracks them in its InvocationTracker, the origin node keeps the same
+    deadline so callers get an error even if that node goes away without answering. Frames
+    delivered back for an invocation complete it, those arriving after it was failed are dropped.
+    """
+
+    def __init__(
+        self,
+        on_expire: Callable[[ForwardedInvocation], Awaitable[None]],
+        max_abandoned: int = 10000,
+    ):
+        """
+        Args:
+            on_expire (Callable): Coroutine called with the invocation once its deadline has passed.
+            max_abandoned (int): Maximum number of expired/cancelled invocations remembered.
+        """
+        self.on_expire = on_expire
+        self.max_abandoned = max_abandoned
+        self.invocations: Dict[str, ForwardedInvocation] = {}
+        self._by_caller: Dict[str, Dict[str, None]] = {}
+        self._abandoned: OrderedDict[str, ForwardedInvocation] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.invocations)
+
+    def track(
+        self,
+        request_id: str,
+        caller_id: str,
+        target_id: str,
+        timeout: float,
+        caller_connection: Optional[AgentConnection] = None,
+    ) -> ForwardedInvocation:
+        loop = asyncio.get_running_loop()
+        invocation = ForwardedInvocation(
+            request_id=request_id,
+            caller_id=caller_id,
+            target_id=target_id,
+            deadline=loop.time() + timeout,
+            caller_connection=caller_connection,
+        )
+        invocation.timer = loop.call_at(invocation.deadline, self._expire, invocation)
+        self.invocations[request_id] = invocation
+        self._by_caller.setdefault(caller_id, {})[request_id] = None
+        return invocation
+
+    def complete(self, request_id: str) -> Optional[ForwardedInvocation]:
+        """
+        Returns:
+            Optional[ForwardedInvocation]: The answered invocation, `abandoned` if it expired or
+                was cancelled before; None if it was not forwarded by this node.
+        """
+        if request_id in self.invocations:
+            return self._remove(request_id)
+        return self._abandoned.pop(request_id, None)
+
+    def cancel(
+        self, caller_id: str, target_id: Optional[str] = None
+    ) -> List[ForwardedInvocation]:
+        """
+        Fails forwarded invocations of the caller, optionally only those sent to the target.
+        """
+        return [
+            self._abandon(request_id)
+            for request_id in list(self._by_caller.get(caller_id, {}))
+            if target_id is None or self.invocations[request_id].target_id == target_id
+        ]
+
+    def _expire(self, invocation: ForwardedInvocation) -> None:
+        if invocation.request_id in self.invocations:
+            self._abandon(invocation.request_id)
+            asyncio.create_task(self.on_expire(invocation))
+
+    def _abandon(self, request_id: str) -> ForwardedInvocation:
+        invocation = self._remove(request_id)
+        invocation.abandoned = True
+        self._abandoned[request_id] = invocation
+        if len(self._abandoned) > self.max_abandoned:
+            self._abandoned.popitem(last=False)
+        return invocation
+
+    def _remove(self, request_id: str) -> ForwardedInvocation:
+        invocation = self.invocations.pop(request_id)
+        if invocation.timer:
+            invocation.timer.cancel()
+        self._by_caller[invocation.caller_id].pop(request_id, None)
+        if not self._by_caller[invocation.caller_id]:
+            del self._by_caller[invocation.caller_id]
+        return invocation
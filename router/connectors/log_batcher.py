@@ -0,0 +1,72 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class LogBatcher:
+    """
+    Coalesces AGENT_LOG frames into batches which are flushed when `max_size` entries
+    are buffered or `interval` seconds after the first entry of the batch was buffered.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[Dict[str, Any]]], Awaitable[None]],
+        max_size: int,
+        interval: float,
+    ):
+        """
+        Args:
+            flush (Callable): Coroutine sending a batch of log entries.
+            max_size (int): Maximum number of log entries in a batch.
+            interval (float): Maximum number of seconds a log entry waits in the buffer.
+        """
+        self.flush = flush
+        self.max_size = max_size
+        self.interval = interval
+        self.buffer: List[Dict[str, Any]] = []
+        self.batches = 0
+        self.logs = 0
+        self.max_batch_delay = 0.0
+        self._first_buffered_at = 0.0
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def add(self, entry: Dict[str, Any]) -> None:
+        if not self.buffer:
+            self._first_buffered_at = time.monotonic()
+        self.buffer.append(entry)
+
+        if len(self.buffer) >= self.max_size:
+            await self.flush_now()
+        elif not self._flush_task:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.interval)
+        self._flush_task = None
+        await self.flush_now()
+
+    async def flush_now(self) -> None:
+        if self._flush_task and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+            self._flush_task = None
+
+        entries, self.buffer = self.buffer, []
+        if not entries:
+            return
+
+        self.batches += 1
+        self.logs += len(entries)
+        self.max_batch_delay = max(
+            self.max_batch_delay, time.monotonic() - self._first_buffered_at
+        )
+        await self.flush(entries)
+
+    def stats(self) -> Dict[str, int | float]:
+        return {
+            "buffered": len(self.buffer),
+            "batches": self.batches,
+            "logs": self.logs,
+            "avg_batch_size": self.logs / self.batches if self.batches else 0.0,
+            "max_batch_delay_ms": self.max_batch_delay * 1000,
+        }
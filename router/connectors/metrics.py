@@ -0,0 +1,183 @@
+import logging
+import random
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List
+
+from utils.enums import ErrorType, WSMessageType
+
+# invoke -> response latency buckets, in seconds
+LATENCY_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    120,
+    300,
+    600,
+)
+
+# labels are bounded to known values, anything a client makes up is counted as "other"
+OTHER_LABEL = "other"
+MESSAGE_TYPE_LABELS = frozenset(
+    {message_type.value for message_type in WSMessageType} | {"unknown", "invalid"}
+)
+ERROR_TYPE_LABELS = frozenset(
+    {error_type.value for error_type in ErrorType} | {"unknown"}
+)
+
+
+def payload_log_sampled(sample_rate: float) -> bool:
+    """
+    Whether a hot-path payload should be logged. Payloads are only logged at DEBUG level
+    and only for a `sample_rate` fraction of frames, so they are not formatted at all otherwise.
+    """
+    return (
+        sample_rate > 0
+        and logging.getLogger().isEnabledFor(logging.DEBUG)
+        and (sample_rate >= 1 or random.random() < sample_rate)
+    )
+
+
+def bounded_label(value: Any, known: frozenset) -> str:
+    return value if isinstance(value, str) and value in known else OTHER_LABEL
+
+
+def escape_label(value: str) -> str:
+    """
+    Escapes a label value for the Prometheus text format.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LatencyHistogram:
+    """
+    Cumulative histogram with fixed bucket bounds, in the Prometheus layout.
+    """
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last one is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[tuple[str, int]]:
+        total = 0
+        result = []
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class RouterMetrics:
+    """
+    Numeric telemetry of the router: frames and bytes per message type in both directions,
+    invoke -> response latency per agent and errors per ErrorType.
+    Message and error types come from clients, they are mapped onto the known ones.
+    Gauges (connections, queue depths) are read from the connection manager on export.
+    """
+
+    def __init__(self):
+        self.frames_in: Dict[str, int] = {}
+        self.frames_out: Dict[str, int] = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.errors: Dict[str, int] = {}
+        self.latency: Dict[str, LatencyHistogram] = {}
+
+    def frame_in(self, message_type: str, size: int) -> None:
+        message_type = bounded_label(message_type, MESSAGE_TYPE_LABELS)
+        self.frames_in[message_type] = self.frames_in.get(message_type, 0) + 1
+        self.bytes_in += size
+
+    def frame_out(self, message_type: str, size: int) -> None:
+        message_type = bounded_label(message_type, MESSAGE_TYPE_LABELS)
+        self.frames_out[message_type] = self.frames_out.get(message_type, 0) + 1
+        self.bytes_out += size
+
+    def error(self, error_type: str) -> None:
+        error_type = bounded_label(error_type, ERROR_TYPE_LABELS)
+        self.errors[error_type] = self.errors.get(error_type, 0) + 1
+
+    def observe_latency(self, agent_id: str, seconds: float) -> None:
+        histogram = self.latency.get(agent_id)
+        if not histogram:
+            histogram = self.latency[agent_id] = LatencyHistogram()
+        histogram.observe(seconds)
+
+    def to_json(self, gauges: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            **gauges,
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "errors": self.errors,
+            "invoke_latency_seconds": {
+                agent_id: histogram.to_json()
+                for agent_id, histogram in self.latency.items()
+            },
+        }
+
+    def to_prometheus(self, gauges: Dict[str, Any]) -> str:
+        """
+        Renders the metrics in the Prometheus text exposition format.
+
+        Args:
+            gauges (Dict[str, Any]): Flat name -> value gauges, e.g. active connections.
+        """
+        lines = []
+        for name, value in gauges.items():
+            lines += [f"# TYPE router_{name} gauge", f"router_{name} {value}"]
+
+        for direction, frames in (("in", self.frames_in), ("out", self.frames_out)):
+            lines.append(f"# TYPE router_frames_{direction}_total counter")
+            lines += [
+                f'router_frames_{direction}_total{{message_type="{escape_label(message_type)}"}} {count}'
+                for message_type, count in frames.items()
+            ]
+        lines += [
+            "# TYPE router_bytes_in_total counter",
+            f"router_bytes_in_total {self.bytes_in}",
+            "# TYPE router_bytes_out_total counter",
+            f"router_bytes_out_total {self.bytes_out}",
+            "# TYPE router_errors_total counter",
+        ]
+        lines += [
+            f'router_errors_total{{error_type="{escape_label(error_type)}"}} {count}'
+            for error_type, count in self.errors.items()
+        ]
+
+        lines.append("# TYPE router_invoke_latency_seconds histogram")
+        for agent_id, histogram in self.latency.items():
+            agent_id = escape_label(agent_id)
+            lines += [
+                f'router_invoke_latency_seconds_bucket{{agent="{agent_id}",le="{bound}"}} {count}'
+                for bound, count in histogram.cumulative()
+            ]
+            lines += [
+                f'router_invoke_latency_seconds_sum{{agent="{agent_id}"}} {histogram.sum}',
+                f'router_invoke_latency_seconds_count{{agent="{agent_id}"}} {histogram.count}',
+            ]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,53 @@
+import re
+from typing import Dict, Iterable, Set
+
+UUID_PATTERN = re.compile(
+    r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+)
+
+
+class SessionIndex:
+    """
+    Parent -> children index of derived connections.
+
+    Connections opened via `session.send` use an invoke key which embeds the ID of the
+    agent (or master server) that opened them. Instead of scanning every active connection
+    for a substring match on disconnect, children are indexed once on connect under every
+    parent ID embedded in their key: agent UUIDs and master server names.
+    """
+
+    def __init__(self, reserved_parent_ids: Iterable[str] = ()):
+        """
+        Args:
+            reserved_parent_ids (Iterable[str]): Non-UUID client IDs which may be embedded
+                into invoke keys, e.g. master server names.
+        """
+        self.reserved_parent_ids = tuple(reserved_parent_ids)
+        self.children: Dict[str, Set[str]] = {}
+
+    def parent_ids(self, client_id: str) -> Set[str]:
+        """
+        Returns IDs of all potential parents embedded into the client ID (excluding itself).
+        """
+        parents = set(UUID_PATTERN.findall(client_id))
+        parents.update(
+            parent_id
+            for parent_id in self.reserved_parent_ids
+            if parent_id in client_id
+        )
+        parents.discard(client_id)
+        return parents
+
+    def add(self, client_id: str) -> None:
+        for parent_id in self.parent_ids(client_id):
+            self.children.setdefault(parent_id, set()).add(client_id)
+
+    def remove(self, client_id: str) -> None:
+        for parent_id in self.parent_ids(client_id):
+            if siblings := self.children.get(parent_id):
+                siblings.discard(client_id)
+                if not siblings:
+                    del self.children[parent_id]
+
+    def children_of(self, client_id: str) -> Set[str]:
+        return set(self.children.get(client_id, ()))
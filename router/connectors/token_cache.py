@@ -0,0 +1,152 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import jwt
+
+
+class AgentTokenVerifier:
+    """
+    Verifies agent JWTs against the backend secret and keeps a bounded LRU of verified tokens.
+
+    A cached token is accepted without another signature check until it expires, is revoked
+    or is evicted by newer tokens, so reconnect storms only pay for HMAC verification once per token.
+
+    Revocations are kept until the revoked tokens expire: an expired token is rejected anyway,
+    so expired revocations are pruned (at most once per `prune_interval` seconds).
+    """
+
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        max_size: int = 10000,
+        prune_interval: float = 60.0,
+    ):
+        """
+        Args:
+            secret_key (str): Secret the backend signs agent JWTs with.
+            algorithm (str): Signing algorithm of agent JWTs.
+            max_size (int): Maximum number of cached verified tokens.
+            prune_interval (float): Minimum seconds between two prunings of expired revocations.
+        """
+        self.secret_key = secret_key
+        self.algorithm = algorithm
+        self.max_size = max_size
+        self.prune_interval = prune_interval
+        self.cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        # revoked subject/token -> expiry of the revoked token(s), None if they never expire
+        self.revoked_subjects: Dict[str, Optional[float]] = {}
+        self.revoked_tokens: Dict[str, Optional[float]] = {}
+        self._pruned_at = time.time()
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the claims of a valid agent JWT.
+
+        Returns:
+            Optional[Dict[str, Any]]: None if the token is forged, malformed, expired or revoked.
+        """
+        if time.time() - self._pruned_at >= self.prune_interval:
+            self.prune_revocations()
+
+        claims = self.cache.get(token)
+        if claims is not None:
+            if self._is_valid(token, claims):
+                self.cache.move_to_end(token)
+                self.hits += 1
+                return claims
+            del self.cache[token]
+            self.rejected += 1
+            return None
+
+        self.misses += 1
+        try:
+            claims = jwt.decode(token, key=self.secret_key, algorithms=[self.algorithm])
+        except jwt.InvalidTokenError as e:
+            logging.warning(f"Rejected agent JWT: {e}")
+            self.rejected += 1
+            return None
+
+        if not self._is_valid(token, claims):
+            self.rejected += 1
+            return None
+
+        self.cache[token] = claims
+        if len(self.cache) > self.max_size:
+            self.cache.popitem(last=False)
+        return claims
+
+    def _is_valid(self, token: str, claims: Dict[str, Any]) -> bool:
+        if token in self.revoked_tokens or claims.get("sub") in self.revoked_subjects:
+            return False
+        expires_at = claims.get("exp")
+        return expires_at is None or time.time() < expires_at
+
+    def revoke(
+        self,
+        sub: Optional[str] = None,
+        token: Optional[str] = None,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        """
+        Revocation hook: rejects every token of the subject (agent) or a single token from now on.
+
+        Args:
+            sub (Optional[str]): Subject whose tokens are revoked.
+            token (Optional[str]): Single revoked token, kept until its own `exp`.
+            expires_at (Optional[float]): Expiry of the latest token of the subject, defaults to
+                the latest expiry of its cached tokens. Without any, the revocation is kept for good.
+        """
+        if sub:
+            cached = {t: c for t, c in self.cache.items() if c.get("sub") == sub}
+            if expires_at is None and cached:
+                expiries = [c.get("exp") for c in cached.values()]
+                expires_at = None if None in expiries else max(expiries)
+            self.revoked_subjects[sub] = self._latest(
+                self.revoked_subjects.get(sub, expires_at), expires_at
+            )
+            for cached_token in cached:
+                del self.cache[cached_token]
+        if token:
+            self.revoked_tokens[token] = self._token_expiry(token)
+            self.cache.pop(token, None)
+        self.prune_revocations()
+
+    def prune_revocations(self) -> None:
+        """
+        Drops revocations of tokens which have expired since.
+        """
+        now = self._pruned_at = time.time()
+        for revoked in (self.revoked_subjects, self.revoked_tokens):
+            for key in [
+                k
+                for k, expires_at in revoked.items()
+                if expires_at and expires_at <= now
+            ]:
+                del revoked[key]
+
+    @staticmethod
+    def _latest(a: Optional[float], b: Optional[float]) -> Optional[float]:
+        return None if a is None or b is None else max(a, b)
+
+    @staticmethod
+    def _token_expiry(token: str) -> Optional[float]:
+        try:  # only the expiry is read, revoked tokens are rejected whether they verify or not
+            claims = jwt.decode(token, options={"verify_signature": False})
+        except jwt.InvalidTokenError:
+            return None
+        return claims.get("exp")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "token_cache_size": len(self.cache),
+            "token_cache_hits": self.hits,
+            "token_cache_misses": self.misses,
+            "token_rejected": self.rejected,
+            "token_revocations": len(self.revoked_subjects) + len(self.revoked_tokens),
+        }
@@ -1,12 +1,40 @@
+import asyncio
 import json
 import logging
+import random
+import time
 import jwt
 
-from typing import Dict
+from typing import Dict, Optional, Union
+from uuid import uuid4
 
 from fastapi import WebSocket
+from connectors.admission import AdmissionController, AdmissionRejection
+from connectors.cluster import ClusterBackend
+from connectors.connection_pool import AgentConnection, ConnectionPool, LaneStats
+from connectors.hold_queue import HeldInvocation, HoldQueue
+from connectors.invocations import (
+    ForwardedInvocation,
+    ForwardedInvocations,
+    InFlightInvocation,
+    InvocationTracker,
+)
+from connectors.log_batcher import LogBatcher
+from connectors.metrics import RouterMetrics, payload_log_sampled
+from connectors.session_index import SessionIndex
+from connectors.token_cache import AgentTokenVerifier
 from settings import get_settings
-from utils.enums import WSMessageType, MasterServerName, ErrorType
+from utils.enums import (
+    DeliveryStatus,
+    ErrorType,
+    Lane,
+    MasterServerName,
+    OverflowPolicy,
+    WSMessageType,
+)
+from utils.envelope import is_envelope, splice_fields, split_envelope
+from utils.exceptions import OutboundQueueFullException
+from utils.pydantic_models import AdmissionConfig, AdmissionLimit
 
 app_settings = get_settings()
 
@@ -23,28 +51,223 @@ class WSConnectionManager:
         app_settings.MASTER_AGENT_API_KEY: MasterServerName.MASTER_SERVER_ML.value,
     }
 
-    def __init__(self):
+    def __init__(
+        self,
+        cluster: Optional[ClusterBackend] = None,
+        node_id: Optional[str] = None,
+        token_verifier: Optional[AgentTokenVerifier] = None,
+    ):
         """
         Initializes the WebSocket connection manager with an empty active connections dictionary.
+        Every client ID maps to a pool of replica connections.
+
+        Args:
+            cluster (Optional[ClusterBackend]): Registry/bus shared with other router nodes,
+                None runs the router as a single node.
+            node_id (Optional[str]): ID of this router node in the cluster.
+            token_verifier (Optional[AgentTokenVerifier]): Verifies agent JWTs on connect,
+                None trusts the `sub` claim of unverified tokens.
+        """
+        self.active_connections: Dict[str, ConnectionPool] = {}
+        self.cluster = cluster
+        self.node_id = node_id
+        self.token_verifier = token_verifier
+        self.session_index = SessionIndex(
+            reserved_parent_ids=self.MASTER_SERVERS_API_KEY_MAPPING.values()
+        )
+        self.default_overflow_policy = OverflowPolicy(
+            app_settings.OUTBOUND_QUEUE_OVERFLOW_POLICY
+        )
+        self.log_overflow_policy = OverflowPolicy(
+            app_settings.OUTBOUND_LOG_OVERFLOW_POLICY
+        )
+        self.invocations = InvocationTracker(on_expire=self._on_invocation_expired)
+        self.forwarded_invocations = ForwardedInvocations(
+            on_expire=self._on_invocation_expired
+        )
+        self.hold_queue = HoldQueue(
+            grace_period=app_settings.INVOKE_HOLD_SECONDS,
+            max_size=app_settings.INVOKE_HOLD_MAX_SIZE,
+            on_expire=self._on_hold_expired,
+        )
+        self.log_batcher = LogBatcher(
+            flush=self._send_log_batch,
+            max_size=app_settings.LOG_BATCH_MAX_SIZE,
+            interval=app_settings.LOG_BATCH_INTERVAL_SECONDS,
+        )
+        self.metrics = RouterMetrics()
+        self.admission = AdmissionController(
+            AdmissionConfig(
+                agent=AdmissionLimit(
+                    rate=app_settings.ADMISSION_AGENT_RATE,
+                    burst=app_settings.ADMISSION_AGENT_BURST,
+                    max_concurrency=app_settings.ADMISSION_AGENT_MAX_CONCURRENCY,
+                ),
+                user=AdmissionLimit(
+                    rate=app_settings.ADMISSION_USER_RATE,
+                    burst=app_settings.ADMISSION_USER_BURST,
+                    max_concurrency=app_settings.ADMISSION_USER_MAX_CONCURRENCY,
+                ),
+            )
+        )
+        # latency of lanes of already closed connections
+        self.closed_lane_stats: Dict[Lane, LaneStats] = {
+            lane: LaneStats() for lane in Lane
+        }
+
+    async def start(self):
+        """
+        Joins the cluster, if the router runs in clustered mode.
         """
-        self.active_connections: Dict[str, WebSocket] = {}
+        if self.cluster:
+            await self.cluster.start(self.node_id, self.handle_cluster_message)
+            logging.info(f"Router node {self.node_id} joined the cluster")
 
-    async def process_message(
-        self, client_id: str, message: str, agent_jwt: str
-    ) -> None:
+    async def stop(self):
+        if self.cluster:
+            await self.cluster.stop(self.node_id)
+
+    async def handle_cluster_message(self, message: dict):
+        """
+        Handles a message published to this node by another router node.
+
+        Args:
+            message (dict): Cluster message, its `kind` is one of
+                deliver (frame for a local client), invoke (invocation for a local agent), revoke,
+                cancel (invocations cancelled by a remote caller) or gone (client left the cluster).
+        """
+        kind = message.get("kind")
+        if kind == "deliver":
+            invocation_id = message.get("invocation_id")
+            if invocation_id and (
+                forwarded := self.forwarded_invocations.complete(invocation_id)
+            ):
+                if forwarded.abandoned:
+                    return  # the caller has already received a timeout or cancellation
+                caller_connection = forwarded.caller_connection
+            else:
+                caller_connection = None
+            await self._deliver(
+                message["client_id"],
+                message["frame"],
+                policy=(
+                    OverflowPolicy(message["policy"]) if message.get("policy") else None
+                ),
+                lane=Lane(message["lane"]),
+                local_only=True,
+                message_type=message.get("message_type", "unknown"),
+                connection=caller_connection,
+            )
+        elif kind == "invoke":
+            await self.dispatch_invoke(
+                message["client_id"],
+                message["data"],
+                caller_id=message["caller_id"],
+                timeout=message["timeout"],
+                user_id=message.get("user_id"),
+                local_only=True,
+                request_id=message.get("invocation_id"),
+            )
+        elif kind == "cancel":
+            for invocation in self.invocations.cancel(
+                message["caller_id"], message.get("client_id")
+            ):
+                await self._cancel_invocation(invocation)
+        elif kind == "revoke" and self.token_verifier:
+            self.token_verifier.revoke(
+                sub=message.get("sub"),
+                token=message.get("token"),
+                expires_at=message.get("exp"),
+            )
+        elif kind == "gone" and message.get("origin") != self.node_id:
+            await self._on_client_gone(message["client_id"])
+
+    async def _forward_to_node(self, client_id: str, message: dict) -> bool:
+        """
+        Publishes the message to one of the other nodes holding a connection of the client.
+
+        Returns:
+            bool: False if the client is not connected to any other node.
+        """
+        if not self.cluster:
+            return False
+
+        nodes = await self.cluster.locate(client_id)
+        nodes.discard(self.node_id)
+        if not nodes:
+            return False
+
+        await self.cluster.publish(random.choice(sorted(nodes)), message)
+        return True
+
+    async def is_active(self, client_id: str) -> bool:
+        """
+        Whether the client is connected to this node or, in clustered mode, to any node.
+        """
+        if client_id in self.active_connections:
+            return True
+        if self.cluster:
+            return bool(await self.cluster.locate(client_id))
+        return False
+
+    async def process_message(self, connection: AgentConnection, message: str) -> None:
         """
         Processes incoming messages from clients and routes them based on message type.
+        If the outbound queue of the target is full and its overflow policy is ERROR,
+        the sender receives an AGENT_ERROR instead.
 
         Args:
-            client_id (str): The ID of the client sending the message.
+            connection (AgentConnection): The connection (replica) the message was received on.
             message (str): The message content as a JSON string.
         """
         try:
-            data = json.loads(message)
-            logging.debug(f"Received message: {data}")
+            await self._route_message(connection, message)
+        except OutboundQueueFullException as e:
+            logging.warning(str(e))
+            await self._send_to_connection(
+                connection,
+                {
+                    "message_type": WSMessageType.AGENT_ERROR.value,
+                    "error": {
+                        "error_message": str(e),
+                        "error_type": ErrorType.OUTBOUND_QUEUE_FULL.value,
+                    },
+                },
+            )
+
+    async def _route_message(self, connection: AgentConnection, message: str) -> None:
+        """
+        Routes an incoming message based on its message type.
+
+        Args:
+            connection (AgentConnection): The connection (replica) the message was received on.
+            message (str): The message content as a JSON string.
+        """
+        client_id = connection.client_id
+        agent_jwt = connection.agent_jwt
+        try:
+            if is_envelope(message):
+                header, body = split_envelope(message)
+                self.metrics.frame_in(
+                    header.get("message_type", "unknown"), len(message)
+                )
+                if header.get("message_type") in (
+                    WSMessageType.AGENT_RESPONSE.value,
+                    WSMessageType.AGENT_ERROR.value,
+                ):
+                    await self._forward_envelope(connection, header, body)
+                    return
+                data = {**json.loads(body), **header}
+            else:
+                data = json.loads(message)
+                self.metrics.frame_in(data.get("message_type", "unknown"), len(message))
+            if payload_log_sampled(app_settings.PAYLOAD_LOG_SAMPLE_RATE):
+                logging.debug(f"Received message: {data}, from: {client_id}")
         except json.JSONDecodeError:
+            self.metrics.frame_in("invalid", len(message))
             await self.send_message(
                 client_id=client_id,
+                connection=connection,
                 message={
                     "error": {
                         "error_message": "Invalid JSON format",
@@ -80,15 +303,31 @@ class WSConnectionManager:
             ):
                 invoked_by = data.pop("invoked_by", None)
                 data["message_type"] = message_type
-                logging.info(
-                    f"Got response: {data}, from: {client_id}, invoked_by: {invoked_by}"
+                invocation = self._complete_invocation(
+                    connection, invoked_by, data.pop("invocation_id", None)
+                )
+                if invocation and invocation.abandoned:
+                    logging.info(
+                        f"Dropped late {message_type} of {client_id} to invocation "
+                        f"{invocation.request_id}, it has already been answered with an error"
+                    )
+                    return
+                if payload_log_sampled(app_settings.PAYLOAD_LOG_SAMPLE_RATE):
+                    logging.debug(
+                        f"Got response: {data}, from: {client_id}, invoked_by: {invoked_by}"
+                    )
+                await self.send_message(
+                    invoked_by,
+                    data,
+                    invocation_id=invocation.request_id if invocation else None,
+                    connection=invocation.caller_connection if invocation else None,
                 )
-                await self.send_message(invoked_by, data)
 
             elif message_type == WSMessageType.AGENT_INVOKE.value:
                 if not payload and not agent_uuid:
                     await self.send_message(
                         client_id=client_id,
+                        connection=connection,
                         message={
                             "error": {
                                 "error_message": "Missing request payload or agent UUID",
@@ -97,9 +336,27 @@ class WSConnectionManager:
                         },
                     )
 
-                if agent_uuid not in self.active_connections:
+                is_error_reply = client_id.startswith(
+                    app_settings.MASTER_BE_API_KEY
+                ) and "error_message" in (payload or {})
+                timeout = self._invoke_timeout(data)
+                if not await self.is_active(agent_uuid):
+                    if not is_error_reply and self.hold_queue.hold(
+                        caller_id=client_id,
+                        target_id=agent_uuid,
+                        message={**data, "invoked_by": client_id},
+                        timeout=timeout,
+                        user_id=connection.user_id,
+                        caller_connection=connection,
+                    ):
+                        logging.info(
+                            f"{agent_uuid} is briefly disconnected, holding invocation of {client_id}"
+                        )
+                        return
+
                     await self.send_message(
                         client_id=client_id,
+                        connection=connection,
                         message={
                             "message_type": WSMessageType.AGENT_ERROR.value,
                             "error": {
@@ -108,6 +365,7 @@ class WSConnectionManager:
                             },
                         },
                     )
+                    return
 
                 if (
                     agent_uuid == MasterServerName.MASTER_SERVER_ML.value
@@ -115,6 +373,7 @@ class WSConnectionManager:
                 ):
                     await self.send_message(
                         client_id=client_id,
+                        connection=connection,
                         message={
                             "error": {
                                 "error_message": "Agent is NOT active",
@@ -123,32 +382,85 @@ class WSConnectionManager:
                         },
                     )
                 else:
-                    if (
-                        client_id.startswith(app_settings.MASTER_BE_API_KEY)
-                        and "error_message" in payload
-                    ):
+                    if is_error_reply:
                         payload["message_type"] = WSMessageType.AGENT_ERROR.value
                         payload = {"error": payload}
                         await self.send_message(agent_uuid, payload)
+                    elif rejection := self._admit(
+                        agent_uuid, client_id, connection.user_id
+                    ):
+                        await self._send_invoke_error(
+                            client_id,
+                            agent_uuid,
+                            rejection.error_message,
+                            rejection.error_type,
+                            retry_after=rejection.retry_after,
+                            connection=connection,
+                        )
                     else:
                         data["invoked_by"] = client_id
-                        await self.send_message(agent_uuid, data)
+                        await self.dispatch_invoke(
+                            agent_uuid,
+                            data,
+                            caller_id=client_id,
+                            timeout=timeout,
+                            user_id=connection.user_id,
+                            caller_connection=connection,
+                        )
+
+            elif message_type == WSMessageType.AGENT_CANCEL.value:
+                for invocation in self.invocations.cancel(client_id, agent_uuid):
+                    await self._cancel_invocation(invocation)
+                for forwarded in self.forwarded_invocations.cancel(
+                    client_id, agent_uuid
+                ):
+                    await self._send_invocation_error(
+                        forwarded,
+                        error_message="Invocation has been cancelled",
+                        error_type=ErrorType.INVOCATION_CANCELLED,
+                    )
+                for held in self.hold_queue.cancel(client_id, agent_uuid):
+                    await self._send_held_error(
+                        held,
+                        error_message="Invocation has been cancelled",
+                        error_type=ErrorType.INVOCATION_CANCELLED,
+                    )
+
+                if self.cluster:  # invocations handled by agents on other nodes
+                    cancel = {
+                        "kind": "cancel",
+                        "caller_id": client_id,
+                        "client_id": agent_uuid,
+                    }
+                    if agent_uuid:
+                        for node_id in await self.cluster.locate(agent_uuid) - {
+                            self.node_id
+                        }:
+                            await self.cluster.publish(node_id, cancel)
+                    else:
+                        await self.cluster.broadcast(cancel)
 
             elif message_type == WSMessageType.AGENT_LOG.value:
-                await self.send_message(
-                    client_id=MasterServerName.MASTER_SERVER_BE.value,
-                    message={
-                        "request_payload": {
-                            "message_type": message_type,
-                            "agent_uuid": client_id,
-                            **data,
+                if app_settings.LOG_BATCH_INTERVAL_SECONDS > 0:
+                    await self.log_batcher.add({"agent_uuid": client_id, **data})
+                else:
+                    await self.send_message(
+                        client_id=MasterServerName.MASTER_SERVER_BE.value,
+                        message={
+                            "request_payload": {
+                                "message_type": message_type,
+                                "agent_uuid": client_id,
+                                **data,
+                            },
                         },
-                    },
-                )
+                        policy=self.log_overflow_policy,
+                        lane=Lane.LOG,
+                    )
 
             else:
                 await self.send_message(
                     client_id=client_id,
+                    connection=connection,
                     message={
                         "error": {
                             "error_message": f"Unexpected exception: {message}",
@@ -157,61 +469,719 @@ class WSConnectionManager:
                     },
                 )
 
-    async def send_message(self, client_id: str, message: str | dict):
+    def _admit(
+        self, agent_uuid: str, caller_id: str, user_id: Optional[str]
+    ) -> Optional[AdmissionRejection]:
+        """
+        Applies rate limits and concurrency caps of the target agent and the invoking user.
+        Callers without a known user are limited by their own client ID.
         """
-        Sends a message to the specified client if the connection exists.
+        latency = self.metrics.latency.get(agent_uuid)
+        return self.admission.admit(
+            agent_id=agent_uuid,
+            user_id=user_id or caller_id,
+            agent_in_flight=self.invocations.in_flight_for_target(agent_uuid),
+            user_in_flight=self.invocations.in_flight_for_user(user_id or caller_id),
+            # a slot frees up after about one average invocation
+            concurrency_retry_after=latency.sum / latency.count if latency else 1.0,
+        )
+
+    @staticmethod
+    def _invoke_timeout(data: dict) -> float:
+        """
+        Pops the per-invocation timeout of an AGENT_INVOKE frame, defaults to INVOKE_TIMEOUT_SECONDS.
+        """
+        try:
+            return float(
+                data.pop("invoke_timeout", app_settings.INVOKE_TIMEOUT_SECONDS)
+            )
+        except (TypeError, ValueError):
+            return app_settings.INVOKE_TIMEOUT_SECONDS
+
+    async def send_message(
+        self,
+        client_id: str,
+        message: str | dict,
+        policy: Optional[OverflowPolicy] = None,
+        lane: Lane = Lane.PRIORITY,
+        invocation_id: Optional[str] = None,
+        connection: Optional[AgentConnection] = None,
+    ):
+        """
+        Queues a message for the specified client if the connection exists.
+        Replies go to the replica which sent the request they answer,
+        other frames which are not invocations to the primary replica of the pool.
 
         Args:
             client_id (str): The client ID to which the message should be sent.
             message (str | dict): The message content, can be a string or a dictionary.
+            policy (Optional[OverflowPolicy]): Overflow policy, defaults to OUTBOUND_QUEUE_OVERFLOW_POLICY.
+            lane (Lane): Outbound lane, LOG frames are only written once the PRIORITY lane is empty.
+            invocation_id (Optional[str]): Invocation the message answers, completes it on the
+                router node which forwarded it.
+            connection (Optional[AgentConnection]): Replica of the client the message answers,
+                the message is dropped if it has disconnected in the meantime.
+        """
+        message_type = "unknown"
+        if isinstance(message, dict):
+            message_type = self._count_frame(message)
+            message = json.dumps(message)
+        if payload_log_sampled(app_settings.PAYLOAD_LOG_SAMPLE_RATE):
+            logging.debug(f"Sending message: {message}, to: {client_id}")
+        await self._deliver(
+            client_id,
+            message,
+            policy,
+            lane,
+            message_type=message_type,
+            invocation_id=invocation_id,
+            connection=connection,
+        )
+
+    def _count_frame(self, message: dict) -> str:
+        """
+        Resolves the message type of an outgoing frame and counts the error it carries, if any.
+
+        Returns:
+            str: The message type, frames to the Master BE carry it inside `request_payload`.
+        """
+        error = message.get("error")
+        if isinstance(error, dict):
+            self.metrics.error(error.get("error_type") or "unknown")
+
+        if message_type := message.get("message_type"):
+            return message_type
+        request_payload = message.get("request_payload")
+        if isinstance(request_payload, dict) and request_payload.get("message_type"):
+            return request_payload["message_type"]
+        return WSMessageType.AGENT_ERROR.value if error else "unknown"
+
+    async def send_batch(self, targets: list[tuple[str, dict]]) -> list[dict]:
+        """
+        Sends messages to several clients concurrently.
+
+        Args:
+            targets (list[tuple[str, dict]]): (client ID, message) pairs.
+
+        Returns:
+            list[dict]: Delivery status (and error detail) of every target, in the order of `targets`.
+        """
+
+        async def _send(client_id: str, message: dict) -> dict:
+            if not await self.is_active(client_id):
+                return {"client_id": client_id, "status": DeliveryStatus.NOT_ACTIVE}
+            try:
+                await self.send_message(client_id, message)
+            except OutboundQueueFullException as e:
+                return {
+                    "client_id": client_id,
+                    "status": DeliveryStatus.QUEUE_FULL,
+                    "detail": str(e),
+                }
+            return {"client_id": client_id, "status": DeliveryStatus.QUEUED}
+
+        return list(
+            await asyncio.gather(
+                *(_send(client_id, message) for client_id, message in targets)
+            )
+        )
+
+    def select_agents(self, user_id: Optional[str] = None) -> list[str]:
+        """
+        Returns IDs of agents connected to this node, optionally only those of the user.
+        Master servers and connections opened via `session.send` are not agents.
+        """
+        return [
+            client_id
+            for client_id, pool in self.active_connections.items()
+            if pool.primary.agent_jwt
+            and (user_id is None or pool.primary.user_id == user_id)
+        ]
+
+    async def _deliver(
+        self,
+        client_id: str,
+        frame: str,
+        policy: Optional[OverflowPolicy] = None,
+        lane: Lane = Lane.PRIORITY,
+        local_only: bool = False,
+        message_type: str = "unknown",
+        invocation_id: Optional[str] = None,
+        connection: Optional[AgentConnection] = None,
+    ):
+        """
+        Queues an already serialized frame on the given replica of the client, or on its primary
+        replica, without logging it. In clustered mode frames for clients connected to other nodes
+        are forwarded to them.
+        """
+        if pool := self.active_connections.get(client_id):
+            if connection is None:
+                connection = pool.primary
+            elif connection not in pool.connections:
+                # the other replicas did not send the request the frame answers
+                logging.info(
+                    f"Dropped {message_type} for {client_id}: "
+                    f"replica {connection.connection_id} has disconnected"
+                )
+                return
+            self.metrics.frame_out(message_type, len(frame))
+            await connection.send_text(
+                frame, policy=policy or self.default_overflow_policy, lane=lane
+            )
+        elif not local_only and client_id:
+            await self._forward_to_node(
+                client_id,
+                {
+                    "kind": "deliver",
+                    "client_id": client_id,
+                    "frame": frame,
+                    "policy": policy.value if policy else None,
+                    "lane": lane.value,
+                    "message_type": message_type,
+                    "invocation_id": invocation_id,
+                },
+            )
+
+    async def _send_log_batch(self, entries: list[dict]):
+        """
+        Sends coalesced AGENT_LOG entries to the Master BE as a single frame.
+        """
+        await self._deliver(
+            client_id=MasterServerName.MASTER_SERVER_BE.value,
+            frame=json.dumps(
+                {
+                    "request_payload": {
+                        "message_type": WSMessageType.AGENT_LOG.value,
+                        "agent_uuid": "",  # every entry carries its own agent_uuid
+                        "logs": entries,
+                    }
+                }
+            ),
+            policy=self.log_overflow_policy,
+            lane=Lane.LOG,
+            message_type=WSMessageType.AGENT_LOG.value,
+        )
+
+    async def forward_stream_chunk(self, chunk: dict):
         """
-        message = json.dumps(message) if isinstance(message, dict) else message
-        logging.info(f"Sending message: {message}, to: {client_id}")
-        if websocket := self.active_connections.get(client_id):
-            await websocket.send_text(message)
+        Relays a chunk of a response being generated (AGENT_STREAM) to the Master BE,
+        which pushes it to the frontend. Chunks are user facing and use the PRIORITY lane.
 
-    async def connect(self, websocket: WebSocket) -> str:
+        Args:
+            chunk (dict): Stream chunk: agent_uuid, session_id, request_id, seq, delta, reset, final.
+        """
+        await self.send_message(
+            client_id=MasterServerName.MASTER_SERVER_BE.value,
+            message={
+                "request_payload": {
+                    **chunk,
+                    "message_type": WSMessageType.AGENT_STREAM.value,
+                }
+            },
+        )
+
+    async def _forward_envelope(
+        self, connection: AgentConnection, header: dict, body: str
+    ):
+        """
+        Pass-through forwarding of AGENT_RESPONSE/AGENT_ERROR envelope frames.
+        Only the routing header is decoded, the payload is forwarded as is to the invoker
+        with the message type spliced in front of it. The payload is only checked to be
+        a JSON object, the invoker decodes it anyway.
+
+        Args:
+            connection (AgentConnection): The connection (replica) the frame was received on.
+            header (dict): Decoded routing header (message_type, invoked_by, invocation_id).
+            body (str): Serialized JSON payload.
+
+        Raises:
+            json.JSONDecodeError: if the payload is not a JSON object, the invocation is
+                left in flight.
+        """
+        message_type = header["message_type"]
+        invoked_by = header.get("invoked_by")
+        frame = splice_fields(body, {"message_type": message_type})
+        invocation = self._complete_invocation(
+            connection, invoked_by, header.get("invocation_id")
+        )
+        if invocation and invocation.abandoned:
+            logging.info(
+                f"Dropped late {message_type} envelope of {connection.client_id} to invocation "
+                f"{invocation.request_id}, it has already been answered with an error"
+            )
+            return
+
+        logging.debug(
+            f"Got {message_type} envelope ({len(body)} chars), "
+            f"from: {connection.client_id}, invoked_by: {invoked_by}"
+        )
+        await self._deliver(
+            invoked_by,
+            frame,
+            message_type=message_type,
+            invocation_id=invocation.request_id if invocation else None,
+            connection=invocation.caller_connection if invocation else None,
+        )
+
+    async def _send_invoke_error(
+        self,
+        caller_id: str,
+        agent_uuid: str,
+        error_message: str,
+        error_type: ErrorType,
+        retry_after: Optional[float] = None,
+        connection: Optional[AgentConnection] = None,
+    ):
+        """
+        Rejects an invocation with an AGENT_ERROR, sent to the replica of the caller which sent it.
+        """
+        error = {
+            "error_message": error_message,
+            "error_type": error_type.value,
+            "agent_uuid": agent_uuid,
+        }
+        if retry_after is not None:
+            error["retry_after"] = retry_after
+        await self.send_message(
+            client_id=caller_id,
+            message={"message_type": WSMessageType.AGENT_ERROR.value, "error": error},
+            policy=OverflowPolicy.DROP_OLDEST,
+            connection=connection,
+        )
+
+    def _complete_invocation(
+        self,
+        connection: AgentConnection,
+        caller_id: str,
+        request_id: Optional[str] = None,
+    ) -> Optional[InFlightInvocation]:
+        """
+        Completes the in-flight invocation answered on the connection and records its latency.
+
+        Returns:
+            Optional[InFlightInvocation]: The answered invocation, `abandoned` if its caller
+                has already received a timeout or cancellation error.
+        """
+        invocation = self.invocations.complete(
+            connection, caller_id=caller_id, request_id=request_id
+        )
+        if invocation and not invocation.abandoned:
+            self.metrics.observe_latency(
+                invocation.target_id, time.monotonic() - invocation.started_at
+            )
+        return invocation
+
+    async def dispatch_invoke(
+        self,
+        client_id: str,
+        message: dict,
+        caller_id: str,
+        timeout: float,
+        user_id: Optional[str] = None,
+        local_only: bool = False,
+        request_id: Optional[str] = None,
+        caller_connection: Optional[AgentConnection] = None,
+    ):
+        """
+        Sends an invocation to the replica of the client with the fewest in-flight requests
+        and records it in the in-flight invocation table. In clustered mode invocations of
+        agents connected to other nodes are forwarded to (and tracked by) one of those nodes,
+        this node keeps their deadline.
+
+        Args:
+            client_id (str): The client ID of the invoked agent.
+            message (dict): The invocation message.
+            caller_id (str): The client ID of the invoker, responses are routed back to it.
+            timeout (float): Seconds after which the caller receives an InvocationTimeout error.
+            user_id (Optional[str]): The user the invocation is made for, counted by admission control.
+            local_only (bool): Do not forward the invocation to other nodes.
+            request_id (Optional[str]): ID given to the invocation by the node which forwarded it.
+            caller_connection (Optional[AgentConnection]): Replica of the caller which sent the
+                invocation, the response and errors of the invocation are sent to it.
+        """
+        pool = self.active_connections.get(client_id)
+        if not pool:
+            if not local_only:
+                request_id = str(uuid4())
+                if await self._forward_to_node(
+                    client_id,
+                    {
+                        "kind": "invoke",
+                        "client_id": client_id,
+                        "data": message,
+                        "caller_id": caller_id,
+                        "timeout": timeout,
+                        "user_id": user_id,
+                        "invocation_id": request_id,
+                    },
+                ):
+                    self.forwarded_invocations.track(
+                        request_id,
+                        caller_id,
+                        client_id,
+                        timeout,
+                        caller_connection=caller_connection,
+                    )
+            return
+
+        connection = pool.least_loaded()
+        invocation = self.invocations.track(
+            caller_id=caller_id,
+            target_id=client_id,
+            connection=connection,
+            timeout=timeout,
+            user_id=user_id,
+            request_id=request_id,
+            caller_connection=caller_connection,
+        )
+        # agents echo the invocation ID in their response to complete exactly this invocation
+        message = json.dumps({**message, "invocation_id": invocation.request_id})
+        if payload_log_sampled(app_settings.PAYLOAD_LOG_SAMPLE_RATE):
+            logging.debug(
+                f"Dispatching invocation {invocation.request_id}: {message}, to: {client_id} "
+                f"(replica {connection.connection_id}, in flight: {connection.in_flight})"
+            )
+        self.metrics.frame_out(WSMessageType.AGENT_INVOKE.value, len(message))
+        try:
+            await connection.send_text(message, policy=self.default_overflow_policy)
+        except OutboundQueueFullException:
+            self.invocations.discard(invocation)
+            raise
+
+    async def _send_to_connection(self, connection: AgentConnection, message: dict):
+        """
+        Queues a control frame (cancellation, queue overflow error) on a specific replica.
+        Such frames never block the router: the oldest queued frame is dropped if needed.
+        """
+        frame = json.dumps(message)
+        self.metrics.frame_out(self._count_frame(message), len(frame))
+        await connection.send_text(frame, policy=OverflowPolicy.DROP_OLDEST)
+
+    async def _send_invocation_error(
+        self,
+        invocation: Union[InFlightInvocation, ForwardedInvocation],
+        error_message: str,
+        error_type: ErrorType,
+    ):
+        await self.send_message(
+            client_id=invocation.caller_id,
+            message={
+                "message_type": WSMessageType.AGENT_ERROR.value,
+                "error": {
+                    "error_message": error_message,
+                    "error_type": error_type.value,
+                    "agent_uuid": invocation.target_id,
+                },
+            },
+            policy=OverflowPolicy.DROP_OLDEST,
+            invocation_id=invocation.request_id,
+            connection=invocation.caller_connection,
+        )
+
+    async def _on_invocation_expired(
+        self, invocation: Union[InFlightInvocation, ForwardedInvocation]
+    ):
+        logging.warning(
+            f"Invocation {invocation.request_id} of {invocation.target_id} "
+            f"by {invocation.caller_id} timed out"
+        )
+        await self._send_invocation_error(
+            invocation,
+            error_message="Agent did not respond before the deadline",
+            error_type=ErrorType.INVOCATION_TIMEOUT,
+        )
+
+    async def _send_held_error(
+        self, held: HeldInvocation, error_message: str, error_type: ErrorType
+    ):
+        await self.send_message(
+            client_id=held.caller_id,
+            message={
+                "message_type": WSMessageType.AGENT_ERROR.value,
+                "error": {
+                    "error_message": error_message,
+                    "error_type": error_type.value,
+                    "agent_uuid": held.target_id,
+                },
+            },
+            policy=OverflowPolicy.DROP_OLDEST,
+            connection=held.caller_connection,
+        )
+
+    async def _on_hold_expired(self, client_id: str, held: list[HeldInvocation]):
+        """
+        Fails invocations held for an agent which did not reconnect within the grace period.
+        In clustered mode the agent may have reconnected to another node, they are forwarded there.
+        """
+        if self.cluster and await self.is_active(client_id):
+            await self._release_held(held)
+            return
+
+        logging.warning(
+            f"{client_id} did not reconnect in time, {len(held)} held invocations expired"
+        )
+        for item in held:
+            await self._send_held_error(
+                item,
+                error_message="Agent is NOT active",
+                error_type=ErrorType.AGENT_NOT_ACTIVE,
+            )
+
+    async def _release_held(self, held: list[HeldInvocation]):
+        """
+        Dispatches held invocations in the order they were received,
+        they are subject to admission control like invocations of connected agents.
+        """
+        for item in held:
+            if rejection := self._admit(item.target_id, item.caller_id, item.user_id):
+                await self._send_invoke_error(
+                    item.caller_id,
+                    item.target_id,
+                    rejection.error_message,
+                    rejection.error_type,
+                    retry_after=rejection.retry_after,
+                    connection=item.caller_connection,
+                )
+                continue
+            await self.dispatch_invoke(
+                item.target_id,
+                item.message,
+                caller_id=item.caller_id,
+                timeout=item.remaining_timeout(),
+                user_id=item.user_id,
+                caller_connection=item.caller_connection,
+            )
+
+    async def _cancel_invocation(self, invocation: InFlightInvocation):
+        """
+        Unblocks the caller of an invocation it cancelled with an InvocationCancelled error.
+        The invocation is only dropped on the router side: agents run their handler for any
+        frame they receive, so the target replica is not notified and its late response is dropped.
+        """
+        logging.info(
+            f"Invocation {invocation.request_id} of {invocation.target_id} "
+            f"cancelled by {invocation.caller_id}"
+        )
+        await self._send_invocation_error(
+            invocation,
+            error_message="Invocation has been cancelled",
+            error_type=ErrorType.INVOCATION_CANCELLED,
+        )
+
+    def lane_stats(self) -> Dict[str, dict]:
+        """
+        Returns per-lane queueing latency over all connections and log batching counters.
+        """
+        totals = {lane: LaneStats() for lane in Lane}
+        for lane, stats in self.closed_lane_stats.items():
+            totals[lane].merge(stats)
+        for pool in self.active_connections.values():
+            for connection in pool.connections:
+                for lane, stats in connection.lane_stats.items():
+                    totals[lane].merge(stats)
+
+        return {
+            "lanes": {lane.value: stats.to_json() for lane, stats in totals.items()},
+            "log_batches": self.log_batcher.stats(),
+        }
+
+    def metrics_gauges(self) -> Dict[str, int]:
+        """
+        Returns point-in-time gauges of the router: connections, in-flight invocations, queue depths.
+        """
+        connections = [
+            connection
+            for pool in self.active_connections.values()
+            for connection in pool.connections
+        ]
+        gauges = {
+            "active_clients": len(self.active_connections),
+            "active_connections": len(connections),
+            "invocations_in_flight": len(self.invocations),
+            "invocations_forwarded": len(self.forwarded_invocations),
+            "invocations_held": len(self.hold_queue),
+            **(self.token_verifier.stats() if self.token_verifier else {}),
+            "log_batch_buffered": len(self.log_batcher.buffer),
+            "outbound_queue_depth_max": max(
+                (connection.depth for connection in connections), default=0
+            ),
+        }
+        for lane in Lane:
+            gauges[f"outbound_queue_depth_{lane.value}"] = sum(
+                connection.lanes[lane].qsize() for connection in connections
+            )
+        return gauges
+
+    def queue_stats(self) -> Dict[str, list]:
+        """
+        Returns outbound queue counters of every connection, grouped by client ID.
+        """
+        return {
+            client_id: [connection.stats() for connection in pool.connections]
+            for client_id, pool in self.active_connections.items()
+        }
+
+    async def connect(self, websocket: WebSocket) -> Optional[AgentConnection]:
         """
         Accepts a new WebSocket connection and assigns a client ID based on headers.
+        Connections sharing a client ID are added to the same replica pool.
 
         Args:
             websocket (WebSocket): The WebSocket connection instance.
 
         Returns:
-            str: The resolved client ID.
+            Optional[AgentConnection]: The registered connection, None if no client ID could be resolved.
         """
         client_id = None
         agent_jwt = None
+        user_id = None
 
         if api_key := websocket.headers.get("api-key"):
             client_id = self.MASTER_SERVERS_API_KEY_MAPPING.get(api_key)
 
         elif agent_jwt := websocket.headers.get("x-custom-authorization"):
-            try:
-                decoded = jwt.decode(
-                    agent_jwt, options={"verify_signature": False}, algorithms=["HS256"]
-                )
-                client_id = decoded.get("sub")
-            except jwt.DecodeError:
-                client_id = agent_jwt
+            if self.token_verifier:
+                # forged, expired or revoked tokens leave the client ID unresolved
+                claims = self.token_verifier.verify(agent_jwt) or {}
+                client_id = claims.get("sub")
+                user_id = claims.get("user_id")
+            else:
+                try:
+                    decoded = jwt.decode(
+                        agent_jwt,
+                        options={"verify_signature": False},
+                        algorithms=["HS256"],
+                    )
+                    client_id = decoded.get("sub")
+                    user_id = decoded.get("user_id")
+                except jwt.DecodeError:
+                    client_id = agent_jwt
         elif invoke_key := websocket.headers.get("x-custom-invoke-key"):
-            client_id = invoke_key
+            if await self._is_authenticated_client(invoke_key):
+                logging.warning(
+                    f"Rejected invoke key {invoke_key}: it is the ID of an authenticated client"
+                )
+            else:
+                client_id = invoke_key
+                user_id = self._parent_user_id(invoke_key)
 
         await websocket.accept()
-        self.active_connections[client_id] = websocket
-        return client_id, agent_jwt
+        if not client_id:
+            return None
 
-    async def disconnect(self, client_id: str):
+        connection = AgentConnection(
+            client_id=client_id,
+            websocket=websocket,
+            agent_jwt=agent_jwt,
+            max_queue_size=app_settings.OUTBOUND_QUEUE_MAX_SIZE,
+            user_id=user_id,
+        )
+        connection.start()
+        pool = self.active_connections.get(client_id)
+        if not pool:
+            pool = self.active_connections[client_id] = ConnectionPool(client_id)
+            self.session_index.add(client_id)
+            if self.cluster:
+                await self.cluster.register(client_id, self.node_id)
+        pool.add(connection)
+        logging.info(f"Client {client_id} connected, replicas: {len(pool)}")
+
+        if held := self.hold_queue.release(client_id):
+            logging.info(
+                f"{client_id} reconnected, releasing {len(held)} held invocations"
+            )
+            await self._release_held(held)
+        return connection
+
+    async def revoke_token(
+        self,
+        sub: Optional[str] = None,
+        token: Optional[str] = None,
+        exp: Optional[float] = None,
+    ):
+        """
+        Revokes every JWT of an agent or a single JWT on all router nodes,
+        connections already established are not affected.
+        """
+        if self.cluster:
+            await self.cluster.broadcast(
+                {"kind": "revoke", "sub": sub, "token": token, "exp": exp}
+            )
+        elif self.token_verifier:
+            self.token_verifier.revoke(sub=sub, token=token, expires_at=exp)
+
+    async def _is_authenticated_client(self, client_id: str) -> bool:
         """
-        Disconnects a client and notifies relevant parties about the unregistration.
+        Whether the ID belongs to a master server or to an agent connected with a JWT.
+        Invoke keys are not authenticated, they must not join the replica pool of such a client.
+        """
+        if client_id in self.MASTER_SERVERS_API_KEY_MAPPING.values():
+            return True
+        if pool := self.active_connections.get(client_id):
+            return pool.primary.agent_jwt is not None
+        # on other nodes the pool may only be known from the shared registry
+        return self.cluster is not None and bool(await self.cluster.locate(client_id))
+
+    def _parent_user_id(self, client_id: str) -> Optional[str]:
+        """
+        Connections opened via `session.send` act for the user of the agent that opened them.
+        """
+        for parent_id in self.session_index.parent_ids(client_id):
+            pool = self.active_connections.get(parent_id)
+            if pool and pool.primary.user_id:
+                return pool.primary.user_id
+        return None
+
+    async def disconnect(self, connection: AgentConnection):
+        """
+        Disconnects a replica and, once the last replica of the client is gone,
+        notifies relevant parties about the unregistration.
 
         Args:
-            client_id (str): The ID of the client to disconnect.
+            connection (AgentConnection): The connection to remove.
         """
-        if client_id not in self.active_connections:
+        client_id = connection.client_id
+        pool = self.active_connections.get(client_id)
+        if not pool:
+            return
+
+        was_primary = pool.primary is connection
+        pool.remove(connection)
+        await connection.close()
+        for lane, stats in connection.lane_stats.items():
+            self.closed_lane_stats[lane].merge(stats)
+
+        for invocation in self.invocations.fail_connection(connection):
+            await self._send_invocation_error(
+                invocation,
+                error_message="Agent disconnected before responding",
+                error_type=ErrorType.AGENT_DISCONNECTED,
+            )
+
+        if pool:
+            logging.info(
+                f"Replica of {client_id} disconnected, replicas left: {len(pool)}"
+            )
+            if was_primary:
+                logging.info(
+                    f"Replica {pool.primary.connection_id} is now the primary of {client_id}"
+                )
             return
 
         del self.active_connections[client_id]
+        self.session_index.remove(client_id)
+
+        if self.cluster:
+            await self.cluster.unregister(client_id, self.node_id)
+            if await self.cluster.locate(client_id):
+                logging.info(f"{client_id} is still connected to other router nodes")
+                return
+            await self.cluster.broadcast(
+                {"kind": "gone", "client_id": client_id, "origin": self.node_id}
+            )
+
+        if client_id not in self.MASTER_SERVERS_API_KEY_MAPPING.values():
+            self.hold_queue.mark_gone(client_id)
 
         if not client_id.startswith(
             app_settings.MASTER_BE_API_KEY
@@ -226,17 +1196,30 @@ class WSConnectionManager:
                 },
             )
 
-        for connection_id in (
-            self.active_connections
+        await self._on_client_gone(client_id)
+
+    async def _on_client_gone(self, client_id: str):
+        """
+        Cleans up after a client which has no connections left (on any node).
+
+        Args:
+            client_id (str): The ID of the client which is gone.
+        """
+        self.hold_queue.cancel(client_id)  # nobody awaits them anymore
+        self.forwarded_invocations.cancel(client_id)
+        # late responses of the targets are dropped, agents are not sent any cancel frame
+        self.invocations.cancel(client_id)
+
+        for connection_id in self.session_index.children_of(
+            client_id
         ):  # Clean up all connections created via session.send
-            if client_id in connection_id:
-                await self.send_message(
-                    client_id=connection_id,
-                    message={
-                        "message_type": WSMessageType.AGENT_ERROR.value,
-                        "error": {
-                            "error_message": "Agent has been unregistered",
-                            "agent_uuid": client_id,
-                        },
+            await self.send_message(
+                client_id=connection_id,
+                message={
+                    "message_type": WSMessageType.AGENT_ERROR.value,
+                    "error": {
+                        "error_message": "Agent has been unregistered",
+                        "agent_uuid": client_id,
                     },
-                )
+                },
+            )
@@ -1,8 +1,56 @@
+from contextlib import asynccontextmanager
+
 import uvicorn
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import Depends, FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
 
+from connectors.cluster import create_cluster_backend
+from connectors.token_cache import AgentTokenVerifier
 from connectors.ws_connector_manager import WSConnectionManager
-from utils.pydantic_models import Message, MessageResponse
+from settings import get_settings
+from utils.auth import require_master_server
+from utils.exceptions import OutboundQueueFullException
+from utils.pydantic_models import (
+    AdmissionConfig,
+    BatchMessage,
+    BatchMessageResponse,
+    Message,
+    MessageResponse,
+    StreamChunkBatch,
+    TokenRevocation,
+)
+
+app_settings = get_settings()
+
+# Manages WebSocket connections and routes messages
+ws_connection_manager = WSConnectionManager(
+    cluster=create_cluster_backend(
+        app_settings.CLUSTER_BACKEND,
+        redis_url=app_settings.CLUSTER_REDIS_URL,
+        node_ttl=app_settings.CLUSTER_NODE_TTL_SECONDS,
+    ),
+    node_id=app_settings.CLUSTER_NODE_ID,
+    token_verifier=(
+        AgentTokenVerifier(
+            secret_key=app_settings.SECRET_KEY,
+            algorithm=app_settings.HASH_ALGORITHM,
+            max_size=app_settings.AGENT_JWT_CACHE_SIZE,
+        )
+        if app_settings.AGENT_JWT_VERIFY
+        else None
+    ),
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Joins the router cluster on startup (in clustered mode) and leaves it on shutdown.
+    """
+    await ws_connection_manager.start()
+    yield
+    await ws_connection_manager.stop()
+
 
 app = FastAPI(
     title="Agent WebSocket API",
@@ -10,11 +58,9 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
-# Manages WebSocket connections and routes messages
-ws_connection_manager = WSConnectionManager()
-
 
 @app.websocket(path="/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -27,22 +73,22 @@ async def websocket_endpoint(websocket: WebSocket):
     Args:
         websocket (WebSocket): The incoming WebSocket connection.
     """
-    client_id, agent_jwt = await ws_connection_manager.connect(websocket)
+    connection = await ws_connection_manager.connect(websocket)
 
-    if not client_id:
+    if not connection:
         # Reject connection if no valid authorization header
-        await websocket.close(code=4000, reason="Missing Authorization header")
+        await websocket.close(
+            code=4000, reason="Missing or invalid Authorization header"
+        )
     else:
         try:
             # Continuously listen for messages
             while True:
                 data = await websocket.receive_text()
-                await ws_connection_manager.process_message(
-                    client_id, data, agent_jwt=agent_jwt
-                )
+                await ws_connection_manager.process_message(connection, data)
         except WebSocketDisconnect:
-            # Handle client disconnection
-            await ws_connection_manager.disconnect(client_id)
+            # Handle client (replica) disconnection
+            await ws_connection_manager.disconnect(connection)
 
 
 @app.post(
@@ -51,10 +97,103 @@ async def websocket_endpoint(websocket: WebSocket):
     summary="Send message to a connected agent",
 )
 async def invoke_agent(message: Message) -> MessageResponse:
-    await ws_connection_manager.send_message(message.client_id, message.message)
+    try:
+        await ws_connection_manager.send_message(message.client_id, message.message)
+    except OutboundQueueFullException as e:
+        raise HTTPException(status_code=503, detail=str(e))
     return MessageResponse(detail=f"Message sent to client {message.client_id}")
 
 
+@app.post(
+    path="/invoke-agent/batch",
+    response_model=BatchMessageResponse,
+    summary="Send messages to several connected agents at once",
+    dependencies=[Depends(require_master_server)],
+)
+async def invoke_agents_batch(batch: BatchMessage) -> BatchMessageResponse:
+    targets = [(message.client_id, message.message) for message in batch.messages]
+    if batch.selector:
+        targets += [
+            (client_id, batch.message)
+            for client_id in ws_connection_manager.select_agents(
+                user_id=batch.selector.user_id
+            )
+        ]
+    results = await ws_connection_manager.send_batch(targets)
+    return BatchMessageResponse(results=results)
+
+
+@app.post(
+    path="/stream",
+    response_model=MessageResponse,
+    summary="Relay chunks of streamed responses to the Master BE",
+    dependencies=[Depends(require_master_server)],
+)
+async def stream_response_chunks(batch: StreamChunkBatch) -> MessageResponse:
+    try:
+        for chunk in batch.chunks:
+            await ws_connection_manager.forward_stream_chunk(chunk.model_dump())
+    except OutboundQueueFullException as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return MessageResponse(detail=f"Stream chunks sent: {len(batch.chunks)}")
+
+
+@app.post(
+    path="/tokens/revoke",
+    summary="Reject agent JWTs on future handshakes",
+    dependencies=[Depends(require_master_server)],
+)
+async def revoke_token(revocation: TokenRevocation) -> MessageResponse:
+    if not revocation.sub and not revocation.token:
+        raise HTTPException(
+            status_code=422, detail="Either `sub` or `token` is required"
+        )
+    await ws_connection_manager.revoke_token(
+        sub=revocation.sub, token=revocation.token, exp=revocation.exp
+    )
+    return MessageResponse(detail="Token revoked")
+
+
+@app.get(path="/queues", summary="Outbound queue counters of every connection")
+async def get_queue_stats() -> dict:
+    return ws_connection_manager.queue_stats()
+
+
+@app.get(path="/lanes", summary="Latency of outbound priority lanes and log batching")
+async def get_lane_stats() -> dict:
+    return ws_connection_manager.lane_stats()
+
+
+@app.get(path="/admission", summary="Rate limits and concurrency caps of invocations")
+async def get_admission_config() -> AdmissionConfig:
+    return ws_connection_manager.admission.config
+
+
+@app.put(
+    path="/admission",
+    summary="Replace rate limits and concurrency caps at runtime",
+    dependencies=[Depends(require_master_server)],
+)
+async def update_admission_config(config: AdmissionConfig) -> AdmissionConfig:
+    ws_connection_manager.admission.configure(config)
+    return config
+
+
+@app.get(
+    path="/metrics",
+    summary="Router metrics in the Prometheus text format, or as JSON with ?format=json",
+    response_model=None,
+)
+async def get_metrics(format: str = "prometheus") -> PlainTextResponse | dict:
+    gauges = ws_connection_manager.metrics_gauges()
+    if format == "json":
+        return ws_connection_manager.metrics.to_json(gauges)
+    return PlainTextResponse(
+        ws_connection_manager.metrics.to_prometheus(gauges),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 if __name__ == "__main__":
     # Run the FastAPI app using Uvicorn on port 8080 with auto-reload
     uvicorn.run("main:app", port=8080, reload=True)
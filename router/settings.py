@@ -1,3 +1,4 @@
+import socket
 from functools import lru_cache
 
 from pydantic import Field
@@ -19,6 +20,98 @@ class Settings(BaseSettings):
         default="7a3fd399-3e48-46a0-ab7c-0eaf38020283::master_server_be",
         alias="MASTER_BE_API_KEY",
     )
+    AGENT_JWT_VERIFY: bool = Field(
+        default=True,  # verify agent JWTs against SECRET_KEY, unverified `sub` claims are trusted otherwise
+        alias="AGENT_JWT_VERIFY",
+    )
+    SECRET_KEY: str = Field(
+        default="c41302ce0f1758f4ae5dcc65729fd50a",  # must match the backend secret
+        alias="SECRET_KEY",
+    )
+    HASH_ALGORITHM: str = Field(
+        default="HS256",
+        alias="HASH_ALGORITHM",
+    )
+    AGENT_JWT_CACHE_SIZE: int = Field(
+        default=10000,  # verified agent JWTs kept in the LRU cache
+        alias="AGENT_JWT_CACHE_SIZE",
+    )
+    OUTBOUND_QUEUE_MAX_SIZE: int = Field(
+        default=1000,
+        alias="OUTBOUND_QUEUE_MAX_SIZE",
+    )
+    OUTBOUND_QUEUE_OVERFLOW_POLICY: str = Field(
+        default="block",  # one of: block, drop_oldest, error
+        alias="OUTBOUND_QUEUE_OVERFLOW_POLICY",
+    )
+    OUTBOUND_LOG_OVERFLOW_POLICY: str = Field(
+        default="drop_oldest",  # one of: block, drop_oldest, error
+        alias="OUTBOUND_LOG_OVERFLOW_POLICY",
+    )
+    LOG_BATCH_MAX_SIZE: int = Field(
+        default=100,
+        alias="LOG_BATCH_MAX_SIZE",
+    )
+    LOG_BATCH_INTERVAL_SECONDS: float = Field(
+        default=0.5,  # 0 disables batching, every log is forwarded on its own
+        alias="LOG_BATCH_INTERVAL_SECONDS",
+    )
+    INVOKE_TIMEOUT_SECONDS: float = Field(
+        default=600,
+        alias="INVOKE_TIMEOUT_SECONDS",
+    )
+    INVOKE_HOLD_SECONDS: float = Field(
+        default=0,  # invocations to agents gone for less than this are held, 0 disables holding
+        alias="INVOKE_HOLD_SECONDS",
+    )
+    INVOKE_HOLD_MAX_SIZE: int = Field(
+        default=100,  # held invocations per agent
+        alias="INVOKE_HOLD_MAX_SIZE",
+    )
+    ADMISSION_AGENT_RATE: float = Field(
+        default=0,  # invocations per second per target agent, 0 is unlimited
+        alias="ADMISSION_AGENT_RATE",
+    )
+    ADMISSION_AGENT_BURST: int = Field(
+        default=0,  # 0 defaults to the rate
+        alias="ADMISSION_AGENT_BURST",
+    )
+    ADMISSION_AGENT_MAX_CONCURRENCY: int = Field(
+        default=0,  # in-flight invocations per target agent, 0 is unlimited
+        alias="ADMISSION_AGENT_MAX_CONCURRENCY",
+    )
+    ADMISSION_USER_RATE: float = Field(
+        default=0,  # invocations per second per invoking user, 0 is unlimited
+        alias="ADMISSION_USER_RATE",
+    )
+    ADMISSION_USER_BURST: int = Field(
+        default=0,  # 0 defaults to the rate
+        alias="ADMISSION_USER_BURST",
+    )
+    ADMISSION_USER_MAX_CONCURRENCY: int = Field(
+        default=0,  # in-flight invocations per invoking user, 0 is unlimited
+        alias="ADMISSION_USER_MAX_CONCURRENCY",
+    )
+    CLUSTER_BACKEND: str = Field(
+        default="",  # empty: single node, "memory": in-process stand-in, "redis"
+        alias="CLUSTER_BACKEND",
+    )
+    CLUSTER_NODE_ID: str = Field(
+        default_factory=socket.gethostname,
+        alias="CLUSTER_NODE_ID",
+    )
+    CLUSTER_REDIS_URL: str = Field(
+        default="redis://genai-redis:6379/1",
+        alias="CLUSTER_REDIS_URL",
+    )
+    CLUSTER_NODE_TTL_SECONDS: float = Field(
+        default=15,  # registrations of a node without heartbeat for that long are ignored
+        alias="CLUSTER_NODE_TTL_SECONDS",
+    )
+    PAYLOAD_LOG_SAMPLE_RATE: float = Field(
+        default=0.0,  # fraction of payloads logged at DEBUG level, 0 disables payload logging
+        alias="PAYLOAD_LOG_SAMPLE_RATE",
+    )
 
 
 @lru_cache
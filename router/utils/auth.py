@@ -0,0 +1,22 @@
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException
+
+from settings import get_settings
+
+app_settings = get_settings()
+
+
+def require_master_server(
+    api_key: Optional[str] = Header(default=None, alias="api-key"),
+) -> None:
+    """
+    Guards the HTTP endpoints which change the state of the router: callers must send the API key
+    of a master server in the same `api-key` header master servers connect to /ws with.
+    """
+    if not api_key or not any(
+        hmac.compare_digest(api_key, key)
+        for key in (app_settings.MASTER_BE_API_KEY, app_settings.MASTER_AGENT_API_KEY)
+    ):
+        raise HTTPException(status_code=401, detail="Missing or invalid api-key header")
@@ -8,6 +8,8 @@ class WSMessageType(Enum):
     AGENT_RESPONSE = "agent_response"
     AGENT_ERROR = "agent_error"
     AGENT_LOG = "agent_log"
+    AGENT_CANCEL = "agent_cancel"
+    AGENT_STREAM = "agent_stream"
     ML_INVOKE = "ml_invoke"
 
 
@@ -22,3 +24,30 @@ class ErrorType(Enum):
     AGENT_NOT_ACTIVE = "AgentNotActive"
     INVALID_JSON_REQUEST_FORMAT = "InvalidJSONRequestFormat"
     NO_REQUEST_PAYLOAD = "NoRequestPayload"
+    OUTBOUND_QUEUE_FULL = "OutboundQueueFull"
+    AGENT_DISCONNECTED = "AgentDisconnected"
+    INVOCATION_TIMEOUT = "InvocationTimeout"
+    INVOCATION_CANCELLED = "InvocationCancelled"
+    RATE_LIMITED = "RateLimited"
+    CONCURRENCY_LIMITED = "ConcurrencyLimited"
+
+
+class DeliveryStatus(Enum):
+    QUEUED = "queued"
+    NOT_ACTIVE = "not_active"
+    QUEUE_FULL = "queue_full"
+
+
+class OverflowPolicy(Enum):
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    ERROR = "error"
+
+
+class Lane(Enum):
+    """
+    Outbound lanes in the order they are drained by connection writers.
+    """
+
+    PRIORITY = "priority"
+    LOG = "log"
@@ -0,0 +1,57 @@
+"""
+Routing envelope frames.
+
+An envelope frame carries a small routing header in front of an opaque JSON payload:
+
+    \x1e{"message_type": "agent_response", "invoked_by": "..."}\n{...payload...}
+
+The leading ASCII record separator (as in RFC 7464 JSON text sequences) never starts
+a plain JSON frame, so both formats can share the same socket. The router only decodes
+the header line and forwards the payload without running json.loads/json.dumps over it.
+"""
+
+import json
+from typing import Any
+
+ENVELOPE_MARKER = "\x1e"
+HEADER_SEPARATOR = "\n"
+
+
+def is_envelope(frame: str) -> bool:
+    return frame[:1] == ENVELOPE_MARKER
+
+
+def split_envelope(frame: str) -> tuple[dict[str, Any], str]:
+    """
+    Splits an envelope frame into its decoded header and the raw payload.
+
+    Raises:
+        json.JSONDecodeError: if the header is not a valid JSON object.
+    """
+    header, _, body = frame[1:].partition(HEADER_SEPARATOR)
+    decoded = json.loads(header)
+    if not isinstance(decoded, dict):
+        raise json.JSONDecodeError("Envelope header must be a JSON object", header, 0)
+    return decoded, body
+
+
+def build_envelope(header: dict[str, Any], body: str) -> str:
+    return f"{ENVELOPE_MARKER}{json.dumps(header)}{HEADER_SEPARATOR}{body}"
+
+
+def splice_fields(body: str, fields: dict[str, Any]) -> str:
+    """
+    Prepends top-level fields to a serialized JSON object without decoding it,
+    producing a plain JSON frame the existing consumers understand.
+
+    Raises:
+        json.JSONDecodeError: if the payload is not a JSON object.
+    """
+    if body[:1] != "{":
+        raise json.JSONDecodeError("Envelope payload must be a JSON object", body, 0)
+
+    prefix = json.dumps(fields)[:-1]
+    rest = body[1:]
+    if rest.lstrip()[:1] == "}":  # empty payload object
+        return f"{prefix}}}"
+    return f"{prefix}, {rest}"
@@ -0,0 +1,2 @@
+class OutboundQueueFullException(Exception):
+    pass
@@ -1,4 +1,8 @@
-from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field, model_validator
+
+from utils.enums import DeliveryStatus, MasterServerName
 
 
 class Message(BaseModel):
@@ -8,3 +12,87 @@ class Message(BaseModel):
 
 class MessageResponse(BaseModel):
     detail: str
+
+
+class StreamChunk(BaseModel):
+    agent_uuid: str = MasterServerName.MASTER_SERVER_ML.value
+    session_id: str
+    request_id: str
+    seq: int = Field(
+        ge=0, description="Position of the chunk in the stream of the request"
+    )
+    delta: str = Field(
+        default="", description="Text generated since the previous chunk"
+    )
+    reset: bool = Field(
+        default=False,
+        description="Discard the text streamed so far, the generation turned into tool calls",
+    )
+    final: bool = Field(
+        default=False, description="Last chunk of the stream, the response follows"
+    )
+
+
+class StreamChunkBatch(BaseModel):
+    chunks: list[StreamChunk] = Field(
+        description="Pending chunks of the streams of the Master Agent, in order"
+    )
+
+
+class TokenRevocation(BaseModel):
+    sub: Optional[str] = Field(
+        default=None, description="Revoke every JWT of the agent"
+    )
+    token: Optional[str] = Field(default=None, description="Revoke a single JWT")
+    exp: Optional[float] = Field(
+        default=None,
+        description="Expiry (unix time) of the latest JWT of the agent, a `sub` revocation is kept until then",
+    )
+
+
+class AgentSelector(BaseModel):
+    user_id: Optional[str] = Field(
+        default=None,
+        description="Only agents of the user, all connected agents if omitted",
+    )
+
+
+class BatchMessage(BaseModel):
+    messages: List[Message] = []
+    selector: Optional[AgentSelector] = None
+    message: Optional[dict] = Field(
+        default=None, description="Message sent to every agent matched by the selector"
+    )
+
+    @model_validator(mode="after")
+    def check_selector_message(self) -> "BatchMessage":
+        if self.selector and self.message is None:
+            raise ValueError("`message` is required together with `selector`")
+        return self
+
+
+class DeliveryResult(BaseModel):
+    client_id: str
+    status: DeliveryStatus
+    detail: Optional[str] = None
+
+
+class BatchMessageResponse(BaseModel):
+    results: List[DeliveryResult]
+
+
+class AdmissionLimit(BaseModel):
+    rate: float = Field(
+        default=0, ge=0, description="Invocations per second, 0 is unlimited"
+    )
+    burst: int = Field(default=0, ge=0, description="Bucket size, defaults to the rate")
+    max_concurrency: int = Field(
+        default=0, ge=0, description="In-flight invocations, 0 is unlimited"
+    )
+
+
+class AdmissionConfig(BaseModel):
+    agent: AdmissionLimit = AdmissionLimit()
+    user: AdmissionLimit = AdmissionLimit()
+    agent_overrides: Dict[str, AdmissionLimit] = {}
+    user_overrides: Dict[str, AdmissionLimit] = {}
@@ -441,6 +441,34 @@ async def test_agentflows_register_agentflow_with_invalid_agents_ids(
     )
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "input_mapping",
+    [{"query": "result.[query"}, {"query": ""}],
+    ids=[
+        "register flow with invalid JMESPath expression",
+        "register flow with empty expression",
+    ],
+)
+async def test_agentflows_register_agentflow_with_invalid_input_mapping(
+    input_mapping, user_jwt_token: str
+):
+    json_data = {
+        "name": "Agenflow Name",
+        "description": "Agentflow Description",
+        "flow": [
+            {"id": str(uuid.uuid4()), "type": "genai"},
+            {"id": str(uuid.uuid4()), "type": "genai", "input_mapping": input_mapping},
+        ],
+    }
+    await http_client.post(
+        path=AGENTFLOWS_REGISTER_FLOW,
+        json=json_data,
+        expected_status_codes=[400],
+        headers={"Authorization": f"Bearer {user_jwt_token}"},
+    )
+
+
 @pytest.mark.asyncio
 async def test_agentflows_register_agentflows_with_the_same_agent(
     user_jwt_token: str,
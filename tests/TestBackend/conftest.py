@@ -0,0 +1,25 @@
+import sys
+from pathlib import Path
+
+import pytest_asyncio
+
+# backend modules are imported from the `src` package the same way the backend service runs them,
+# appended so top-level modules of the other services tested in the session (main) keep precedence
+BACKEND_DIR = Path(__file__).resolve().parents[2] / "backend"
+sys.path.append(str(BACKEND_DIR))
+
+
+# backend unit tests are in-process, they need neither the database nor the MCP test server
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def db_cleanup():
+    yield
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def clean_genai_agents_table():
+    yield
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def run_mcp():
+    yield
@@ -0,0 +1,65 @@
+import asyncio
+
+import fakeredis
+import pytest
+from redis import asyncio as aioredis
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        aioredis,
+        "from_url",
+        lambda url, **kwargs: fakeredis.FakeAsyncRedis(server=server, **kwargs),
+    )
+    return server
+
+
+@pytest.mark.asyncio
+async def test_version_is_shared_between_processes(redis_server):
+    from src.utils.catalog_version import CatalogVersion
+
+    # the API process and a Celery worker
+    api, worker = CatalogVersion("redis://fake"), CatalogVersion("redis://fake")
+
+    initial = await api.get()
+    assert initial == await worker.get()
+
+    bumped = await worker.bump()
+    assert bumped != initial
+    assert await api.get() == bumped
+
+
+def test_version_survives_new_event_loops(redis_server):
+    from src.utils.catalog_version import CatalogVersion
+
+    version = CatalogVersion("redis://fake")
+    # Celery tasks run every lookup with asyncio.run
+    first = asyncio.run(version.bump())
+    second = asyncio.run(version.bump())
+
+    assert first != second
+    assert asyncio.run(version.get()) == second
+
+
+@pytest.mark.asyncio
+async def test_flushed_redis_does_not_repeat_versions(redis_server):
+    from src.utils.catalog_version import CatalogVersion
+
+    version = CatalogVersion("redis://fake")
+    before = await version.bump()
+    await version._client().flushall()
+
+    assert await version.bump() != before
+
+
+@pytest.mark.asyncio
+async def test_unavailable_redis_disables_catalog_caching(redis_server):
+    from src.utils.catalog_version import CatalogVersion
+
+    version = CatalogVersion("redis://fake")
+    redis_server.connected = False
+
+    assert await version.get() is None
+    assert await version.bump() is None
@@ -0,0 +1,74 @@
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+
+def flow_steps(*steps: tuple[str, list[str] | None]) -> list:
+    from src.schemas.api.flow.schemas import FlowAgentId
+
+    return [
+        FlowAgentId(id=str(uuid4()), type="genai", step_id=step_id, depends_on=deps)
+        for step_id, deps in steps
+    ]
+
+
+def test_sequential_flows_have_no_dependencies():
+    from src.utils.helpers import FlowValidator
+
+    steps = flow_steps(("fetch", None), ("report", None))
+
+    assert FlowValidator.validate_flow_dependencies(steps) is None
+
+
+def test_dag_dependencies_are_returned_as_step_indices():
+    from src.utils.helpers import FlowValidator
+
+    steps = flow_steps(
+        ("fetch", []),
+        ("summarize", ["fetch"]),
+        ("translate", ["fetch"]),
+        ("report", ["translate", "summarize"]),
+    )
+
+    assert FlowValidator.validate_flow_dependencies(steps) == [[], [0], [0], [1, 2]]
+
+
+@pytest.mark.parametrize(
+    "steps",
+    [
+        (("fetch", ["report"]), ("report", ["fetch"])),
+        (("fetch", []), ("report", ["report"])),
+        (("fetch", []), ("report", ["missing"])),
+        (("fetch", []), ("fetch", ["fetch"])),
+    ],
+    ids=["cycle", "self-dependency", "unknown step", "duplicate step"],
+)
+def test_invalid_dag_dependencies_are_rejected(steps):
+    from src.utils.helpers import FlowValidator
+
+    with pytest.raises(HTTPException) as e:
+        FlowValidator.validate_flow_dependencies(flow_steps(*steps))
+    assert e.value.status_code == 400
+
+
+def test_input_mappings_are_validated():
+    from src.utils.helpers import FlowValidator
+
+    steps = flow_steps(("fetch", []), ("report", ["fetch"]))
+    steps[1].input_mapping = {"city": "location.city"}
+
+    assert FlowValidator.validate_input_mappings(steps) == [
+        None,
+        {"city": "location.city"},
+    ]
+
+    for mapping in [{"city": "location..city"}, {"city": ""}]:
+        steps[1].input_mapping = mapping
+        with pytest.raises(HTTPException):
+            FlowValidator.validate_input_mappings(steps)
+
+    # nothing to map for steps without dependencies
+    steps[1].input_mapping, steps[0].input_mapping = None, {"city": "city"}
+    with pytest.raises(HTTPException):
+        FlowValidator.validate_input_mappings(steps)
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import sys
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import jwt
+import pytest
+import pytest_asyncio
+
+# router modules are imported the same way the router service runs them (from its own directory)
+ROUTER_DIR = Path(__file__).resolve().parents[2] / "router"
+sys.path.insert(0, str(ROUTER_DIR))
+
+from connectors.ws_connector_manager import WSConnectionManager  # noqa: E402
+
+
+class FakeWebSocket:
+    """
+    In-memory stand-in for starlette's WebSocket, records every frame sent to it.
+    """
+
+    def __init__(self, headers: dict):
+        self.headers = headers
+        self.sent: list[str] = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, message: str):
+        self.sent.append(message)
+
+
+# router tests are in-process, they need neither the database nor the MCP test server
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def db_cleanup():
+    yield
+
+
+@pytest_asyncio.fixture(scope="function", autouse=True)
+async def clean_genai_agents_table():
+    yield
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def run_mcp():
+    yield
+
+
+@pytest.fixture
+def ws_connection_manager():
+    return WSConnectionManager()
+
+
+@pytest.fixture
+def fake_websocket_factory():
+    def _factory(headers: dict) -> FakeWebSocket:
+        return FakeWebSocket(headers=headers)
+
+    return _factory
+
+
+@pytest.fixture
+def connect_client(ws_connection_manager, fake_websocket_factory):
+    """
+    Connects a client identified by a single header, e.g. ("x-custom-invoke-key", "caller").
+    """
+
+    async def _connect(header: str, client_id: str):
+        websocket = fake_websocket_factory({header: client_id})
+        return await ws_connection_manager.connect(websocket), websocket
+
+    return _connect
+
+
+@pytest.fixture
+def connect_agent(ws_connection_manager, fake_websocket_factory):
+    """
+    Connects an agent authenticated with a JWT of the user, the agent id is random by default.
+    """
+
+    async def _connect(user_id: str = "user", agent_id: Optional[str] = None):
+        agent_jwt = jwt.encode(
+            {"sub": agent_id or str(uuid.uuid4()), "user_id": user_id},
+            "secret",
+            algorithm="HS256",
+        )
+        websocket = fake_websocket_factory({"x-custom-authorization": agent_jwt})
+        return await ws_connection_manager.connect(websocket), websocket
+
+    return _connect
+
+
+@pytest.fixture
+def invoke_message():
+    def _invoke(agent_id: str, text: str = "hello", **extra) -> str:
+        return json.dumps(
+            {
+                "message_type": "agent_invoke",
+                "agent_uuid": agent_id,
+                "request_payload": {"text": text},
+                **extra,
+            }
+        )
+
+    return _invoke
+
+
+@pytest.fixture
+def received_frames():
+    async def _received(websocket) -> list[dict]:
+        await asyncio.sleep(0.01)  # let writer tasks drain outbound queues
+        return [json.loads(frame) for frame in websocket.sent]
+
+    return _received
+
+
+@pytest.fixture
+def received_errors(received_frames):
+    async def _errors(websocket) -> list[dict]:
+        return [frame["error"] for frame in await received_frames(websocket)]
+
+    return _errors
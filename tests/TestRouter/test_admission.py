@@ -0,0 +1,125 @@
+import uuid
+
+import pytest
+from connectors.hold_queue import HoldQueue
+from utils.pydantic_models import AdmissionConfig, AdmissionLimit
+
+
+@pytest.mark.asyncio
+async def test_agent_rate_limit_rejects_with_retry_after(
+    ws_connection_manager, connect_agent, invoke_message, received_errors
+):
+    ws_connection_manager.admission.configure(
+        AdmissionConfig(agent=AdmissionLimit(rate=1, burst=2))
+    )
+    target, _ = await connect_agent("user-a")
+    caller, caller_ws = await connect_agent("user-b")
+
+    for _ in range(3):
+        await ws_connection_manager.process_message(
+            caller, invoke_message(target.client_id)
+        )
+
+    assert len(ws_connection_manager.invocations) == 2
+    [error] = await received_errors(caller_ws)
+    assert error["error_type"] == "RateLimited"
+    assert 0 < error["retry_after"] <= 1
+
+
+@pytest.mark.asyncio
+async def test_user_concurrency_cap_applies_to_session_connections(
+    ws_connection_manager,
+    fake_websocket_factory,
+    connect_agent,
+    invoke_message,
+    received_errors,
+):
+    ws_connection_manager.admission.configure(
+        AdmissionConfig(user_overrides={"user-a": AdmissionLimit(max_concurrency=1)})
+    )
+    target, _ = await connect_agent("user-b")
+    parent, parent_ws = await connect_agent("user-a")
+    session_ws = fake_websocket_factory(
+        {"x-custom-invoke-key": f"{parent.client_id}:{uuid.uuid4()}"}
+    )
+    session = await ws_connection_manager.connect(session_ws)
+    assert session.user_id == "user-a"
+
+    await ws_connection_manager.process_message(
+        parent, invoke_message(target.client_id)
+    )
+    await ws_connection_manager.process_message(
+        session, invoke_message(target.client_id)
+    )
+
+    assert len(ws_connection_manager.invocations) == 1
+    assert await received_errors(parent_ws) == []
+    [error] = await received_errors(session_ws)
+    assert error["error_type"] == "ConcurrencyLimited"
+    assert "retry_after" in error
+
+
+@pytest.mark.asyncio
+async def test_inactive_agent_does_not_consume_admission_tokens(
+    ws_connection_manager, connect_agent, invoke_message, received_errors
+):
+    ws_connection_manager.admission.configure(
+        AdmissionConfig(agent=AdmissionLimit(rate=1, burst=1))
+    )
+    caller, caller_ws = await connect_agent("user-b")
+    await ws_connection_manager.process_message(caller, invoke_message("gone-agent"))
+
+    [error] = await received_errors(caller_ws)
+    assert error["error_type"] == "AgentNotActive"
+
+    target, _ = await connect_agent("user-a", agent_id="gone-agent")
+    await ws_connection_manager.process_message(
+        caller, invoke_message(target.client_id)
+    )
+    assert len(ws_connection_manager.invocations) == 1
+
+
+@pytest.mark.asyncio
+async def test_released_held_invocations_are_admitted(
+    ws_connection_manager, connect_agent, invoke_message, received_errors
+):
+    ws_connection_manager.admission.configure(
+        AdmissionConfig(agent=AdmissionLimit(max_concurrency=1))
+    )
+    ws_connection_manager.hold_queue = HoldQueue(
+        grace_period=5, max_size=2, on_expire=ws_connection_manager._on_hold_expired
+    )
+    target, _ = await connect_agent("user-a")
+    caller, caller_ws = await connect_agent("user-b")
+    await ws_connection_manager.disconnect(target)
+
+    for _ in range(2):
+        await ws_connection_manager.process_message(
+            caller, invoke_message(target.client_id)
+        )
+    assert len(ws_connection_manager.hold_queue) == 2
+
+    await connect_agent("user-a", agent_id=target.client_id)
+
+    assert len(ws_connection_manager.invocations) == 1
+    [error] = await received_errors(caller_ws)
+    assert error["error_type"] == "ConcurrencyLimited"
+
+
+def test_admission_update_requires_master_server_api_key():
+    from fastapi.testclient import TestClient
+    from main import app, app_settings
+
+    client = TestClient(app)
+    config = AdmissionConfig(agent=AdmissionLimit(rate=5)).model_dump()
+
+    assert client.put("/admission", json=config).status_code == 401
+    assert (
+        client.put("/admission", json=config, headers={"api-key": "forged"}).status_code
+        == 401
+    )
+    response = client.put(
+        "/admission", json=config, headers={"api-key": app_settings.MASTER_BE_API_KEY}
+    )
+    assert response.status_code == 200
+    assert client.get("/admission").json()["agent"]["rate"] == 5
@@ -0,0 +1,58 @@
+import asyncio
+import json
+
+import pytest
+from utils.enums import DeliveryStatus
+
+
+@pytest.mark.asyncio
+async def test_batch_send_reports_per_target_status(
+    ws_connection_manager, connect_agent, connect_client
+):
+    first, first_ws = await connect_agent("user-a")
+    second, second_ws = await connect_agent("user-a")
+    await connect_agent("user-b")
+    await connect_client("x-custom-invoke-key", "caller")
+
+    selected = ws_connection_manager.select_agents(user_id="user-a")
+    assert sorted(selected) == sorted([first.client_id, second.client_id])
+
+    message = {"message_type": "config_refresh"}
+    results = await ws_connection_manager.send_batch(
+        [(client_id, message) for client_id in [*selected, "missing-agent"]]
+    )
+    await asyncio.sleep(0.01)
+
+    assert [result["status"] for result in results] == [
+        DeliveryStatus.QUEUED,
+        DeliveryStatus.QUEUED,
+        DeliveryStatus.NOT_ACTIVE,
+    ]
+    assert [json.loads(frame) for frame in first_ws.sent] == [message]
+    assert [json.loads(frame) for frame in second_ws.sent] == [message]
+
+
+def test_batch_invoke_requires_master_server_api_key(
+    ws_connection_manager, monkeypatch
+):
+    import main
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(main, "ws_connection_manager", ws_connection_manager)
+    client = TestClient(main.app)
+    batch = {"messages": [{"client_id": "missing-agent", "message": {}}]}
+
+    assert client.post("/invoke-agent/batch", json=batch).status_code == 401
+    assert (
+        client.post(
+            "/invoke-agent/batch", json=batch, headers={"api-key": "forged"}
+        ).status_code
+        == 401
+    )
+    response = client.post(
+        "/invoke-agent/batch",
+        json=batch,
+        headers={"api-key": main.app_settings.MASTER_BE_API_KEY},
+    )
+    assert response.status_code == 200
+    assert response.json()["results"][0]["status"] == DeliveryStatus.NOT_ACTIVE.value
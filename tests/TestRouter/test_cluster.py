@@ -0,0 +1,136 @@
+import asyncio
+import json
+import uuid
+
+import fakeredis
+import pytest
+from connectors.cluster import InProcessClusterBackend, RedisClusterBackend
+from connectors.ws_connector_manager import WSConnectionManager
+from redis import asyncio as aioredis
+
+
+@pytest.fixture
+def cluster_nodes():
+    cluster = InProcessClusterBackend()
+    return cluster, [
+        WSConnectionManager(cluster=cluster, node_id=node_id)
+        for node_id in ("node-a", "node-b")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_invocation_is_forwarded_between_nodes(
+    cluster_nodes, fake_websocket_factory
+):
+    cluster, (node_a, node_b) = cluster_nodes
+    for node in (node_a, node_b):
+        await node.start()
+
+    agent_id = str(uuid.uuid4())
+    agent_ws = fake_websocket_factory({"x-custom-authorization": agent_id})
+    agent = await node_a.connect(agent_ws)
+    caller_ws = fake_websocket_factory({"x-custom-invoke-key": f"{agent_id}:caller"})
+    caller = await node_b.connect(caller_ws)
+
+    assert await cluster.locate(agent_id) == {"node-a"}
+
+    await node_b.process_message(
+        caller,
+        json.dumps(
+            {
+                "message_type": "agent_invoke",
+                "agent_uuid": agent_id,
+                "request_payload": {},
+            }
+        ),
+    )
+    await asyncio.sleep(0.01)
+    [invoke_frame] = [json.loads(frame) for frame in agent_ws.sent]
+    assert invoke_frame["invoked_by"] == caller.client_id
+    assert len(node_a.invocations) == 1
+
+    await node_a.process_message(
+        agent,
+        json.dumps(
+            {
+                "message_type": "agent_response",
+                "invoked_by": caller.client_id,
+                "response": "ok",
+            }
+        ),
+    )
+    await asyncio.sleep(0.01)
+    [response] = [json.loads(frame) for frame in caller_ws.sent]
+    assert response["response"] == "ok"
+    assert len(node_a.invocations) == 0
+    assert len(node_b.forwarded_invocations) == 0
+
+    # children connected to other nodes are notified once the agent leaves the cluster
+    await node_a.disconnect(agent)
+    await asyncio.sleep(0.01)
+    assert (
+        json.loads(caller_ws.sent[-1])["error"]["error_message"]
+        == "Agent has been unregistered"
+    )
+    assert await cluster.locate(agent_id) == set()
+
+
+@pytest.mark.asyncio
+async def test_origin_node_fails_invocations_of_a_crashed_node(
+    cluster_nodes, fake_websocket_factory, invoke_message, received_errors
+):
+    cluster, (node_a, node_b) = cluster_nodes
+    for node in (node_a, node_b):
+        await node.start()
+
+    agent_id = str(uuid.uuid4())
+    await node_a.connect(fake_websocket_factory({"x-custom-authorization": agent_id}))
+    caller_ws = fake_websocket_factory({"x-custom-invoke-key": "caller"})
+    caller = await node_b.connect(caller_ws)
+    del cluster.nodes["node-a"]  # node-a crashes, its registrations are left behind
+
+    await node_b.process_message(caller, invoke_message(agent_id, invoke_timeout=0.05))
+    assert len(node_b.forwarded_invocations) == 1
+    await asyncio.sleep(0.1)
+
+    [error] = await received_errors(caller_ws)
+    assert error["error_type"] == "InvocationTimeout"
+    assert len(node_b.forwarded_invocations) == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_backend_expires_and_unregisters_nodes(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        aioredis,
+        "from_url",
+        lambda url, **kwargs: fakeredis.FakeAsyncRedis(server=server, **kwargs),
+    )
+    node_a, node_b, observer = (
+        RedisClusterBackend("redis://fake", node_ttl=60) for _ in range(3)
+    )
+    received = []
+
+    async def handler(message):
+        received.append(message)
+
+    for node_id, backend in (("node-a", node_a), ("node-b", node_b)):
+        await backend.start(node_id, handler)
+        await backend.register("agent", node_id)
+    await node_a.register("caller", "node-a")
+    assert await observer.locate("agent") == {"node-a", "node-b"}
+
+    await node_b.publish("node-a", {"kind": "ping"})
+    await asyncio.sleep(0.05)
+    assert received == [{"kind": "ping"}]
+
+    await node_b.stop("node-b")  # graceful shutdown unregisters its clients
+    assert await observer.locate("agent") == {"node-a"}
+
+    # node-a crashes: its heartbeat expires, its registrations are ignored and removed
+    node_a._heartbeat_task.cancel()
+    await observer.redis.delete("genai-router:heartbeat:node-a")
+    assert await observer.locate("agent") == set()
+    assert await observer.redis.smembers("genai-router:client:agent") == set()
+    assert await observer.locate("caller") == set()
+    await node_a.stop("node-a")
@@ -0,0 +1,68 @@
+import time
+import uuid
+
+import pytest
+
+TOTAL_CONNECTIONS = 10_000
+CHILDREN_PER_AGENT = 4
+
+
+@pytest.mark.asyncio
+async def test_disconnect_notifies_only_own_children_with_10k_connections(
+    ws_connection_manager, fake_websocket_factory
+):
+    """
+    Disconnect cost must be proportional to the agent's own children, not to all active connections
+    """
+    agents = {}
+    children = {}
+    agents_count = TOTAL_CONNECTIONS // (CHILDREN_PER_AGENT + 1)
+
+    for _ in range(agents_count):
+        agent_id = str(uuid.uuid4())
+        agents[agent_id] = await ws_connection_manager.connect(
+            fake_websocket_factory({"x-custom-authorization": agent_id})
+        )
+        children[agent_id] = [
+            await ws_connection_manager.connect(
+                fake_websocket_factory(
+                    {"x-custom-invoke-key": f"{agent_id}:{uuid.uuid4()}"}
+                )
+            )
+            for _ in range(CHILDREN_PER_AGENT)
+        ]
+
+    assert len(ws_connection_manager.active_connections) == TOTAL_CONNECTIONS
+
+    disconnected_agent_id = next(iter(agents))
+    await ws_connection_manager.disconnect(agents.pop(disconnected_agent_id))
+
+    notified = {
+        connection.client_id
+        for connection in children[disconnected_agent_id]
+        if connection.enqueued == 1
+    }
+    assert notified == {c.client_id for c in children[disconnected_agent_id]}
+    assert all(
+        c.enqueued == 0 for agent_id in agents for c in children[agent_id]
+    ), "children of other agents must not be notified"
+
+    # mass disconnect after a deploy: linear in the number of connections
+    started_at = time.perf_counter()
+    for connection in agents.values():
+        await ws_connection_manager.disconnect(connection)
+    elapsed = time.perf_counter() - started_at
+
+    assert elapsed < 5, f"Disconnecting {len(agents)} agents took {elapsed:.2f}s"
+    assert (
+        len(ws_connection_manager.active_connections)
+        == agents_count * CHILDREN_PER_AGENT
+    )
+
+    for agent_children in children.values():
+        for connection in agent_children:
+            assert connection.enqueued == 1
+            await ws_connection_manager.disconnect(connection)
+
+    assert not ws_connection_manager.active_connections
+    assert not ws_connection_manager.session_index.children
@@ -0,0 +1,76 @@
+import asyncio
+import uuid
+
+import pytest
+from connectors.hold_queue import HoldQueue
+
+
+async def _restarting_agent(
+    ws_connection_manager, fake_websocket_factory, grace_period: float
+):
+    ws_connection_manager.hold_queue = HoldQueue(
+        grace_period=grace_period,
+        max_size=2,
+        on_expire=ws_connection_manager._on_hold_expired,
+    )
+    agent_id = str(uuid.uuid4())
+    agent = await ws_connection_manager.connect(
+        fake_websocket_factory({"x-custom-authorization": agent_id})
+    )
+    caller_ws = fake_websocket_factory({"x-custom-invoke-key": "caller"})
+    caller = await ws_connection_manager.connect(caller_ws)
+    await ws_connection_manager.disconnect(agent)
+    return agent_id, caller, caller_ws
+
+
+@pytest.mark.asyncio
+async def test_held_invocations_are_flushed_in_order_on_reconnect(
+    ws_connection_manager, fake_websocket_factory, invoke_message, received_frames
+):
+    agent_id, caller, caller_ws = await _restarting_agent(
+        ws_connection_manager, fake_websocket_factory, grace_period=5
+    )
+
+    for text in (
+        "first",
+        "second",
+        "third",
+    ):  # the third one exceeds the hold queue size
+        await ws_connection_manager.process_message(
+            caller, invoke_message(agent_id, text)
+        )
+    assert len(ws_connection_manager.hold_queue) == 2
+
+    agent_ws = fake_websocket_factory({"x-custom-authorization": agent_id})
+    await ws_connection_manager.connect(agent_ws)
+
+    invocations = await received_frames(agent_ws)
+    assert [frame["request_payload"]["text"] for frame in invocations] == [
+        "first",
+        "second",
+    ]
+    assert all(frame["invoked_by"] == caller.client_id for frame in invocations)
+    assert len(ws_connection_manager.invocations) == 2
+
+    [error] = await received_frames(caller_ws)
+    assert error["error"]["error_type"] == "AgentNotActive"
+
+
+@pytest.mark.asyncio
+async def test_held_invocations_expire_with_agent_not_active(
+    ws_connection_manager, fake_websocket_factory, invoke_message, received_frames
+):
+    agent_id, caller, caller_ws = await _restarting_agent(
+        ws_connection_manager, fake_websocket_factory, grace_period=0.02
+    )
+
+    await ws_connection_manager.process_message(
+        caller, invoke_message(agent_id, "hello")
+    )
+    assert await received_frames(caller_ws) == []
+
+    await asyncio.sleep(0.05)
+    [error] = await received_frames(caller_ws)
+    assert error["error"]["error_type"] == "AgentNotActive"
+    assert error["error"]["agent_uuid"] == agent_id
+    assert len(ws_connection_manager.hold_queue) == 0
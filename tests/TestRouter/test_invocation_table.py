@@ -0,0 +1,186 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_response_completes_in_flight_invocation(
+    ws_connection_manager, connect_client, invoke_message, received_frames
+):
+    agent_id = str(uuid.uuid4())
+    agent, agent_ws = await connect_client("x-custom-authorization", agent_id)
+    caller, caller_ws = await connect_client(
+        "x-custom-invoke-key", f"{agent_id}:caller"
+    )
+
+    await ws_connection_manager.process_message(caller, invoke_message(agent_id))
+    assert len(ws_connection_manager.invocations) == 1
+    assert agent.in_flight == 1
+
+    [invoke_frame] = await received_frames(agent_ws)
+    await ws_connection_manager.process_message(
+        agent,
+        json.dumps(
+            {
+                "message_type": "agent_response",
+                "invoked_by": invoke_frame["invoked_by"],
+                "response": "world",
+            }
+        ),
+    )
+
+    assert len(ws_connection_manager.invocations) == 0
+    assert agent.in_flight == 0
+    [response] = await received_frames(caller_ws)
+    assert response["response"] == "world"
+
+
+@pytest.mark.asyncio
+async def test_caller_gets_error_on_deadline_and_target_disconnect(
+    ws_connection_manager, connect_client, invoke_message, received_frames
+):
+    agent_id = str(uuid.uuid4())
+    agent, _ = await connect_client("x-custom-authorization", agent_id)
+    timed_out_caller, timed_out_ws = await connect_client(
+        "x-custom-invoke-key", "caller-1"
+    )
+    orphaned_caller, orphaned_ws = await connect_client(
+        "x-custom-invoke-key", "caller-2"
+    )
+
+    await ws_connection_manager.process_message(
+        timed_out_caller, invoke_message(agent_id, invoke_timeout=0.05)
+    )
+    await ws_connection_manager.process_message(
+        orphaned_caller, invoke_message(agent_id)
+    )
+    await asyncio.sleep(0.1)
+
+    [timeout_error] = await received_frames(timed_out_ws)
+    assert timeout_error["error"]["error_type"] == "InvocationTimeout"
+
+    await ws_connection_manager.disconnect(agent)
+    [disconnect_error] = await received_frames(orphaned_ws)
+    assert disconnect_error["error"]["error_type"] == "AgentDisconnected"
+    assert len(ws_connection_manager.invocations) == 0
+
+
+@pytest.mark.asyncio
+async def test_invoker_can_cancel_invocation(
+    ws_connection_manager, connect_client, invoke_message, received_frames
+):
+    agent_id = str(uuid.uuid4())
+    agent, agent_ws = await connect_client("x-custom-authorization", agent_id)
+    caller, caller_ws = await connect_client("x-custom-invoke-key", "caller")
+
+    await ws_connection_manager.process_message(caller, invoke_message(agent_id))
+    await ws_connection_manager.process_message(
+        caller, json.dumps({"message_type": "agent_cancel", "agent_uuid": agent_id})
+    )
+
+    assert len(ws_connection_manager.invocations) == 0
+    assert agent.in_flight == 0
+    [cancel_error] = await received_frames(caller_ws)
+    assert cancel_error["error"]["error_type"] == "InvocationCancelled"
+    # agents run their handler for any frame, they are not sent a cancel frame
+    [invoke_frame] = await received_frames(agent_ws)
+    assert invoke_frame["request_payload"] == {"text": "hello"}
+
+
+@pytest.mark.asyncio
+async def test_response_completes_invocation_by_its_id(
+    ws_connection_manager, connect_client, invoke_message, received_frames
+):
+    agent_id = str(uuid.uuid4())
+    agent, agent_ws = await connect_client("x-custom-authorization", agent_id)
+    caller, caller_ws = await connect_client("x-custom-invoke-key", "caller")
+
+    for text in ("slow", "fast"):
+        await ws_connection_manager.process_message(
+            caller, invoke_message(agent_id, text, invoke_timeout=0.05)
+        )
+    slow, fast = await received_frames(agent_ws)
+    await ws_connection_manager.process_message(
+        agent,
+        json.dumps(
+            {
+                "message_type": "agent_response",
+                "invoked_by": caller.client_id,
+                "invocation_id": fast["invocation_id"],
+                "response": "fast",
+            }
+        ),
+    )
+    [remaining] = ws_connection_manager.invocations.invocations
+    assert remaining == slow["invocation_id"]
+
+    await asyncio.sleep(
+        0.1
+    )  # the slow invocation times out, its late response is dropped
+    await ws_connection_manager.process_message(
+        agent,
+        json.dumps(
+            {
+                "message_type": "agent_response",
+                "invoked_by": caller.client_id,
+                "invocation_id": slow["invocation_id"],
+                "response": "slow",
+            }
+        ),
+    )
+
+    response, timeout_error = await received_frames(caller_ws)
+    assert response == {"message_type": "agent_response", "response": "fast"}
+    assert timeout_error["error"]["error_type"] == "InvocationTimeout"
+    assert ws_connection_manager.metrics.latency[agent_id].count == 1
+
+
+@pytest.mark.asyncio
+async def test_late_response_without_id_is_dropped_after_cancel(
+    ws_connection_manager, connect_client, invoke_message, received_frames
+):
+    agent_id = str(uuid.uuid4())
+    agent, _ = await connect_client("x-custom-authorization", agent_id)
+    caller, caller_ws = await connect_client("x-custom-invoke-key", "caller")
+
+    await ws_connection_manager.process_message(caller, invoke_message(agent_id))
+    await ws_connection_manager.process_message(
+        caller, json.dumps({"message_type": "agent_cancel", "agent_uuid": agent_id})
+    )
+    await ws_connection_manager.process_message(caller, invoke_message(agent_id))
+
+    for text in ("cancelled", "answered"):
+        await ws_connection_manager.process_message(
+            agent,
+            json.dumps(
+                {
+                    "message_type": "agent_response",
+                    "invoked_by": caller.client_id,
+                    "response": text,
+                }
+            ),
+        )
+
+    cancel_error, response = await received_frames(caller_ws)
+    assert cancel_error["error"]["error_type"] == "InvocationCancelled"
+    assert response["response"] == "answered"
+    assert len(ws_connection_manager.invocations) == 0
+
+
+@pytest.mark.asyncio
+async def test_agents_are_not_sent_cancel_frames_when_their_caller_is_gone(
+    ws_connection_manager, connect_client, invoke_message, received_frames
+):
+    agent_id = str(uuid.uuid4())
+    agent, agent_ws = await connect_client("x-custom-authorization", agent_id)
+    caller, _ = await connect_client("x-custom-invoke-key", "caller")
+
+    await ws_connection_manager.process_message(caller, invoke_message(agent_id))
+    await ws_connection_manager.disconnect(caller)
+
+    assert len(ws_connection_manager.invocations) == 0
+    assert agent.in_flight == 0
+    [invoke_frame] = await received_frames(agent_ws)
+    assert invoke_frame["request_payload"] == {"text": "hello"}
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_metrics_count_frames_errors_and_invoke_latency(
+    ws_connection_manager, fake_websocket_factory
+):
+    agent_id = str(uuid.uuid4())
+    agent = await ws_connection_manager.connect(
+        fake_websocket_factory({"x-custom-authorization": agent_id})
+    )
+    caller = await ws_connection_manager.connect(
+        fake_websocket_factory({"x-custom-invoke-key": f"{agent_id}:caller"})
+    )
+
+    await ws_connection_manager.process_message(
+        caller,
+        json.dumps(
+            {
+                "message_type": "agent_invoke",
+                "agent_uuid": agent_id,
+                "request_payload": {"text": "hello"},
+            }
+        ),
+    )
+    await ws_connection_manager.process_message(
+        agent,
+        json.dumps(
+            {
+                "message_type": "agent_response",
+                "invoked_by": caller.client_id,
+                "response": "hi",
+            }
+        ),
+    )
+    await ws_connection_manager.process_message(
+        caller,
+        json.dumps(
+            {
+                "message_type": "agent_invoke",
+                "agent_uuid": "missing-agent",
+                "request_payload": {"text": "hello"},
+            }
+        ),
+    )
+    await asyncio.sleep(0.01)
+
+    metrics = ws_connection_manager.metrics
+    assert metrics.frames_in == {"agent_invoke": 2, "agent_response": 1}
+    assert metrics.frames_out["agent_invoke"] == 1
+    assert metrics.frames_out["agent_response"] == 1
+    assert metrics.errors == {"AgentNotActive": 1}
+    assert metrics.latency[agent_id].count == 1
+
+    gauges = ws_connection_manager.metrics_gauges()
+    assert gauges["active_connections"] == 2
+    assert gauges["invocations_in_flight"] == 0
+
+    exposition = metrics.to_prometheus(gauges)
+    assert "router_active_connections 2" in exposition
+    assert (
+        f'router_invoke_latency_seconds_bucket{{agent="{agent_id}",le="+Inf"}} 1'
+        in exposition
+    )
+
+
+def test_client_supplied_labels_are_bounded_and_escaped():
+    from connectors.metrics import RouterMetrics
+
+    metrics = RouterMetrics()
+    for message_type in (
+        "agent_invoke",
+        f"made-up-{uuid.uuid4()}",
+        ["not", "a", "str"],
+    ):
+        metrics.frame_in(message_type, 10)
+    metrics.error(f"Custom{uuid.uuid4()}")
+    metrics.error("AgentNotActive")
+    metrics.observe_latency('agent"\n\\', 0.1)
+
+    assert metrics.frames_in == {"agent_invoke": 1, "other": 2}
+    assert metrics.errors == {"other": 1, "AgentNotActive": 1}
+
+    exposition = metrics.to_prometheus({})
+    assert 'router_errors_total{error_type="other"} 1' in exposition
+    assert (
+        'router_invoke_latency_seconds_count{agent="agent\\"\\n\\\\"} 1' in exposition
+    )
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+from connectors.connection_pool import AgentConnection
+from utils.enums import OverflowPolicy
+from utils.exceptions import OutboundQueueFullException
+
+
+def make_connection(fake_websocket_factory, max_queue_size: int = 2):
+    websocket = fake_websocket_factory({})
+    return (
+        AgentConnection(
+            client_id="agent", websocket=websocket, max_queue_size=max_queue_size
+        ),
+        websocket,
+    )
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_the_writer(fake_websocket_factory):
+    connection, websocket = make_connection(fake_websocket_factory)
+    for i in range(2):
+        await connection.send_text(f"frame-{i}")
+
+    blocked = asyncio.create_task(connection.send_text("frame-2"))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    connection.start()
+    await asyncio.wait_for(blocked, 1)
+    await asyncio.sleep(0.01)
+    await connection.close()
+
+    assert websocket.sent == ["frame-0", "frame-1", "frame-2"]
+    assert connection.stats()["max_depth"] == 2
+
+
+@pytest.mark.asyncio
+async def test_drop_oldest_policy_discards_the_oldest_frame(fake_websocket_factory):
+    connection, websocket = make_connection(fake_websocket_factory)
+    for i in range(3):
+        await connection.send_text(f"frame-{i}", policy=OverflowPolicy.DROP_OLDEST)
+
+    connection.start()
+    await asyncio.sleep(0.01)
+    await connection.close()
+
+    assert websocket.sent == ["frame-1", "frame-2"]
+    assert connection.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_error_policy_raises_outbound_queue_full(fake_websocket_factory):
+    connection, _ = make_connection(fake_websocket_factory)
+    for i in range(2):
+        await connection.send_text(f"frame-{i}", policy=OverflowPolicy.ERROR)
+
+    with pytest.raises(OutboundQueueFullException):
+        await connection.send_text("frame-2", policy=OverflowPolicy.ERROR)
+    assert connection.rejected == 1
+    assert connection.depth == 2
+
+
+@pytest.mark.asyncio
+async def test_close_wakes_blocked_senders_and_fails_later_ones(
+    fake_websocket_factory,
+):
+    connection, _ = make_connection(fake_websocket_factory, max_queue_size=1)
+    await connection.send_text("queued")
+    blocked = [
+        asyncio.create_task(connection.send_text(f"blocked-{i}")) for i in range(3)
+    ]
+    await asyncio.sleep(0.01)
+
+    await connection.close()
+
+    for sender in blocked:
+        with pytest.raises(OutboundQueueFullException):
+            await asyncio.wait_for(sender, 1)
+    with pytest.raises(OutboundQueueFullException):
+        await connection.send_text("late")
+    # control frames to a closed connection are discarded silently
+    await connection.send_text("cancel", policy=OverflowPolicy.DROP_OLDEST)
+    assert connection.dropped == 5
+
+
+@pytest.mark.asyncio
+async def test_queues_endpoint_reports_counters_of_every_replica(
+    ws_connection_manager, connect_client, monkeypatch
+):
+    import main
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setattr(main, "ws_connection_manager", ws_connection_manager)
+    for _ in range(2):
+        await connect_client("x-custom-invoke-key", "caller")
+
+    stats = TestClient(main.app).get("/queues").json()
+
+    assert list(stats) == ["caller"]
+    assert len(stats["caller"]) == 2
+    assert {"in_flight", "depth", "capacity", "dropped", "rejected"} <= set(
+        stats["caller"][0]
+    )
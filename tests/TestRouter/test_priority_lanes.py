@@ -0,0 +1,63 @@
+import asyncio
+import json
+
+import pytest
+from connectors.connection_pool import AgentConnection
+from connectors.log_batcher import LogBatcher
+from utils.enums import Lane
+
+
+@pytest.mark.asyncio
+async def test_priority_lane_is_drained_before_log_lane(fake_websocket_factory):
+    websocket = fake_websocket_factory({})
+    connection = AgentConnection(client_id="master_server_be", websocket=websocket)
+
+    for i in range(5):
+        await connection.send_text(f"log-{i}", lane=Lane.LOG)
+    await connection.send_text("response", lane=Lane.PRIORITY)
+
+    connection.start()
+    await asyncio.sleep(0.01)
+    await connection.close()
+
+    assert websocket.sent[0] == "response"
+    assert websocket.sent[1:] == [f"log-{i}" for i in range(5)]
+    assert connection.lane_stats[Lane.PRIORITY].frames == 1
+    assert connection.lane_stats[Lane.LOG].frames == 5
+
+
+@pytest.mark.asyncio
+async def test_agent_logs_are_coalesced_into_batches(
+    ws_connection_manager, fake_websocket_factory
+):
+    backend_ws = fake_websocket_factory(
+        {"api-key": next(iter(ws_connection_manager.MASTER_SERVERS_API_KEY_MAPPING))}
+    )
+    await ws_connection_manager.connect(backend_ws)
+    agent = await ws_connection_manager.connect(
+        fake_websocket_factory({"x-custom-authorization": "agent"})
+    )
+    ws_connection_manager.log_batcher = LogBatcher(
+        flush=ws_connection_manager._send_log_batch, max_size=3, interval=0.05
+    )
+
+    for i in range(4):
+        await ws_connection_manager.process_message(
+            agent,
+            json.dumps(
+                {
+                    "message_type": "agent_log",
+                    "session_id": "session",
+                    "request_id": "request",
+                    "log_level": "info",
+                    "log_message": f"message {i}",
+                }
+            ),
+        )
+    await asyncio.sleep(0.1)
+
+    batches = [
+        json.loads(frame)["request_payload"]["logs"] for frame in backend_ws.sent
+    ]
+    assert [len(batch) for batch in batches] == [3, 1]
+    assert batches[0][0]["agent_uuid"] == "agent"
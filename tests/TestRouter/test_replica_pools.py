@@ -0,0 +1,128 @@
+import json
+import uuid
+
+import pytest
+
+from connectors.connection_pool import AgentConnection, ConnectionPool
+
+
+def make_connection(client_id: str, in_flight: int = 0) -> AgentConnection:
+    connection = AgentConnection(client_id=client_id, websocket=None)
+    connection.in_flight = in_flight
+    return connection
+
+
+def test_least_loaded_prefers_fewest_in_flight_then_oldest():
+    pool = ConnectionPool("agent")
+    assert pool.primary is None
+    assert pool.least_loaded() is None
+
+    oldest, busy, newest = (make_connection("agent", n) for n in (1, 3, 1))
+    for connection in (oldest, busy, newest):
+        pool.add(connection)
+
+    assert pool.primary is oldest
+    assert pool.least_loaded() is oldest
+    oldest.in_flight = 2
+    assert pool.least_loaded() is newest
+
+
+@pytest.mark.asyncio
+async def test_invocations_are_balanced_and_accounted_per_replica(
+    ws_connection_manager, connect_agent, connect_client, invoke_message
+):
+    agent_id = str(uuid.uuid4())
+    first, _ = await connect_agent(agent_id=agent_id)
+    second, _ = await connect_agent(agent_id=agent_id)
+    caller, _ = await connect_client("x-custom-invoke-key", "caller")
+
+    for _ in range(3):
+        await ws_connection_manager.process_message(caller, invoke_message(agent_id))
+    assert (first.in_flight, second.in_flight) == (2, 1)
+
+    await ws_connection_manager.process_message(
+        second,
+        json.dumps(
+            {
+                "message_type": "agent_response",
+                "invoked_by": caller.client_id,
+                "response": "done",
+            }
+        ),
+    )
+    assert (first.in_flight, second.in_flight) == (2, 0)
+    assert len(ws_connection_manager.invocations) == 2
+
+
+@pytest.mark.asyncio
+async def test_next_replica_becomes_primary_when_primary_disconnects(
+    ws_connection_manager, connect_agent
+):
+    agent_id = str(uuid.uuid4())
+    first, _ = await connect_agent(agent_id=agent_id)
+    second, second_ws = await connect_agent(agent_id=agent_id)
+    pool = ws_connection_manager.active_connections[agent_id]
+    assert pool.primary is first
+
+    await ws_connection_manager.disconnect(first)
+    assert pool.primary is second
+    assert ws_connection_manager.active_connections[agent_id] is pool
+
+    await ws_connection_manager.disconnect(second)
+    assert agent_id not in ws_connection_manager.active_connections
+
+
+@pytest.mark.asyncio
+async def test_response_is_delivered_to_the_invoking_replica(
+    ws_connection_manager,
+    connect_agent,
+    connect_client,
+    invoke_message,
+    received_frames,
+):
+    agent_id = str(uuid.uuid4())
+    agent, agent_ws = await connect_agent(agent_id=agent_id)
+    caller_id = str(uuid.uuid4())
+    primary_caller, primary_ws = await connect_agent(agent_id=caller_id)
+    invoking_caller, invoking_ws = await connect_agent(agent_id=caller_id)
+
+    await ws_connection_manager.process_message(
+        invoking_caller, invoke_message(agent_id)
+    )
+    [invoke_frame] = await received_frames(agent_ws)
+    await ws_connection_manager.process_message(
+        agent,
+        json.dumps(
+            {
+                "message_type": "agent_response",
+                "invoked_by": invoke_frame["invoked_by"],
+                "response": "world",
+            }
+        ),
+    )
+
+    [response] = await received_frames(invoking_ws)
+    assert response["response"] == "world"
+    assert await received_frames(primary_ws) == []
+
+
+@pytest.mark.asyncio
+async def test_errors_of_a_replica_which_disconnected_mid_invocation_are_dropped(
+    ws_connection_manager, connect_agent, invoke_message, received_frames
+):
+    caller_id = str(uuid.uuid4())
+    primary_caller, primary_ws = await connect_agent(agent_id=caller_id)
+    invoking_caller, invoking_ws = await connect_agent(agent_id=caller_id)
+    agent_id = str(uuid.uuid4())
+    agent, agent_ws = await connect_agent(agent_id=agent_id)
+
+    await ws_connection_manager.process_message(
+        invoking_caller, invoke_message(agent_id)
+    )
+    assert agent.in_flight == 1
+    await ws_connection_manager.disconnect(invoking_caller)
+
+    # the invocation was not abandoned by the whole caller, only by one of its replicas
+    await ws_connection_manager.disconnect(agent)
+    assert len(ws_connection_manager.invocations) == 0
+    assert await received_frames(primary_ws) == []
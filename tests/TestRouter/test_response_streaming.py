@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+import pytest
+from settings import get_settings
+from utils.enums import MasterServerName, WSMessageType
+from utils.pydantic_models import StreamChunk
+
+
+@pytest.mark.asyncio
+async def test_stream_chunks_are_relayed_to_master_be_in_order(
+    ws_connection_manager, fake_websocket_factory
+):
+    backend_ws = fake_websocket_factory({"api-key": get_settings().MASTER_BE_API_KEY})
+    await ws_connection_manager.connect(backend_ws)
+
+    for seq, delta in enumerate(["The ", "answer ", "is 42"]):
+        chunk = StreamChunk(
+            session_id="session",
+            request_id="request",
+            seq=seq,
+            delta=delta,
+            final=seq == 2,
+        )
+        await ws_connection_manager.forward_stream_chunk(chunk.model_dump())
+    await asyncio.sleep(0.01)
+
+    payloads = [json.loads(frame)["request_payload"] for frame in backend_ws.sent]
+    assert [payload["delta"] for payload in payloads] == ["The ", "answer ", "is 42"]
+    assert [payload["seq"] for payload in payloads] == [0, 1, 2]
+    assert [payload["final"] for payload in payloads] == [False, False, True]
+    assert all(
+        payload["message_type"] == WSMessageType.AGENT_STREAM.value
+        and payload["agent_uuid"] == MasterServerName.MASTER_SERVER_ML.value
+        and payload["request_id"] == "request"
+        for payload in payloads
+    )
+
+
+def test_stream_endpoint_requires_master_server_api_key():
+    from fastapi.testclient import TestClient
+    from main import app, app_settings
+
+    client = TestClient(app)
+    batch = {"chunks": [{"session_id": "s", "request_id": "r", "seq": 0}]}
+
+    assert client.post("/stream", json=batch).status_code == 401
+    response = client.post(
+        "/stream", json=batch, headers={"api-key": app_settings.MASTER_AGENT_API_KEY}
+    )
+    assert response.status_code == 200
+    assert response.json()["detail"] == "Stream chunks sent: 1"
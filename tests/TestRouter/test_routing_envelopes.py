@@ -0,0 +1,108 @@
+import asyncio
+import json
+import uuid
+
+import pytest
+from utils.envelope import build_envelope, splice_fields
+
+
+def test_splice_fields_keeps_the_payload_untouched():
+    body = '{"response":  {"text": "x"},\n "is_success": true}'
+
+    spliced = splice_fields(body, {"message_type": "agent_response"})
+
+    assert spliced.endswith(body[1:])
+    assert json.loads(spliced) == {
+        "message_type": "agent_response",
+        **json.loads(body),
+    }
+    assert splice_fields("{ }", {"message_type": "agent_error"}) == (
+        '{"message_type": "agent_error"}'
+    )
+    with pytest.raises(json.JSONDecodeError):
+        splice_fields('["not", "an", "object"]', {"message_type": "agent_response"})
+
+
+@pytest.mark.asyncio
+async def test_envelope_response_is_forwarded_to_the_invoker(
+    ws_connection_manager, connect_client, invoke_message, received_frames
+):
+    agent_id = str(uuid.uuid4())
+    agent, agent_ws = await connect_client("x-custom-authorization", agent_id)
+    caller, caller_ws = await connect_client("x-custom-invoke-key", "caller")
+
+    await ws_connection_manager.process_message(caller, invoke_message(agent_id))
+    [invoke_frame] = await received_frames(agent_ws)
+    body = '{"response": {"text": "world"}, "execution_time": 0.1}'
+    await ws_connection_manager.process_message(
+        agent,
+        build_envelope(
+            {
+                "message_type": "agent_response",
+                "invoked_by": invoke_frame["invoked_by"],
+                "invocation_id": invoke_frame["invocation_id"],
+            },
+            body,
+        ),
+    )
+
+    await asyncio.sleep(0.01)
+    assert caller_ws.sent == ['{"message_type": "agent_response", ' + body[1:]]
+    assert len(ws_connection_manager.invocations) == 0
+    assert agent.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_invalid_envelope_payload_leaves_the_invocation_in_flight(
+    ws_connection_manager, connect_client, invoke_message, received_frames
+):
+    agent_id = str(uuid.uuid4())
+    agent, agent_ws = await connect_client("x-custom-authorization", agent_id)
+    caller, caller_ws = await connect_client("x-custom-invoke-key", "caller")
+
+    await ws_connection_manager.process_message(caller, invoke_message(agent_id))
+    [invoke_frame] = await received_frames(agent_ws)
+    await ws_connection_manager.process_message(
+        agent,
+        build_envelope(
+            {
+                "message_type": "agent_response",
+                "invoked_by": invoke_frame["invoked_by"],
+            },
+            "not json",
+        ),
+    )
+
+    _, error = await received_frames(agent_ws)
+    assert error["error"]["error_type"] == "InvalidJSONRequestFormat"
+    assert len(ws_connection_manager.invocations) == 1
+    assert await received_frames(caller_ws) == []
+
+
+@pytest.mark.asyncio
+async def test_late_envelope_response_is_dropped_after_cancel(
+    ws_connection_manager, connect_client, invoke_message, received_frames
+):
+    agent_id = str(uuid.uuid4())
+    agent, agent_ws = await connect_client("x-custom-authorization", agent_id)
+    caller, caller_ws = await connect_client("x-custom-invoke-key", "caller")
+
+    await ws_connection_manager.process_message(caller, invoke_message(agent_id))
+    [invoke_frame] = await received_frames(agent_ws)
+    await ws_connection_manager.process_message(
+        caller, json.dumps({"message_type": "agent_cancel", "agent_uuid": agent_id})
+    )
+    await ws_connection_manager.process_message(
+        agent,
+        build_envelope(
+            {
+                "message_type": "agent_response",
+                "invoked_by": invoke_frame["invoked_by"],
+                "invocation_id": invoke_frame["invocation_id"],
+            },
+            '{"response": "late"}',
+        ),
+    )
+
+    [cancel_error] = await received_frames(caller_ws)
+    assert cancel_error["error"]["error_type"] == "InvocationCancelled"
@@ -0,0 +1,108 @@
+import time
+import uuid
+
+import jwt
+import pytest
+from connectors.token_cache import AgentTokenVerifier
+from connectors.ws_connector_manager import WSConnectionManager
+
+SECRET_KEY = "router-test-secret"
+
+
+def _agent_jwt(sub: str, key: str = SECRET_KEY, **claims) -> str:
+    return jwt.encode({"sub": sub, "user_id": "user", **claims}, key, algorithm="HS256")
+
+
+@pytest.mark.asyncio
+async def test_forged_and_revoked_tokens_are_rejected(fake_websocket_factory):
+    verifier = AgentTokenVerifier(secret_key=SECRET_KEY)
+    manager = WSConnectionManager(token_verifier=verifier)
+    agent_id = str(uuid.uuid4())
+
+    for token in (_agent_jwt(agent_id, key="forged-secret"), agent_id):
+        websocket = fake_websocket_factory({"x-custom-authorization": token})
+        assert await manager.connect(websocket) is None
+
+    token = _agent_jwt(agent_id)
+    connection = await manager.connect(
+        fake_websocket_factory({"x-custom-authorization": token})
+    )
+    assert connection.client_id == agent_id
+    assert connection.user_id == "user"
+
+    await manager.revoke_token(sub=agent_id)
+    websocket = fake_websocket_factory({"x-custom-authorization": token})
+    assert await manager.connect(websocket) is None
+
+
+def test_verified_tokens_are_cached_until_expiry():
+    verifier = AgentTokenVerifier(secret_key=SECRET_KEY, max_size=2)
+    tokens = [_agent_jwt(str(uuid.uuid4())) for _ in range(3)]
+
+    for _ in range(100):
+        assert verifier.verify(tokens[0])
+    assert (verifier.misses, verifier.hits) == (1, 99)
+
+    for token in tokens[1:]:  # evicts the least recently used token
+        verifier.verify(token)
+    assert tokens[0] not in verifier.cache
+
+    expiring = _agent_jwt(str(uuid.uuid4()), exp=int(time.time()) + 3600)
+    assert verifier.verify(expiring)
+    verifier.cache[expiring]["exp"] = time.time() - 1
+    assert verifier.verify(expiring) is None
+    assert expiring not in verifier.cache
+
+
+@pytest.mark.asyncio
+async def test_invoke_keys_cannot_join_authenticated_pools(
+    ws_connection_manager, connect_agent, connect_client
+):
+    agent, _ = await connect_agent()
+
+    for client_id in (agent.client_id, "master_server_be", "master_server_ml"):
+        connection, _ = await connect_client("x-custom-invoke-key", client_id)
+        assert connection is None
+    assert len(ws_connection_manager.active_connections[agent.client_id]) == 1
+
+    session, _ = await connect_client("x-custom-invoke-key", f"{agent.client_id}:1")
+    assert session.user_id == "user"
+
+
+def test_expired_revocations_are_pruned():
+    verifier = AgentTokenVerifier(secret_key=SECRET_KEY)
+    agent_id = str(uuid.uuid4())
+    expires_at = int(time.time()) + 3600
+    expiring = _agent_jwt(agent_id, exp=expires_at)
+    assert verifier.verify(expiring)
+
+    verifier.revoke(sub=agent_id)  # kept until the cached token of the agent expires
+    verifier.revoke(token=_agent_jwt("other", exp=int(time.time()) + 60))
+    verifier.revoke(sub="never-expires")
+    assert verifier.verify(expiring) is None
+    assert verifier.revoked_subjects[agent_id] == expires_at
+    assert len(verifier.revoked_tokens) == 1
+
+    verifier.revoked_subjects[agent_id] = time.time() - 1
+    verifier.revoked_tokens = {
+        token: time.time() - 1 for token in verifier.revoked_tokens
+    }
+    verifier.prune_revocations()
+    assert verifier.revoked_subjects == {"never-expires": None}
+    assert verifier.revoked_tokens == {}
+
+
+def test_token_revocation_requires_master_server_api_key():
+    from fastapi.testclient import TestClient
+    from main import app, app_settings
+
+    client = TestClient(app)
+    revocation = {"sub": str(uuid.uuid4())}
+
+    assert client.post("/tokens/revoke", json=revocation).status_code == 401
+    response = client.post(
+        "/tokens/revoke",
+        json=revocation,
+        headers={"api-key": app_settings.MASTER_AGENT_API_KEY},
+    )
+    assert response.status_code == 200